@@ -0,0 +1,344 @@
+"""Benchmark de extremo a extremo, etapa por etapa, con postulantes sintéticos.
+
+Uso (desde la carpeta de la aplicación):
+    python -m bench.bench_etapas --filas 1000 10000 100000 1000000
+    python -m bench.bench_etapas --filas 10000 --comparar
+
+Cada tamaño recorre el mismo camino que la pestaña de evaluación masiva:
+lectura por bloques, features, matriz de entrada del motor, inferencia,
+etiquetado, llenado de la tabla y exportación. Los resultados se guardan
+como JSON en bench/resultados/ para comparar versiones; --comparar (sin
+ruta) usa el último resultado guardado.
+
+Con --procesos N (N > 1) la puntuación corre en el pool de
+core.puntuacion_paralela: features, reindexado e inferencia son los
+segundos sumados que informa cada proceso y espera_procesos el tiempo que
+el proceso principal queda esperando al pool (arranque incluido). En ese
+modo las etapas no suman el total, que siempre es tiempo de reloj.
+"""
+import argparse
+import glob
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from bench.generador import generar_postulantes, guardar
+from core.artefactos import BASE_DIR, obtener_registro
+from core.exportacion import abrir_escritor
+from core.instrumentacion import Instrumentacion, memoria_pico_mb
+from core.lectura import TAMANO_BLOQUE, columnas_necesarias, leer_por_bloques
+from core.puntuacion import puntuar_bloque
+
+
+ETAPAS = (
+    "lectura", "features", "reindexado", "inferencia", "espera_procesos",
+    "etiquetado", "tabla", "exportacion",
+)
+
+TAMANOS = [1000, 10000, 100000, 1000000]
+
+DIR_RESULTADOS = os.path.join(BASE_DIR, "bench", "resultados")
+
+# Columnas que muestra la pestaña de evaluación masiva
+COLUMNAS_TABLA = [
+    "SEXO", "EDAD", "NOMBRE_COLEGIO", "PREDICCION", "NIVEL_RIESGO",
+    "PROBABILIDAD", "PERFIL",
+]
+
+# Filas que una vista típica pinta a la vez
+FILAS_VISIBLES = 30
+
+
+# ===============================
+# Tabla (opcional: requiere PyQt6)
+# ===============================
+class _LlenadoTabla:
+    """Reproduce TabEvaluarEsts.agregar_resultados y pinta la primera página."""
+
+    def __init__(self):
+        from ui.modelo_resultados import ModeloResultados
+
+        self.modelo = ModeloResultados(COLUMNAS_TABLA)
+        self.bloques = []
+        self.df = None
+
+    def agregar(self, df):
+        self.bloques.append(df)
+        self.modelo.agregar(df)
+
+    def unir(self):
+        # TabEvaluarEsts.unir_bloques: una sola concatenación al terminar
+        self.df = obtener_registro().vocabularios.concatenar(self.bloques)
+        self.bloques = []
+        self.modelo.refrescar(self.df)
+
+    def pintar(self):
+        filas = min(FILAS_VISIBLES, self.modelo.rowCount())
+        for fila in range(filas):
+            for col in range(self.modelo.columnCount()):
+                self.modelo.data(self.modelo.index(fila, col))
+
+
+def _crear_tabla():
+    try:
+        return _LlenadoTabla()
+    except ImportError:
+        return None
+
+
+# ===============================
+# Medición de un archivo
+# ===============================
+def _bloques_leidos(ruta, columnas, tamano_bloque, instrumentacion):
+    bloques = leer_por_bloques(ruta, tamano_bloque, columnas=columnas)
+    while True:
+        df = instrumentacion.medir("lectura", next, bloques, None)
+        if df is None:
+            return
+        yield df
+
+
+def _puntuados(bloques, registro, procesos, instrumentacion):
+    if procesos <= 1:
+        for df in bloques:
+            yield puntuar_bloque(
+                registro.motor, registro.indice_colegios, df, registro.vocabularios,
+                instrumentacion=instrumentacion
+            )
+        return
+
+    from core.puntuacion_paralela import PuntuadorParalelo, medir_espera
+
+    with PuntuadorParalelo(procesos, registro) as puntuador:
+        yield from medir_espera(
+            puntuador.puntuar_bloques(bloques, instrumentacion), instrumentacion
+        )
+
+
+def medir_archivo(ruta, salida, registro, tamano_bloque=TAMANO_BLOQUE, procesos=1):
+    instrumentacion = Instrumentacion("bench_etapas", ETAPAS, detallado=False)
+    medir = instrumentacion.medir
+    columnas = columnas_necesarias(registro.columnas_modelo)
+
+    tabla = _crear_tabla()
+
+    inicio = time.perf_counter()
+    bloques = _bloques_leidos(ruta, columnas, tamano_bloque, instrumentacion)
+    escritor = abrir_escritor(salida)
+    filas = 0
+    try:
+        for df, _ in _puntuados(bloques, registro, procesos, instrumentacion):
+            medir("etiquetado", registro.criterio_riesgo.reetiquetar, df)
+            if tabla is not None:
+                medir("tabla", tabla.agregar, df)
+            medir("exportacion", escritor.escribir, df)
+            filas += len(df)
+        if tabla is not None and filas:
+            medir("tabla", tabla.unir)
+            medir("tabla", tabla.pintar)
+    finally:
+        escritor.cerrar()
+    reloj = time.perf_counter() - inicio
+
+    tiempos = dict(instrumentacion.tiempos)
+    if tabla is None:
+        tiempos["tabla"] = None
+    if procesos <= 1:
+        tiempos["espera_procesos"] = None
+    return filas, tiempos, reloj
+
+
+def medir_tamano(n, registro, carpeta, formato, tamano_bloque, repeticiones, semilla,
+                 procesos=1):
+    entrada = os.path.join(carpeta, f"postulantes_{n}.{formato}")
+    salida = os.path.join(carpeta, f"postulantes_{n}_puntuado.csv")
+    guardar(generar_postulantes(n, registro, semilla), entrada)
+
+    mejores = None
+    total = None
+    for _ in range(repeticiones):
+        filas, tiempos, reloj = medir_archivo(
+            entrada, salida, registro, tamano_bloque, procesos
+        )
+        if mejores is None:
+            mejores = tiempos
+        else:
+            mejores = {
+                etapa: None if t is None else min(t, mejores[etapa])
+                for etapa, t in tiempos.items()
+            }
+        total = reloj if total is None else min(total, reloj)
+
+    os.remove(entrada)
+    os.remove(salida)
+
+    return {
+        "filas": filas,
+        "etapas": {
+            etapa: None if t is None else {
+                "segundos": round(t, 6),
+                "filas_s": round(filas / t, 1) if t > 0 else None,
+            }
+            for etapa, t in mejores.items()
+        },
+        "total_segundos": round(total, 6),
+        "memoria_pico_mb": memoria_pico_mb(),
+    }
+
+
+# ===============================
+# Resultados
+# ===============================
+def _commit_actual():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _entorno():
+    import sklearn
+    import xgboost
+
+    return {
+        "python": platform.python_version(),
+        "sistema": platform.platform(),
+        "cpus": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "sklearn": sklearn.__version__,
+        "xgboost": xgboost.__version__,
+    }
+
+
+def guardar_resultados(resultados, carpeta=DIR_RESULTADOS):
+    os.makedirs(carpeta, exist_ok=True)
+    sello = time.strftime("%Y%m%d-%H%M%S", time.localtime(resultados["fecha"]))
+    commit = resultados["commit"] or "sin-git"
+    ruta = os.path.join(carpeta, f"etapas_{sello}_{commit}.json")
+    with open(ruta, "w", encoding="utf-8") as f:
+        json.dump(resultados, f, indent=2, ensure_ascii=False)
+    return ruta
+
+
+def ultimo_resultado(carpeta=DIR_RESULTADOS):
+    rutas = sorted(glob.glob(os.path.join(carpeta, "etapas_*.json")))
+    return rutas[-1] if rutas else None
+
+
+def imprimir_tabla(resultados):
+    print(f"{'filas':>9} " + " ".join(f"{e:>15}" for e in ETAPAS) + f" {'total':>10}")
+    if resultados.get("procesos", 1) > 1:
+        print(f"({resultados['procesos']} procesos: features, reindexado e inferencia "
+              "son segundos sumados de todos los procesos)")
+    for r in resultados["resultados"]:
+        celdas = []
+        for etapa in ETAPAS:
+            dato = r["etapas"][etapa]
+            celdas.append(f"{'-':>15}" if dato is None else f"{dato['segundos']:>15.3f}")
+        print(f"{r['filas']:>9} " + " ".join(celdas) + f" {r['total_segundos']:>10.3f}")
+
+
+def comparar(actual, anterior, tolerancia):
+    """Imprime la razón actual/anterior por etapa y devuelve cuántas regresiones hubo."""
+    previos = {r["filas"]: r for r in anterior["resultados"]}
+    regresiones = 0
+
+    if anterior.get("procesos", 1) != actual["procesos"]:
+        print(
+            f"\nAviso: el resultado anterior usó {anterior.get('procesos', 1)} "
+            f"proceso(s) y el actual {actual['procesos']}; las etapas no son comparables."
+        )
+    print(f"\nComparación con {anterior.get('commit') or '?'} (actual / anterior):")
+    for r in actual["resultados"]:
+        previo = previos.get(r["filas"])
+        if previo is None:
+            continue
+        celdas = []
+        for etapa in ETAPAS:
+            a, b = r["etapas"][etapa], previo["etapas"].get(etapa)
+            if a is None or b is None or not b["segundos"]:
+                celdas.append(f"{'-':>15}")
+                continue
+            razon = a["segundos"] / b["segundos"]
+            marca = "!" if razon > 1 + tolerancia else " "
+            regresiones += marca == "!"
+            celdas.append(f"{razon:>14.2f}{marca}")
+        print(f"{r['filas']:>9} " + " ".join(celdas))
+
+    if regresiones:
+        print(f"{regresiones} etapa(s) más de {tolerancia:.0%} más lentas (marcadas con !)")
+    return regresiones
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--filas", type=int, nargs="+", default=TAMANOS)
+    parser.add_argument(
+        "--formato", choices=["csv", "parquet", "xlsx"], default="csv",
+        help="Formato del archivo de entrada generado"
+    )
+    parser.add_argument("--bloque", type=int, default=TAMANO_BLOQUE)
+    parser.add_argument(
+        "--procesos", type=int, default=1,
+        help="Procesos del pool de puntuación (1: secuencial)"
+    )
+    parser.add_argument("--repeticiones", type=int, default=1)
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument(
+        "--comparar", nargs="?", const="ultimo", default=None,
+        help="Resultado JSON anterior (sin valor: el último de bench/resultados)"
+    )
+    parser.add_argument("--tolerancia", type=float, default=0.15)
+    parser.add_argument("--no-guardar", action="store_true")
+    args = parser.parse_args(argv)
+
+    anterior = None
+    if args.comparar:
+        ruta = ultimo_resultado() if args.comparar == "ultimo" else args.comparar
+        if ruta is None:
+            parser.error("No hay resultados anteriores en bench/resultados")
+        with open(ruta, encoding="utf-8") as f:
+            anterior = json.load(f)
+
+    registro = obtener_registro()
+    registro.motor
+
+    resultados = {
+        "fecha": time.time(),
+        "commit": _commit_actual(),
+        "entorno": _entorno(),
+        "formato": args.formato,
+        "bloque": args.bloque,
+        "procesos": args.procesos,
+        "resultados": [],
+    }
+    with tempfile.TemporaryDirectory() as carpeta:
+        for n in sorted(args.filas):
+            print(f"midiendo {n} filas...", file=sys.stderr)
+            resultados["resultados"].append(medir_tamano(
+                n, registro, carpeta, args.formato, args.bloque,
+                args.repeticiones, args.semilla, args.procesos,
+            ))
+
+    imprimir_tabla(resultados)
+    if not args.no_guardar:
+        print(f"\nResultados guardados en {guardar_resultados(resultados)}")
+
+    if anterior is not None:
+        return 1 if comparar(resultados, anterior, args.tolerancia) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
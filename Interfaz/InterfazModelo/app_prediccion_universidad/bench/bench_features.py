@@ -0,0 +1,108 @@
+"""Micro-benchmark del pipeline de features: costo por fila.
+
+Uso (desde la carpeta de la aplicación):
+    python -m bench.bench_features --filas 1000 10000 100000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from core.features import construir_features
+
+
+# ===============================
+# Datos de prueba mínimos
+# ===============================
+def datos_prueba(n, semilla=0):
+    rng = np.random.default_rng(semilla)
+    nacimiento = pd.Timestamp("1985-01-01") + pd.to_timedelta(
+        rng.integers(0, 8000, n), unit="D"
+    )
+    fecha = pd.Series(nacimiento).where(rng.random(n) > 0.02)
+
+    return pd.DataFrame({
+        "ANIO": rng.integers(2005, 2012, n),
+        "FECHA_NAC": fecha,
+        "ANIO_BACHILLERATO": rng.integers(1995, 2011, n),
+        "TRABAJA": rng.choice(np.array(["SI", "NO", None], dtype=object), n),
+        "TIPO_COLEGIO": rng.choice(["FISCAL URBANO", "PARTICULAR URBANO", "CONVENIO RURAL"], n),
+        "CIUDAD_COLEGIO": rng.choice(["COCHABAMBA", "LA PAZ", "ORURO"], n),
+        "PROVINCIA_COLEGIO": rng.choice(["COCHABAMBA (CERCADO)", "QUILLACOLLO", "MURILLO"], n),
+        "NOMBRE_COLEGIO": rng.choice([f"COLEGIO {i}" for i in range(500)], n),
+    })
+
+
+# ===============================
+# Implementación anterior (fila por fila), como referencia
+# ===============================
+def features_fila_por_fila(df, tasa_por_colegio):
+    df["FECHA_NAC"] = pd.to_datetime(df["FECHA_NAC"], errors="coerce")
+    df["EDAD"] = df.apply(
+        lambda fila: fila["ANIO"] - fila["FECHA_NAC"].year
+        - ((1, 1) < (fila["FECHA_NAC"].month, fila["FECHA_NAC"].day))
+        if pd.notnull(fila["FECHA_NAC"]) else np.nan,
+        axis=1
+    )
+    df["EDAD"] = pd.to_numeric(df["EDAD"], errors="coerce").fillna(0).astype(int)
+    df["MAYOR_EDAD"] = (df["EDAD"] >= 18).astype(int)
+    df["ANIOS_POST_BACH"] = (
+        df["ANIO"] - df["ANIO_BACHILLERATO"]
+    ).where(df["ANIO_BACHILLERATO"] != 0, 0).fillna(0).astype(int)
+    df["TRABAJO_COLEGIO"] = (
+        df["TRABAJA"].fillna("NO").astype(str) + "_" +
+        df["TIPO_COLEGIO"].fillna("DESCONOCIDO").astype(str)
+    )
+    df["MIGRA_UNIVERSIDAD"] = (
+        (df["CIUDAD_COLEGIO"] != "COCHABAMBA") |
+        (df["PROVINCIA_COLEGIO"] != "COCHABAMBA (CERCADO)")
+    ).astype(int)
+    df["TASA_APR_COLEGIO"] = df["NOMBRE_COLEGIO"].map(tasa_por_colegio).fillna(0.0)
+    return df
+
+
+def medir(funcion, df, tasa, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        copia = df.copy()
+        inicio = time.perf_counter()
+        funcion(copia, tasa)
+        tiempos.append(time.perf_counter() - inicio)
+    return min(tiempos), copia
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--filas", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument(
+        "--sin-referencia", action="store_true",
+        help="No medir la implementación fila por fila (lenta en tamaños grandes)"
+    )
+    args = parser.parse_args(argv)
+
+    tasa = pd.Series(
+        np.linspace(0.1, 0.6, 500), index=[f"COLEGIO {i}" for i in range(500)]
+    )
+
+    print(f"{'filas':>10} {'vectorizado µs/fila':>20} {'fila por fila µs/fila':>22} {'aceleración':>12}")
+    for n in args.filas:
+        df = datos_prueba(n)
+        t_vec, res_vec = medir(construir_features, df, tasa, args.repeticiones)
+
+        if args.sin_referencia:
+            print(f"{n:>10} {t_vec / n * 1e6:>20.3f} {'-':>22} {'-':>12}")
+            continue
+
+        t_ref, res_ref = medir(features_fila_por_fila, df, tasa, 1)
+        assert (res_vec["EDAD"].to_numpy() == res_ref["EDAD"].to_numpy()).all()
+
+        print(
+            f"{n:>10} {t_vec / n * 1e6:>20.3f} {t_ref / n * 1e6:>22.3f} "
+            f"{t_ref / t_vec:>11.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
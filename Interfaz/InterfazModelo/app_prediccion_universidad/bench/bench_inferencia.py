@@ -0,0 +1,155 @@
+"""Benchmark de inferencia: pipeline de sklearn frente al motor directo.
+
+Uso (desde la carpeta de la aplicación):
+    python -m bench.bench_inferencia
+    python -m bench.bench_inferencia --lotes 10000 100000 --hilos 0 1 4
+
+Mide, sobre postulantes sintéticos ya con features:
+  - latencia de una fila (como TabModelo): p50 y p95 en ms;
+  - rendimiento de lotes grandes en filas/s.
+El camino "pipeline" es matriz_modelo + predict_proba del modelo guardado;
+"motor" es MotorInferencia con cada cantidad de hilos pedida (0 = la que
+elija XGBoost). También verifica que ambos den la misma probabilidad.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from bench.bench_etapas import DIR_RESULTADOS, _commit_actual, _entorno
+from bench.generador import generar_postulantes
+from core.artefactos import obtener_registro
+from core.features import construir_features, matriz_modelo
+from core.motor_inferencia import MotorInferencia
+from core.puntuacion import puntuar
+
+
+LOTES = [10000, 100000]
+LLAMADAS_FILA = 300
+
+
+def preparar(n, registro, semilla=0):
+    df = generar_postulantes(n, registro, semilla)
+    return construir_features(df, registro.indice_colegios, registro.vocabularios)
+
+
+# ===============================
+# Mediciones
+# ===============================
+def latencia_fila(funcion, filas):
+    for fila in filas[:10]:
+        funcion(fila)
+
+    tiempos = []
+    for fila in filas:
+        inicio = time.perf_counter()
+        funcion(fila)
+        tiempos.append(time.perf_counter() - inicio)
+    tiempos = np.asarray(tiempos) * 1000
+    return {
+        "p50_ms": round(float(np.percentile(tiempos, 50)), 4),
+        "p95_ms": round(float(np.percentile(tiempos, 95)), 4),
+    }
+
+
+def rendimiento_lote(funcion, df, repeticiones):
+    mejor = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion(df)
+        segundos = time.perf_counter() - inicio
+        mejor = segundos if mejor is None else min(mejor, segundos)
+    return {"segundos": round(mejor, 6), "filas_s": round(len(df) / mejor, 1)}
+
+
+def caminos(registro, hilos):
+    modelo = registro.modelo
+    columnas = registro.columnas_modelo
+    resultado = {
+        "pipeline": lambda df: puntuar(modelo, matriz_modelo(df, columnas)),
+    }
+    for h in hilos:
+        motor = MotorInferencia(modelo, columnas, hilos=h)
+        resultado[f"motor_h{h}"] = motor.puntuar
+    return resultado
+
+
+# ===============================
+# Salida
+# ===============================
+def imprimir(resultados):
+    lotes = [str(n) for n in resultados["lotes"]]
+    print(f"{'camino':<12} {'fila p50 ms':>12} {'fila p95 ms':>12} "
+          + " ".join(f"{'filas/s ' + n:>16}" for n in lotes))
+    for nombre, r in resultados["caminos"].items():
+        celdas = " ".join(f"{r['lotes'][n]['filas_s']:>16,.0f}" for n in lotes)
+        print(f"{nombre:<12} {r['fila']['p50_ms']:>12.3f} {r['fila']['p95_ms']:>12.3f} {celdas}")
+    print(f"\nDiferencia máxima de probabilidad frente al pipeline: "
+          f"{resultados['diferencia_maxima']:.2e}")
+
+
+def guardar_resultados(resultados, carpeta=DIR_RESULTADOS):
+    os.makedirs(carpeta, exist_ok=True)
+    sello = time.strftime("%Y%m%d-%H%M%S", time.localtime(resultados["fecha"]))
+    ruta = os.path.join(
+        carpeta, f"inferencia_{sello}_{resultados['commit'] or 'sin-git'}.json"
+    )
+    with open(ruta, "w", encoding="utf-8") as f:
+        json.dump(resultados, f, indent=2, ensure_ascii=False)
+    return ruta
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lotes", type=int, nargs="+", default=LOTES)
+    parser.add_argument("--llamadas", type=int, default=LLAMADAS_FILA,
+                        help="Llamadas de una fila para medir la latencia")
+    parser.add_argument("--hilos", type=int, nargs="+", default=[0, 1],
+                        help="Hilos del motor (0 = los que elija XGBoost)")
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--no-guardar", action="store_true")
+    args = parser.parse_args(argv)
+
+    registro = obtener_registro()
+    print("generando postulantes...", file=sys.stderr)
+    df = preparar(max(args.lotes + [args.llamadas]), registro, args.semilla)
+    filas = [df.iloc[[i]] for i in range(args.llamadas)]
+
+    resultados = {
+        "fecha": time.time(),
+        "commit": _commit_actual(),
+        "entorno": _entorno(),
+        "lotes": args.lotes,
+        "caminos": {},
+    }
+
+    funciones = caminos(registro, args.hilos)
+    referencia = funciones["pipeline"](df.iloc[:max(args.lotes)])
+    diferencia = 0.0
+    for nombre, funcion in funciones.items():
+        print(f"midiendo {nombre}...", file=sys.stderr)
+        diferencia = max(
+            diferencia,
+            float(np.abs(funcion(df.iloc[:max(args.lotes)]) - referencia).max())
+        )
+        resultados["caminos"][nombre] = {
+            "fila": latencia_fila(funcion, filas),
+            "lotes": {
+                str(n): rendimiento_lote(funcion, df.iloc[:n], args.repeticiones)
+                for n in args.lotes
+            },
+        }
+    resultados["diferencia_maxima"] = diferencia
+
+    imprimir(resultados)
+    if not args.no_guardar:
+        print(f"\nResultados guardados en {guardar_resultados(resultados)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
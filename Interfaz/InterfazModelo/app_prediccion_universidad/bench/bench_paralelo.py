@@ -0,0 +1,205 @@
+"""Punto de equilibrio del modo paralelo (core.puntuacion_paralela).
+
+Uso (desde la carpeta de la aplicación):
+    python -m bench.bench_paralelo
+    python -m bench.bench_paralelo --filas 20000 100000 400000 --procesos 2 4 8
+
+Para cada tamaño puntúa el mismo archivo sintético en secuencial y con un
+pool de N procesos (incluido el arranque del pool y la carga del modelo en
+cada proceso), y muestra el tiempo por etapa sumado entre procesos.
+
+Con los tiempos se ajusta t = fijo + filas * por_fila para cada modo. El
+punto de equilibrio medido es la menor cantidad de filas desde la que el
+pool gana. En una máquina con menos núcleos que procesos el pool no puede
+ganar; se informa además el equilibrio con escalado ideal en N núcleos
+(mismo costo fijo, costo por fila dividido entre N), que es de donde sale
+FILAS_MIN_PARALELO.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from bench.bench_etapas import DIR_RESULTADOS, _commit_actual, _entorno
+from bench.generador import generar_postulantes, guardar
+from core.artefactos import obtener_registro
+from core.instrumentacion import Instrumentacion
+from core.lectura import TAMANO_BLOQUE, columnas_necesarias, leer_por_bloques
+from core.puntuacion import puntuar_bloque
+from core.puntuacion_paralela import (
+    FILAS_MIN_PARALELO, PuntuadorParalelo, medir_espera, procesos_disponibles
+)
+
+
+TAMANOS = [5000, 20000, 80000]
+
+ETAPAS = ("lectura", "features", "reindexado", "inferencia", "espera_procesos")
+
+
+# ===============================
+# Mediciones
+# ===============================
+def _bloques(ruta, registro, instrumentacion, tamano_bloque):
+    bloques = leer_por_bloques(
+        ruta, tamano_bloque, columnas=columnas_necesarias(registro.columnas_modelo)
+    )
+    while True:
+        df = instrumentacion.medir("lectura", next, bloques, None)
+        if df is None:
+            return
+        instrumentacion.agregar_filas("lectura", len(df))
+        yield df
+
+
+def medir_secuencial(ruta, registro, tamano_bloque):
+    instrumentacion = Instrumentacion("bench_paralelo", ETAPAS, detallado=False)
+    inicio = time.perf_counter()
+    filas = 0
+    for df in _bloques(ruta, registro, instrumentacion, tamano_bloque):
+        df, _ = puntuar_bloque(
+            registro.motor, registro.indice_colegios, df, registro.vocabularios,
+            instrumentacion=instrumentacion
+        )
+        filas += len(df)
+    return filas, time.perf_counter() - inicio, instrumentacion.tiempos
+
+
+def medir_paralelo(ruta, registro, procesos, tamano_bloque):
+    instrumentacion = Instrumentacion("bench_paralelo", ETAPAS, detallado=False)
+    inicio = time.perf_counter()
+    filas = 0
+    # El pool se crea en cada medición: el arranque es parte del costo
+    with PuntuadorParalelo(procesos, registro) as puntuador:
+        resultados = medir_espera(
+            puntuador.puntuar_bloques(
+                _bloques(ruta, registro, instrumentacion, tamano_bloque), instrumentacion
+            ),
+            instrumentacion,
+        )
+        for df, _ in resultados:
+            filas += len(df)
+    return filas, time.perf_counter() - inicio, instrumentacion.tiempos
+
+
+def ajustar(filas, segundos):
+    """(fijo, por_fila) del ajuste lineal por mínimos cuadrados."""
+    por_fila, fijo = np.polyfit(np.asarray(filas, dtype=float), segundos, 1)
+    return max(float(fijo), 0.0), float(por_fila)
+
+
+def equilibrio(secuencial, paralelo):
+    """Filas desde las que el modo paralelo es más rápido (None si nunca)."""
+    fijo_s, fila_s = secuencial
+    fijo_p, fila_p = paralelo
+    if fila_p >= fila_s:
+        return None
+    return max((fijo_p - fijo_s) / (fila_s - fila_p), 0.0)
+
+
+# ===============================
+# Salida
+# ===============================
+def imprimir(resultados):
+    print(f"{'modo':<12} {'filas':>9} {'total (s)':>10} "
+          + " ".join(f"{e:>16}" for e in ETAPAS))
+    for r in resultados["mediciones"]:
+        celdas = " ".join(f"{r['etapas'].get(e, 0.0):>16.3f}" for e in ETAPAS)
+        print(f"{r['modo']:<12} {r['filas']:>9} {r['segundos']:>10.3f} {celdas}")
+    print("\nEtapas en paralelo: segundos sumados de todos los procesos.")
+
+    for modo, datos in resultados["equilibrio"].items():
+        medido = datos["medido"]
+        print(
+            f"{modo}: fijo {datos['fijo_s']:.2f} s, "
+            f"{datos['por_fila_us']:.1f} µs/fila; equilibrio medido: "
+            + ("nunca gana en esta máquina" if medido is None else f"{medido:,.0f} filas")
+            + f"; con escalado ideal: {datos['ideal']:,.0f} filas"
+        )
+    print(f"\nFILAS_MIN_PARALELO actual: {FILAS_MIN_PARALELO:,}")
+
+
+def guardar_resultados(resultados, carpeta=DIR_RESULTADOS):
+    os.makedirs(carpeta, exist_ok=True)
+    sello = time.strftime("%Y%m%d-%H%M%S", time.localtime(resultados["fecha"]))
+    ruta = os.path.join(
+        carpeta, f"paralelo_{sello}_{resultados['commit'] or 'sin-git'}.json"
+    )
+    with open(ruta, "w", encoding="utf-8") as f:
+        json.dump(resultados, f, indent=2, ensure_ascii=False)
+    return ruta
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--filas", type=int, nargs="+", default=TAMANOS)
+    parser.add_argument(
+        "--procesos", type=int, nargs="+",
+        default=sorted({2, max(procesos_disponibles(), 2)})
+    )
+    parser.add_argument("--bloque", type=int, default=TAMANO_BLOQUE)
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--no-guardar", action="store_true")
+    args = parser.parse_args(argv)
+
+    registro = obtener_registro()
+    registro.motor
+
+    resultados = {
+        "fecha": time.time(),
+        "commit": _commit_actual(),
+        "entorno": _entorno(),
+        "bloque": args.bloque,
+        "mediciones": [],
+        "equilibrio": {},
+    }
+    tamanos = sorted(args.filas)
+    modos = [("secuencial", 1)] + [(f"{p} procesos", p) for p in args.procesos]
+    tiempos = {modo: [] for modo, _ in modos}
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        for n in tamanos:
+            ruta = os.path.join(carpeta, f"postulantes_{n}.csv")
+            guardar(generar_postulantes(n, registro, args.semilla), ruta)
+            for modo, procesos in modos:
+                print(f"midiendo {n} filas, {modo}...", file=sys.stderr)
+                if procesos == 1:
+                    filas, segundos, etapas = medir_secuencial(ruta, registro, args.bloque)
+                else:
+                    filas, segundos, etapas = medir_paralelo(
+                        ruta, registro, procesos, args.bloque
+                    )
+                tiempos[modo].append(segundos)
+                resultados["mediciones"].append({
+                    "modo": modo, "procesos": procesos, "filas": filas,
+                    "segundos": round(segundos, 6),
+                    "etapas": {e: round(t, 6) for e, t in etapas.items()},
+                })
+            os.remove(ruta)
+
+    secuencial = ajustar(tamanos, tiempos["secuencial"])
+    for modo, procesos in modos[1:]:
+        paralelo = ajustar(tamanos, tiempos[modo])
+        # Escalado ideal: el costo por fila secuencial repartido entre los procesos
+        ideal = equilibrio(secuencial, (paralelo[0], secuencial[1] / procesos))
+        resultados["equilibrio"][modo] = {
+            "fijo_s": round(paralelo[0], 4),
+            "por_fila_us": round(paralelo[1] * 1e6, 3),
+            "medido": equilibrio(secuencial, paralelo),
+            "ideal": ideal,
+        }
+    resultados["secuencial"] = {
+        "fijo_s": round(secuencial[0], 4), "por_fila_us": round(secuencial[1] * 1e6, 3)
+    }
+
+    imprimir(resultados)
+    if not args.no_guardar:
+        print(f"\nResultados guardados en {guardar_resultados(resultados)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
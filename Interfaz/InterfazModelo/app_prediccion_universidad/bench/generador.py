@@ -0,0 +1,145 @@
+"""Generador de postulantes sintéticos con el esquema de los archivos de entrada.
+
+Uso (desde la carpeta de la aplicación):
+    python -m bench.generador 100000 -o postulantes_100k.csv
+
+Las columnas siguen las distribuciones de data/dataset_eda.csv: los valores
+se remuestrean por grupos de columnas relacionadas (geografía del colegio,
+datos personales, datos académicos) y las columnas crudas que el pipeline
+deriva (ANIO, FECHA_NAC, TRABAJA, TIPO_COLEGIO) se reconstruyen para que
+construir_features devuelva las mismas EDAD, ANIOS_POST_BACH y
+TRABAJO_COLEGIO. Ningún registro real sale del equipo: solo se combinan
+valores de columnas sueltas.
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from core.artefactos import obtener_registro
+
+
+# Columnas que se remuestrean juntas para conservar su relación
+GRUPOS_COLUMNAS = [
+    ["CIUDAD_COLEGIO", "PROVINCIA_COLEGIO", "MUNICIPIO", "NOMBRE_COLEGIO"],
+    ["TRABAJO_COLEGIO"],
+    ["SEXO", "NACIONALIDAD", "ESTADO_CIVIL", "EDAD"],
+    ["PERIODO", "OPC_INGRESO", "ANIO_BACHILLERATO", "ANIOS_POST_BACH"],
+]
+
+COLUMNAS_SALIDA = [
+    "ANIO", "PERIODO", "SEXO", "FECHA_NAC", "OPC_INGRESO",
+    "NOMBRE_COLEGIO", "CIUDAD_COLEGIO", "PROVINCIA_COLEGIO", "MUNICIPIO",
+    "ANIO_BACHILLERATO", "TIPO_COLEGIO", "TRABAJA",
+    "NACIONALIDAD", "ESTADO_CIVIL",
+]
+
+# Proporción de fechas de nacimiento vacías, como en los archivos reales
+PROPORCION_SIN_FECHA = 0.02
+
+
+# ===============================
+# Muestreo de columnas derivadas
+# ===============================
+def _muestra_referencia(df_ref, n, rng):
+    muestra = {}
+    for grupo in GRUPOS_COLUMNAS:
+        grupo = [c for c in grupo if c in df_ref.columns]
+        if not grupo:
+            continue
+        filas = rng.integers(0, len(df_ref), n)
+        for col in grupo:
+            muestra[col] = df_ref[col].to_numpy()[filas]
+    return pd.DataFrame(muestra)
+
+
+def _muestra_opciones(opciones, n, rng):
+    """Sin dataset_eda.csv: valores uniformes entre las opciones del snapshot."""
+    muestra = {
+        col: rng.choice(np.asarray(valores, dtype=object), n)
+        for col, valores in opciones.items()
+        if valores
+    }
+    muestra["EDAD"] = rng.integers(16, 35, n)
+    muestra["ANIO_BACHILLERATO"] = rng.integers(1995, 2011, n)
+    muestra["ANIOS_POST_BACH"] = rng.integers(0, 6, n)
+    for col in ["PERIODO", "OPC_INGRESO"]:
+        muestra[col] = pd.to_numeric(
+            pd.Series(muestra.get(col, ["1"] * n)), errors="coerce"
+        ).fillna(1).astype(int).to_numpy()
+    return pd.DataFrame(muestra)
+
+
+# ===============================
+# Reconstrucción de columnas crudas
+# ===============================
+def _fecha_nacimiento(anio, edad, rng):
+    """Fecha tal que la edad al 1 de enero de `anio` sea `edad`.
+
+    Se nace entre el 2 de enero y el 31 de diciembre de anio - edad - 1,
+    por lo que al 1 de enero aún no se cumplieron los años de ese año.
+    """
+    nacimiento = (anio - edad - 1).astype("int64")
+    inicio = pd.to_datetime(
+        pd.Series(nacimiento).astype(str) + "-01-02", errors="coerce"
+    )
+    fecha = inicio + pd.to_timedelta(rng.integers(0, 364, len(anio)), unit="D")
+    return fecha.where(rng.random(len(anio)) >= PROPORCION_SIN_FECHA)
+
+
+def generar_postulantes(n, registro=None, semilla=0):
+    registro = registro or obtener_registro()
+    rng = np.random.default_rng(semilla)
+
+    if os.path.exists(registro.ruta_dataset):
+        base = _muestra_referencia(registro.df_ref, n, rng)
+    else:
+        base = _muestra_opciones(registro.estadisticas["opciones"], n, rng)
+
+    bach = pd.to_numeric(base["ANIO_BACHILLERATO"], errors="coerce").fillna(0)
+    post = pd.to_numeric(base["ANIOS_POST_BACH"], errors="coerce").fillna(0)
+    edad = pd.to_numeric(base["EDAD"], errors="coerce").fillna(18)
+    anio = (bach + post).to_numpy(dtype="int64")
+
+    trabajo = base["TRABAJO_COLEGIO"].astype(str).str.split("_", n=1, expand=True)
+
+    df = base.drop(columns=["TRABAJO_COLEGIO", "EDAD", "ANIOS_POST_BACH"])
+    df["ANIO"] = anio
+    df["FECHA_NAC"] = _fecha_nacimiento(anio, edad.to_numpy(dtype="int64"), rng)
+    df["TRABAJA"] = trabajo[0]
+    df["TIPO_COLEGIO"] = trabajo[1] if 1 in trabajo.columns else None
+
+    return df[[c for c in COLUMNAS_SALIDA if c in df.columns]]
+
+
+# ===============================
+# Escritura
+# ===============================
+def guardar(df, ruta):
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension in (".parquet", ".pq"):
+        df.to_parquet(ruta, index=False)
+    elif extension in (".xlsx", ".xlsm"):
+        df.to_excel(ruta, index=False)
+    else:
+        df.to_csv(ruta, index=False)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("filas", type=int)
+    parser.add_argument(
+        "-o", "--salida", default=None,
+        help="Archivo .csv, .parquet o .xlsx (por defecto postulantes_<filas>.csv)"
+    )
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    salida = args.salida or f"postulantes_{args.filas}.csv"
+    guardar(generar_postulantes(args.filas, semilla=args.semilla), salida)
+    print(f"{args.filas} postulantes -> {salida}")
+
+
+if __name__ == "__main__":
+    main()
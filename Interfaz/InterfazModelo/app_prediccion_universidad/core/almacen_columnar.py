@@ -0,0 +1,190 @@
+"""Histórico de postulantes en un archivo columnar mapeado en memoria.
+
+dataset_eda.csv se convierte una sola vez a Arrow IPC (formato Feather v2,
+sin compresión, un solo lote por columna) en data/dataset_eda.arrow. Al
+abrirlo con pa.memory_map no se parsea texto ni se copia el archivo: las
+columnas numéricas se entregan como vistas de solo lectura sobre el mapa y
+el sistema operativo carga las páginas a medida que se leen. Varios procesos
+que abren el mismo archivo comparten esas páginas.
+
+El archivo guarda en sus metadatos la firma del CSV del que salió; si el CSV
+cambia se vuelve a convertir (misma invalidación que el snapshot de
+estadísticas). Requiere pyarrow.
+"""
+import json
+import os
+
+import pandas as pd
+
+from core.categorias import tipos_lectura
+from core.estadisticas_ref import firma_archivo
+
+
+CLAVE_FIRMA = b"firma_csv"
+
+
+def ruta_almacen_por_defecto(ruta_csv):
+    return os.path.splitext(ruta_csv)[0] + ".arrow"
+
+
+def _pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.ipc  # noqa: F401
+    except ImportError:
+        raise ImportError("Para el almacén columnar del histórico instale pyarrow") from None
+    return pa
+
+
+# ===============================
+# Conversión (una vez por versión del CSV)
+# ===============================
+def convertir_csv(ruta_csv, ruta_almacen=None):
+    """Escribe el CSV como Arrow IPC y devuelve la tabla (en memoria)."""
+    pa = _pyarrow()
+    ruta_almacen = ruta_almacen or ruta_almacen_por_defecto(ruta_csv)
+
+    firma = firma_archivo(ruta_csv)
+    df = pd.read_csv(ruta_csv, dtype=tipos_lectura())
+    if "RESULTADO_FINAL" in df.columns:
+        df["RESULTADO_FINAL"] = df["RESULTADO_FINAL"].astype(str).astype("category")
+
+    tabla = pa.Table.from_pandas(df, preserve_index=False)
+    metadatos = dict(tabla.schema.metadata or {})
+    metadatos[CLAVE_FIRMA] = json.dumps(firma).encode("utf-8")
+    # Un solo lote: cada columna queda contigua en el archivo
+    tabla = tabla.replace_schema_metadata(metadatos).combine_chunks()
+
+    tmp = ruta_almacen + ".tmp"
+    with pa.OSFile(tmp, "wb") as destino:
+        with pa.ipc.new_file(destino, tabla.schema) as escritor:
+            escritor.write_table(tabla, max_chunksize=max(len(tabla), 1))
+    try:
+        os.replace(tmp, ruta_almacen)
+    except PermissionError:
+        # Windows: otro proceso todavía tiene mapeada la versión anterior;
+        # esta vez se usa la tabla en memoria y se reintenta la próxima
+        os.remove(tmp)
+    return tabla
+
+
+def _firma_guardada(tabla):
+    metadatos = tabla.schema.metadata or {}
+    if CLAVE_FIRMA not in metadatos:
+        return None
+    return json.loads(metadatos[CLAVE_FIRMA].decode("utf-8"))
+
+
+def _vigente(tabla, ruta_csv):
+    guardada = _firma_guardada(tabla)
+    if guardada is None:
+        return False
+    actual = firma_archivo(ruta_csv, con_hash=False)
+    if (actual["tamano"], actual["mtime_ns"]) == (guardada["tamano"], guardada["mtime_ns"]):
+        return True
+    # Mismo contenido con otro mtime (copia, checkout)
+    return (
+        actual["tamano"] == guardada["tamano"]
+        and firma_archivo(ruta_csv)["sha256"] == guardada["sha256"]
+    )
+
+
+# ===============================
+# Lectura
+# ===============================
+def _mapear(pa, ruta_almacen):
+    mapa = pa.memory_map(ruta_almacen, "r")
+    return pa.ipc.open_file(mapa).read_all(), mapa
+
+
+class AlmacenColumnar:
+    """Tabla Arrow respaldada por el archivo mapeado (o en memoria si se
+    acaba de convertir y no se pudo reemplazar el archivo)."""
+
+    def __init__(self, tabla, mapa=None):
+        self.tabla = tabla
+        # El mapa debe vivir mientras existan vistas sobre él
+        self._mapa = mapa
+
+    @classmethod
+    def abrir(cls, ruta_csv, ruta_almacen=None):
+        """Abre el almacén del CSV, convirtiéndolo antes si hace falta.
+
+        Si el CSV no existe se usa el almacén tal cual.
+        """
+        pa = _pyarrow()
+        ruta_almacen = ruta_almacen or ruta_almacen_por_defecto(ruta_csv)
+
+        if os.path.exists(ruta_almacen):
+            tabla, mapa = _mapear(pa, ruta_almacen)
+            if not os.path.exists(ruta_csv) or _vigente(tabla, ruta_csv):
+                return cls(tabla, mapa)
+            # Liberar el mapa antes de reemplazar el archivo (Windows)
+            del tabla
+            mapa.close()
+        elif not os.path.exists(ruta_csv):
+            raise FileNotFoundError(
+                f"No se encontró {ruta_csv} ni el almacén {ruta_almacen}"
+            )
+
+        convertida = convertir_csv(ruta_csv, ruta_almacen)
+        tabla, mapa = _mapear(pa, ruta_almacen)
+        if _firma_guardada(tabla) == _firma_guardada(convertida):
+            return cls(tabla, mapa)
+        # No se pudo reemplazar el archivo: se usa la conversión en memoria
+        return cls(convertida)
+
+    def __len__(self):
+        return self.tabla.num_rows
+
+    @property
+    def columnas(self):
+        return self.tabla.column_names
+
+    def columna(self, col):
+        """Vista numpy de solo lectura de una columna numérica sin nulos."""
+        return self.tabla.column(col).chunk(0).to_numpy(zero_copy_only=True)
+
+    def pandas(self, columnas=None):
+        """DataFrame con las columnas pedidas.
+
+        Las numéricas son vistas sobre el archivo (de solo lectura); las
+        categóricas se entregan como 'category' con los códigos del archivo.
+        """
+        tabla = self.tabla if columnas is None else self.tabla.select(list(columnas))
+        return tabla.to_pandas(split_blocks=True)
+
+
+# ===============================
+# Línea de comandos
+# ===============================
+def main(argv=None):
+    import argparse
+
+    from core.artefactos import BASE_DIR
+
+    parser = argparse.ArgumentParser(
+        description="Convierte dataset_eda.csv al almacén columnar mapeado en memoria"
+    )
+    parser.add_argument(
+        "--csv", default=os.path.join(BASE_DIR, "data", "dataset_eda.csv")
+    )
+    parser.add_argument("--salida", default=None)
+    parser.add_argument(
+        "--forzar", action="store_true",
+        help="Convertir aunque el CSV no haya cambiado"
+    )
+    args = parser.parse_args(argv)
+
+    if args.forzar:
+        convertir_csv(args.csv, args.salida)
+    almacen = AlmacenColumnar.abrir(args.csv, args.salida)
+    ruta = args.salida or ruta_almacen_por_defecto(args.csv)
+    print(
+        f"Almacén listo: {len(almacen)} filas, {len(almacen.columnas)} columnas, "
+        f"{os.path.getsize(ruta) / 2**20:.1f} MB en {ruta}"
+    )
+
+
+if __name__ == "__main__":
+    main()
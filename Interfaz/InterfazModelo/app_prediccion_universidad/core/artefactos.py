@@ -0,0 +1,264 @@
+import os
+import pickle
+import threading
+
+import pandas as pd
+
+from core.almacen_columnar import AlmacenColumnar
+from core.categorias import Vocabularios, tipos_lectura
+from core.distribuciones import Distribuciones
+from core.estadisticas_ref import cargar_estadisticas
+from core.indice_colegios import IndiceColegios
+from core.instrumentacion import medir_una_vez
+from core.motor_inferencia import MotorInferencia
+from core.puntuacion import CriterioRiesgo
+
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_SIN_CARGAR = object()
+
+
+# ===============================
+# Registro compartido de artefactos
+# ===============================
+class RegistroArtefactos:
+    """Carga perezosa y única (por proceso) del modelo y los datos de referencia.
+
+    Cada artefacto se lee la primera vez que se solicita y luego se reutiliza
+    desde cualquier pestaña o hilo. Los objetos devueltos son compartidos:
+    deben tratarse como de solo lectura.
+    """
+
+    def __init__(self, base_dir=BASE_DIR):
+        self.base_dir = base_dir
+        self.model_dir = os.path.join(base_dir, "model")
+        self.data_dir = os.path.join(base_dir, "data")
+        self._lock = threading.RLock()
+        self._cache = {}
+
+        # Umbral y bandas de riesgo compartidos por todas las pestañas
+        self.criterio_riesgo = CriterioRiesgo()
+
+    def _obtener(self, clave, cargador):
+        valor = self._cache.get(clave, _SIN_CARGAR)
+        if valor is not _SIN_CARGAR:
+            return valor
+
+        with self._lock:
+            valor = self._cache.get(clave, _SIN_CARGAR)
+            if valor is _SIN_CARGAR:
+                valor = medir_una_vez("artefactos", clave, cargador)
+                self._cache[clave] = valor
+            return valor
+
+    def _leer_pickle(self, nombre):
+        with open(os.path.join(self.model_dir, nombre), "rb") as f:
+            return pickle.load(f)
+
+    # ===============================
+    # Modelo
+    # ===============================
+    @property
+    def ruta_modelo(self):
+        return os.path.join(self.model_dir, "modelo_XGBOOST.joblib")
+
+    @property
+    def modelo(self):
+        return self._obtener("modelo", self._cargar_modelo)
+
+    def _cargar_modelo(self):
+        # joblib (y con él xgboost y sklearn al deserializar) solo se importa
+        # cuando se carga el modelo
+        import joblib
+
+        firma = self._firma_modelo_en_disco()
+        modelo = joblib.load(self.ruta_modelo)
+        self._cache["firma_modelo"] = firma
+        return modelo
+
+    def _firma_modelo_en_disco(self):
+        info = os.stat(self.ruta_modelo)
+        return (info.st_size, info.st_mtime_ns)
+
+    @property
+    def firma_modelo(self):
+        """Identifica la versión del modelo cargado (tamaño y fecha del archivo)."""
+        self.modelo
+        return self._cache["firma_modelo"]
+
+    @property
+    def firma_puntuacion(self):
+        """Cambia si cambia cualquier cosa que afecte PROBABILIDAD: el modelo
+        o las estadísticas de referencia (tasas por colegio y por nivel).
+
+        No obliga a cargar el modelo (el modo paralelo lo carga en los procesos).
+        """
+        firma_modelo = self._cache.get("firma_modelo") or self._firma_modelo_en_disco()
+        return (firma_modelo, self.estadisticas["firma"].get("sha256"))
+
+    def recargar_modelo_si_cambio(self):
+        """Descarta el modelo en memoria si el archivo fue reemplazado.
+
+        Devuelve True si el próximo acceso a `modelo` lo leerá de nuevo.
+        """
+        with self._lock:
+            if "modelo" not in self._cache:
+                return False
+            try:
+                firma = self._firma_modelo_en_disco()
+            except OSError:
+                return False
+            if firma == self._cache["firma_modelo"]:
+                return False
+            del self._cache["modelo"]
+            del self._cache["firma_modelo"]
+            self._cache.pop("motor", None)
+            return True
+
+    @property
+    def motor(self):
+        """Inferencia directa sobre el booster (ver core.motor_inferencia)."""
+        return self._obtener(
+            "motor",
+            lambda: MotorInferencia.desde_modelo(self.modelo, self.columnas_modelo)
+        )
+
+    @property
+    def columnas_modelo(self):
+        return self._obtener(
+            "columnas_modelo",
+            lambda: self._leer_pickle("columnas_modelo.pkl")
+        )
+
+    @property
+    def cat_features(self):
+        return self._obtener(
+            "cat_features",
+            lambda: self._leer_pickle("cat_features.pkl")
+        )
+
+    @property
+    def num_features(self):
+        return self._obtener(
+            "num_features",
+            lambda: self._leer_pickle("num_features.pkl")
+        )
+
+    # ===============================
+    # Datos históricos
+    # ===============================
+    @property
+    def ruta_dataset(self):
+        return os.path.join(self.data_dir, "dataset_eda.csv")
+
+    @property
+    def almacen(self):
+        """Histórico mapeado en memoria (ver core.almacen_columnar)."""
+        return self._obtener(
+            "almacen",
+            lambda: AlmacenColumnar.abrir(self.ruta_dataset)
+        )
+
+    @property
+    def df_ref(self):
+        return self._obtener("df_ref", self._cargar_df_ref)
+
+    def _cargar_df_ref(self):
+        try:
+            # Columnas numéricas como vistas de solo lectura sobre el archivo
+            df = self.almacen.pandas()
+        except ImportError:
+            # Sin pyarrow se parsea el CSV
+            df = pd.read_csv(self.ruta_dataset, dtype=tipos_lectura())
+        df["RESULTADO_FINAL"] = df["RESULTADO_FINAL"].astype(str)
+        return self.vocabularios.categorizar(df)
+
+    @property
+    def estadisticas(self):
+        # Snapshot precompilado: la GUI no necesita leer el CSV crudo
+        return self._obtener(
+            "estadisticas",
+            lambda: cargar_estadisticas(self.ruta_dataset)
+        )
+
+    @property
+    def tasa_por_colegio(self):
+        return self.estadisticas["tasas_colegio"]["tasa"]
+
+    @property
+    def indice_colegios(self):
+        return self._obtener(
+            "indice_colegios",
+            lambda: IndiceColegios.desde_estadisticas(self.estadisticas)
+        )
+
+    @property
+    def distribuciones(self):
+        return self._obtener(
+            "distribuciones",
+            lambda: Distribuciones.desde_estadisticas(self.estadisticas)
+        )
+
+    @property
+    def vocabularios(self):
+        # Mismo vocabulario categórico para la referencia y todos los lotes
+        return self._obtener(
+            "vocabularios",
+            lambda: Vocabularios(self.estadisticas["opciones"])
+        )
+
+    # ===============================
+    # Precarga (arranque de la GUI)
+    # ===============================
+    def precargar(self, instrumentacion=None, cancelado=None):
+        """Lee todos los artefactos y hace una predicción de calentamiento.
+
+        Pensado para un hilo en segundo plano al abrir la aplicación: la
+        primera predicción del usuario no paga la carga del modelo ni la
+        inicialización del booster. Si cancelado() devuelve True se detiene
+        entre etapas y devuelve False.
+        """
+        if instrumentacion is None:
+            medir = lambda etapa, funcion: funcion()
+        else:
+            medir = lambda etapa, funcion: instrumentacion.medir(etapa, funcion, filas=0)
+
+        etapas = [
+            ("estadisticas", lambda: (
+                self.estadisticas, self.indice_colegios, self.distribuciones,
+                self.vocabularios
+            )),
+            ("modelo", lambda: (self.modelo, self.columnas_modelo, self.cat_features)),
+            ("motor", lambda: self.motor),
+            ("calentamiento", self._calentar),
+        ]
+        for etapa, funcion in etapas:
+            if cancelado is not None and cancelado():
+                return False
+            medir(etapa, funcion)
+        return True
+
+    def _calentar(self):
+        estadisticas = self.estadisticas
+        fila = {}
+        for col in self.columnas_modelo:
+            if col in estadisticas["medias"]:
+                fila[col] = estadisticas["medias"][col]
+            elif estadisticas["opciones"].get(col):
+                fila[col] = estadisticas["opciones"][col][0]
+            else:
+                fila[col] = estadisticas["tasa_media_colegios"]
+        return self.motor.puntuar_explicado(pd.DataFrame([fila]))
+
+
+_registro = None
+_registro_lock = threading.Lock()
+
+
+def obtener_registro():
+    global _registro
+    with _registro_lock:
+        if _registro is None:
+            _registro = RegistroArtefactos()
+        return _registro
@@ -0,0 +1,84 @@
+import hashlib
+import json
+import numbers
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+CAPACIDAD_CACHE = 512
+
+
+# ===============================
+# Caché LRU de predicciones
+# ===============================
+class CachePrediccion:
+    """Resultados ya calculados (probabilidad y contribuciones), indexados por
+    el vector de entrada del modelo.
+
+    Se vacía sola cuando cambia la firma del modelo (p. ej. al reemplazar
+    modelo_XGBOOST.joblib). Se puede usar desde varios hilos (la GUI y el
+    cargador de artefactos): cada operación toma el lock.
+    """
+
+    def __init__(self, capacidad=CAPACIDAD_CACHE):
+        self.capacidad = capacidad
+        self._lock = threading.Lock()
+        self._datos = OrderedDict()
+        self._firma = None
+        self.aciertos = 0
+        self.fallos = 0
+
+    @staticmethod
+    def clave(X):
+        """Hash canónico de la fila de entrada: los bytes de la fila float32
+        del motor, o los valores de una fila alineada con columnas_modelo."""
+        if isinstance(X, np.ndarray):
+            return hashlib.blake2b(
+                np.ascontiguousarray(X[0]).tobytes(), digest_size=16
+            ).hexdigest()
+        fila = X.iloc[0]
+        valores = [
+            [col, float(v) if isinstance(v, numbers.Number) else str(v)]
+            for col, v in fila.items()
+        ]
+        texto = json.dumps(valores, ensure_ascii=False, separators=(",", ":"))
+        return hashlib.blake2b(texto.encode("utf-8"), digest_size=16).hexdigest()
+
+    def _validar_firma(self, firma):
+        # Se llama con el lock tomado
+        if firma != self._firma:
+            self._datos.clear()
+            self._firma = firma
+
+    def obtener(self, clave, firma=None):
+        with self._lock:
+            self._validar_firma(firma)
+            proba = self._datos.get(clave)
+            if proba is None:
+                self.fallos += 1
+                return None
+            self._datos.move_to_end(clave)
+            self.aciertos += 1
+            return proba
+
+    def guardar(self, clave, proba, firma=None):
+        with self._lock:
+            self._validar_firma(firma)
+            self._datos[clave] = proba
+            self._datos.move_to_end(clave)
+            while len(self._datos) > self.capacidad:
+                self._datos.popitem(last=False)
+
+    def vaciar(self):
+        with self._lock:
+            self._datos.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._datos)
+
+    @property
+    def consultas(self):
+        return self.aciertos + self.fallos
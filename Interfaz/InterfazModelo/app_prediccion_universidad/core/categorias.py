@@ -0,0 +1,104 @@
+import re
+import threading
+
+import numpy as np
+import pandas as pd
+
+
+# Columnas de texto que se guardan como categóricas (códigos enteros + vocabulario)
+COLUMNAS_CATEGORICAS = [
+    "SEXO", "CIUDAD_COLEGIO", "PROVINCIA_COLEGIO", "MUNICIPIO",
+    "NACIONALIDAD", "ESTADO_CIVIL", "TRABAJO_COLEGIO", "NOMBRE_COLEGIO",
+]
+
+
+def tipos_lectura(columnas=None):
+    """dtype para pd.read_csv: las columnas categóricas se leen ya como 'category'."""
+    return {
+        col: "category"
+        for col in COLUMNAS_CATEGORICAS
+        if columnas is None or col in columnas
+    }
+
+
+def es_categorica(serie):
+    return isinstance(serie.dtype, pd.CategoricalDtype)
+
+
+_NO_ALFANUMERICO = re.compile(r"[^A-Z0-9]+")
+
+
+def normalizar_nombres(nombres):
+    """Sin acentos, en mayúsculas, sin puntuación ni espacios repetidos."""
+    texto = pd.Series(nombres, dtype="str").str.normalize("NFKD")
+    texto = texto.str.encode("ascii", "ignore").str.decode("ascii").str.upper()
+    return texto.str.replace(_NO_ALFANUMERICO, " ", regex=True).str.strip().to_numpy(
+        dtype=object
+    )
+
+
+# ===============================
+# Vocabularios compartidos
+# ===============================
+class Vocabularios:
+    """Un CategoricalDtype fijo por columna, común a los datos de referencia y
+    a los lotes, de modo que el mismo valor tiene el mismo código en todos.
+
+    El vocabulario inicial son las opciones del snapshot. Los valores nuevos
+    que traiga un lote se agregan al final: los códigos existentes no cambian.
+    """
+
+    def __init__(self, opciones):
+        self._lock = threading.Lock()
+        self.tipos = {
+            col: pd.CategoricalDtype(list(opciones[col]))
+            for col in COLUMNAS_CATEGORICAS
+            if col in opciones
+        }
+
+    def _extender(self, col, nuevos):
+        with self._lock:
+            actual = self.tipos[col]
+            nuevos = [v for v in pd.unique(nuevos) if v not in actual.categories]
+            if nuevos:
+                actual = pd.CategoricalDtype(list(actual.categories) + nuevos)
+                self.tipos[col] = actual
+            return actual
+
+    def codificar(self, serie, col):
+        tipo = self.tipos[col]
+        if es_categorica(serie):
+            if serie.dtype == tipo:
+                return serie
+            codigos = serie.cat.codes.to_numpy()
+            valores = serie.cat.categories.astype(str)
+        else:
+            codigos, valores = pd.factorize(serie)
+            valores = pd.Index(valores).astype(str)
+
+        # Se traducen los valores distintos, no cada fila
+        traduccion = tipo.categories.get_indexer(valores)
+        if (traduccion == -1).any():
+            tipo = self._extender(col, valores[traduccion == -1])
+            traduccion = tipo.categories.get_indexer(valores)
+
+        # El código -1 (faltante) toma el último elemento: -1
+        traduccion = np.append(traduccion, -1)
+        return pd.Series(
+            pd.Categorical.from_codes(traduccion[codigos], dtype=tipo),
+            index=serie.index, name=serie.name,
+        )
+
+    def categorizar(self, df, columnas=None):
+        """Convierte (en el lugar) las columnas categóricas presentes en df."""
+        for col in self.tipos if columnas is None else columnas:
+            if col in df.columns and col in self.tipos:
+                df[col] = self.codificar(df[col], col)
+        return df
+
+    def concatenar(self, partes):
+        """pd.concat que conserva las categóricas aunque el vocabulario haya crecido."""
+        for df in partes:
+            categoricas = [c for c in df.columns if c in self.tipos and es_categorica(df[c])]
+            self.categorizar(df, categoricas)
+        return pd.concat(partes)
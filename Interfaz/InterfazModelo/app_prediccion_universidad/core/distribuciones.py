@@ -0,0 +1,116 @@
+"""Distribuciones históricas ordenadas para rangos percentiles.
+
+Por cada variable numérica se guardan, una vez en el snapshot, los valores
+distintos ordenados y sus conteos acumulados, para todos los postulantes y
+separados por resultado (APR / REP). El percentil de cualquier cantidad de
+valores se obtiene con np.searchsorted: O(log k) por valor, sin recorrer el
+histórico.
+"""
+import numpy as np
+import pandas as pd
+
+
+COLUMNAS_DISTRIBUCION = [
+    "EDAD", "ANIO_BACHILLERATO", "ANIOS_POST_BACH", "TASA_APR_COLEGIO",
+]
+TODOS = "todos"
+GRUPOS = (TODOS, "APR", "REP")
+
+PREFIJO_PERCENTIL = "PCTL_"
+
+
+# ===============================
+# Compilación (snapshot)
+# ===============================
+def distribucion_ordenada(valores):
+    """(valores distintos ordenados, conteo acumulado) sin NaN."""
+    valores = np.asarray(valores, dtype="float64")
+    valores = valores[~np.isnan(valores)]
+    distintos, conteos = np.unique(valores, return_counts=True)
+    return distintos, np.cumsum(conteos)
+
+
+def calcular_distribuciones(df, resultado):
+    """{columna: {grupo: (valores, acumulado)}}; df ya debe tener las columnas."""
+    resultado = np.asarray(resultado)
+    distribuciones = {}
+    for col in COLUMNAS_DISTRIBUCION:
+        if col not in df.columns:
+            continue
+        valores = pd.to_numeric(df[col], errors="coerce").to_numpy(dtype="float64")
+        distribuciones[col] = {TODOS: distribucion_ordenada(valores)}
+        for grupo in GRUPOS[1:]:
+            distribuciones[col][grupo] = distribucion_ordenada(valores[resultado == grupo])
+    return distribuciones
+
+
+# ===============================
+# Consulta
+# ===============================
+class Distribuciones:
+    def __init__(self, distribuciones):
+        self._distribuciones = distribuciones
+
+    @classmethod
+    def desde_estadisticas(cls, estadisticas):
+        return cls(estadisticas.get("distribuciones", {}))
+
+    def __contains__(self, col):
+        return col in self._distribuciones
+
+    def percentil(self, col, valores, grupo=TODOS):
+        """Rango percentil (0-100) de cada valor frente al histórico del grupo.
+
+        Con empates se cuenta la mitad de los iguales (rango medio), así el
+        valor más común no queda en 0 ni en 100. NaN si el valor es NaN o el
+        grupo está vacío.
+        """
+        distintos, acumulado = self._distribuciones[col][grupo]
+        valores = np.asarray(valores, dtype="float64")
+        if len(acumulado) == 0:
+            return np.full(valores.shape, np.nan)
+
+        total = acumulado[-1]
+        acumulado = np.concatenate([[0], acumulado])
+        menores = acumulado[np.searchsorted(distintos, valores, side="left")]
+        hasta = acumulado[np.searchsorted(distintos, valores, side="right")]
+        rango = 100.0 * (menores + 0.5 * (hasta - menores)) / total
+        return np.where(np.isnan(valores), np.nan, rango)
+
+    def percentiles(self, df, grupo=TODOS):
+        """Columnas PCTL_<col> para todas las variables presentes en df."""
+        return pd.DataFrame(
+            {
+                PREFIJO_PERCENTIL + col: self.percentil(
+                    col, pd.to_numeric(df[col], errors="coerce"), grupo
+                )
+                for col in self._distribuciones
+                if col in df.columns
+            },
+            index=df.index,
+        )
+
+    def percentiles_fila(self, datos):
+        """{col: {grupo: percentil}} para un postulante (dict o Serie)."""
+        resultado = {}
+        for col in self._distribuciones:
+            valor = datos.get(col)
+            if valor is None:
+                continue
+            try:
+                valor = float(valor)
+            except (TypeError, ValueError):
+                continue
+            resultado[col] = {
+                grupo: float(self.percentil(col, [valor], grupo)[0]) for grupo in GRUPOS
+            }
+        return resultado
+
+
+def texto_percentil(por_grupo):
+    """"percentil 63 · entre aprobados 58 · entre reprobados 65" """
+    partes = [f"percentil {por_grupo[TODOS]:.0f}"]
+    for grupo, nombre in (("APR", "aprobados"), ("REP", "reprobados")):
+        if not np.isnan(por_grupo[grupo]):
+            partes.append(f"entre {nombre} {por_grupo[grupo]:.0f}")
+    return " · ".join(partes)
@@ -0,0 +1,216 @@
+import argparse
+import hashlib
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+
+from core.categorias import es_categorica, tipos_lectura
+from core.distribuciones import COLUMNAS_DISTRIBUCION, calcular_distribuciones
+from core.tasas_niveles import calcular_tasas_niveles
+
+
+VERSION_SNAPSHOT = 3
+
+CUANTILES = (0.0, 0.05, 0.25, 0.5, 0.75, 0.95, 1.0)
+
+
+# ===============================
+# Firma del CSV de referencia
+# ===============================
+def _sha256(ruta, bloque=1 << 20):
+    h = hashlib.sha256()
+    with open(ruta, "rb") as f:
+        for parte in iter(lambda: f.read(bloque), b""):
+            h.update(parte)
+    return h.hexdigest()
+
+
+def firma_archivo(ruta, con_hash=True):
+    st = os.stat(ruta)
+    firma = {"tamano": st.st_size, "mtime_ns": st.st_mtime_ns}
+    if con_hash:
+        firma["sha256"] = _sha256(ruta)
+    return firma
+
+
+def ruta_snapshot_por_defecto(ruta_csv):
+    return os.path.join(os.path.dirname(ruta_csv), "estadisticas_ref.pkl")
+
+
+# ===============================
+# Compilación
+# ===============================
+def calcular_estadisticas(df):
+    aprobado = df["RESULTADO_FINAL"].astype(str) == "APR"
+
+    # Con NOMBRE_COLEGIO categórica se agrupa sobre los códigos enteros
+    tasas = (
+        aprobado
+        .groupby(df["NOMBRE_COLEGIO"], observed=True)
+        .agg(["mean", "count"])
+        .rename(columns={"mean": "tasa", "count": "n"})
+    )
+    tasas.index = pd.Index(tasas.index.astype(str), name="NOMBRE_COLEGIO")
+    tasas = tasas.sort_index()
+    tasas["tasa"] = tasas["tasa"].astype("float64")
+    tasas["n"] = tasas["n"].astype("int32")
+
+    # Respaldo para colegios sin historial: municipio, provincia y ciudad
+    tasas_niveles, tasa_global = calcular_tasas_niveles(aprobado, df)
+
+    opciones = {}
+    for col in df.columns:
+        if col == "RESULTADO_FINAL":
+            continue
+        serie = df[col]
+        if es_categorica(serie):
+            # Solo las categorías (pocas), no cada fila
+            serie = pd.Series(serie.cat.remove_unused_categories().cat.categories)
+        opciones[col] = (
+            serie
+            .dropna()
+            .astype(str)
+            .sort_values()
+            .unique()
+            .tolist()
+        )
+
+    numericas = df.select_dtypes(include="number")
+    medias = numericas.mean().to_dict()
+    cuantiles = {
+        col: numericas[col].quantile(CUANTILES).to_numpy(dtype="float64")
+        for col in numericas.columns
+    }
+
+    # Distribuciones ordenadas (todos / APR / REP) para rangos percentiles;
+    # TASA_APR_COLEGIO es la de cada postulante histórico según su colegio
+    variables = df.reindex(columns=COLUMNAS_DISTRIBUCION)
+    variables["TASA_APR_COLEGIO"] = (
+        tasas["tasa"].reindex(df["NOMBRE_COLEGIO"].astype(str)).to_numpy()
+    )
+    distribuciones = calcular_distribuciones(
+        variables, df["RESULTADO_FINAL"].astype(str).to_numpy()
+    )
+
+    return {
+        "tasas_colegio": tasas,
+        "tasa_media_colegios": float(tasas["tasa"].mean()),
+        "tasas_niveles": tasas_niveles,
+        "tasa_global": tasa_global,
+        "opciones": opciones,
+        "medias": medias,
+        "cuantiles": cuantiles,
+        "cuantiles_niveles": np.asarray(CUANTILES),
+        "distribuciones": distribuciones,
+        "n_filas": int(len(df)),
+    }
+
+
+def compilar_estadisticas(ruta_csv, ruta_snapshot=None):
+    ruta_snapshot = ruta_snapshot or ruta_snapshot_por_defecto(ruta_csv)
+
+    firma = firma_archivo(ruta_csv)
+    estadisticas = calcular_estadisticas(_leer_historico(ruta_csv))
+    estadisticas["version"] = VERSION_SNAPSHOT
+    estadisticas["firma"] = firma
+
+    _guardar(estadisticas, ruta_snapshot)
+    return estadisticas
+
+
+def _leer_historico(ruta_csv):
+    # Import diferido: core.almacen_columnar usa firma_archivo de este módulo
+    from core.almacen_columnar import AlmacenColumnar
+
+    try:
+        return AlmacenColumnar.abrir(ruta_csv).pandas()
+    except ImportError:
+        return pd.read_csv(ruta_csv, dtype=tipos_lectura())
+
+
+def _guardar(estadisticas, ruta_snapshot):
+    tmp = ruta_snapshot + ".tmp"
+    with open(tmp, "wb") as f:
+        pickle.dump(estadisticas, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, ruta_snapshot)
+
+
+# ===============================
+# Carga con invalidación
+# ===============================
+def cargar_estadisticas(ruta_csv, ruta_snapshot=None):
+    """Devuelve las estadísticas de referencia, recompilándolas solo si el
+    CSV cambió desde que se generó el snapshot.
+
+    La comparación rápida usa tamaño y mtime; si no coinciden se compara el
+    hash del contenido antes de volver a leer el CSV. Si el CSV no existe se
+    usa el snapshot tal cual.
+    """
+    ruta_snapshot = ruta_snapshot or ruta_snapshot_por_defecto(ruta_csv)
+
+    estadisticas = None
+    if os.path.exists(ruta_snapshot):
+        with open(ruta_snapshot, "rb") as f:
+            estadisticas = pickle.load(f)
+        if estadisticas.get("version") != VERSION_SNAPSHOT:
+            estadisticas = None
+
+    if not os.path.exists(ruta_csv):
+        if estadisticas is None:
+            raise FileNotFoundError(
+                f"No se encontró {ruta_csv} ni un snapshot válido en {ruta_snapshot}"
+            )
+        return estadisticas
+
+    if estadisticas is None:
+        return compilar_estadisticas(ruta_csv, ruta_snapshot)
+
+    guardada = estadisticas["firma"]
+    actual = firma_archivo(ruta_csv, con_hash=False)
+    if (actual["tamano"], actual["mtime_ns"]) == (guardada["tamano"], guardada["mtime_ns"]):
+        return estadisticas
+
+    if actual["tamano"] == guardada["tamano"] and _sha256(ruta_csv) == guardada["sha256"]:
+        # Mismo contenido con otro mtime (copia, checkout): solo se actualiza la firma
+        estadisticas["firma"] = dict(actual, sha256=guardada["sha256"])
+        _guardar(estadisticas, ruta_snapshot)
+        return estadisticas
+
+    return compilar_estadisticas(ruta_csv, ruta_snapshot)
+
+
+# ===============================
+# Línea de comandos
+# ===============================
+def main(argv=None):
+    from core.artefactos import BASE_DIR
+
+    parser = argparse.ArgumentParser(
+        description="Compila las estadísticas de referencia de dataset_eda.csv"
+    )
+    parser.add_argument(
+        "--csv", default=os.path.join(BASE_DIR, "data", "dataset_eda.csv")
+    )
+    parser.add_argument("--salida", default=None)
+    parser.add_argument(
+        "--forzar", action="store_true",
+        help="Recompilar aunque el CSV no haya cambiado"
+    )
+    args = parser.parse_args(argv)
+
+    if args.forzar:
+        estadisticas = compilar_estadisticas(args.csv, args.salida)
+    else:
+        estadisticas = cargar_estadisticas(args.csv, args.salida)
+
+    print(
+        f"Snapshot listo: {estadisticas['n_filas']} filas, "
+        f"{len(estadisticas['tasas_colegio'])} colegios, "
+        f"sha256={estadisticas['firma']['sha256'][:12]}"
+    )
+
+
+if __name__ == "__main__":
+    main()
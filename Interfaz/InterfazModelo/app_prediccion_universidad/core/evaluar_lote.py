@@ -0,0 +1,315 @@
+"""Evaluación masiva sin interfaz gráfica.
+
+Uso (desde la carpeta de la aplicación):
+    python -m core.evaluar_lote postulantes.xlsx otra_carpeta/ -o resultados/
+    python -m core.evaluar_lote postulantes.csv --conservar CI,NOMBRE
+
+Las columnas del archivo que el modelo no usa (identificadores, nombres) se
+copian a la salida junto a la predicción; --conservar elige cuáles.
+
+No importa PyQt6: sirve para servidores Linux y tareas programadas.
+"""
+import argparse
+import os
+import sys
+import time
+
+from core.artefactos import obtener_registro
+from core.exportacion import ESCRITORES, abrir_escritor
+from core.indice_colegios import (
+    APROXIMADA, NORMALIZADA, SIN_COINCIDENCIA, InformeColegios
+)
+from core.instrumentacion import Instrumentacion, activar_detallado, memoria_pico_mb
+from core.lectura import (
+    FORMATOS, TAMANO_BLOQUE, columnas_conservadas, columnas_necesarias, contar_filas,
+    leer_encabezado, leer_por_bloques
+)
+from core.puntuacion import puntuar_bloque
+
+
+ETAPAS = ("carga", "lectura", "features", "reindexado", "inferencia", "escritura")
+
+# Las columnas conservadas del archivo van primero, junto a estas
+COLUMNAS_RESULTADO = ["PREDICCION", "NIVEL_RIESGO", "PROBABILIDAD"]
+
+
+# ===============================
+# Utilidades
+# ===============================
+def expandir_entradas(entradas, recursivo=False):
+    archivos = []
+    for entrada in entradas:
+        if os.path.isdir(entrada):
+            if recursivo:
+                recorrido = (
+                    os.path.join(raiz, nombre)
+                    for raiz, _, nombres in os.walk(entrada)
+                    for nombre in nombres
+                )
+            else:
+                recorrido = (
+                    os.path.join(entrada, nombre) for nombre in os.listdir(entrada)
+                )
+            archivos.extend(sorted(
+                ruta for ruta in recorrido
+                if os.path.splitext(ruta)[1].lower() in FORMATOS
+                and not os.path.basename(ruta).startswith("~$")
+            ))
+        else:
+            archivos.append(entrada)
+    return archivos
+
+
+def orden_salida(columnas, conservar):
+    """Conservadas y resultado primero; después el resto en su orden."""
+    primeras = [c for c in list(conservar) + COLUMNAS_RESULTADO if c in columnas]
+    return primeras + [c for c in columnas if c not in primeras]
+
+
+def _contar_filas(ruta):
+    # Un archivo ilegible no impide elegir los procesos: el error se informa
+    # al evaluarlo
+    try:
+        return contar_filas(ruta)
+    except (OSError, ValueError):
+        return None
+
+
+def ruta_salida(ruta_entrada, carpeta_salida, formato):
+    base = os.path.splitext(os.path.basename(ruta_entrada))[0]
+    carpeta = carpeta_salida or os.path.dirname(os.path.abspath(ruta_entrada))
+    return os.path.join(carpeta, f"{base}_puntuado.{formato}")
+
+
+# ===============================
+# Evaluación de un archivo
+# ===============================
+def evaluar_archivo(ruta, salida, registro, instrumentacion, tamano_bloque=TAMANO_BLOQUE,
+                    puntuador=None, informe=None, percentiles=False, conservar=None):
+    """conservar: columnas del archivo que se copian a la salida junto al
+    resultado (None: todas las que el modelo no usa). No se pasan al modelo."""
+    if conservar is None:
+        conservar = columnas_conservadas(ruta, registro.columnas_modelo)
+    else:
+        faltantes = [c for c in conservar if c not in leer_encabezado(ruta)]
+        if faltantes:
+            raise ValueError(
+                "Columnas a conservar que no están en el archivo: " + ", ".join(faltantes)
+            )
+    columnas = columnas_necesarias(registro.columnas_modelo, conservar)
+    bloques = leer_por_bloques(ruta, tamano_bloque, columnas=columnas, texto=conservar)
+
+    escritor = abrir_escritor(salida)
+    filas = 0
+    try:
+        if puntuador is not None:
+            # Las etapas de features a inferencia las miden los procesos
+            # trabajadores y se suman; la espera de este proceso va aparte
+            from core.puntuacion_paralela import medir_espera
+
+            resultados = medir_espera(
+                puntuador.puntuar_bloques(
+                    _leer_medido(bloques, instrumentacion), instrumentacion
+                ),
+                instrumentacion,
+            )
+        else:
+            motor = registro.motor
+            tasa_por_colegio = registro.indice_colegios
+            resultados = (
+                puntuar_bloque(
+                    motor, tasa_por_colegio, df, registro.vocabularios,
+                    instrumentacion=instrumentacion
+                )
+                for df in _leer_medido(bloques, instrumentacion)
+            )
+        for df, _ in resultados:
+            filas += _cerrar_bloque(
+                df, registro, escritor, instrumentacion, informe, percentiles, conservar
+            )
+    finally:
+        escritor.cerrar()
+
+    return filas
+
+
+def _leer_medido(bloques, instrumentacion):
+    while True:
+        df = instrumentacion.medir("lectura", next, bloques, None)
+        if df is None:
+            return
+        instrumentacion.agregar_filas("lectura", len(df))
+        yield df
+
+
+def _cerrar_bloque(df, registro, escritor, instrumentacion, informe=None,
+                   percentiles=False, conservar=()):
+    registro.criterio_riesgo.reetiquetar(df)
+    if informe is not None:
+        informe.agregar(df)
+    if percentiles:
+        # PCTL_<col>: rango percentil frente a todos los postulantes históricos
+        for col, valores in registro.distribuciones.percentiles(df).items():
+            df[col] = valores
+    if escritor.columnas is None:
+        escritor.columnas = orden_salida(list(df.columns), conservar)
+    instrumentacion.medir("escritura", escritor.escribir, df, filas=len(df))
+    return len(df)
+
+
+# ===============================
+# Reporte
+# ===============================
+def guardar_informe_colegios(informe, salida):
+    """<salida>_colegios.csv con los nombres que no coincidieron exactamente."""
+    ruta = os.path.splitext(salida)[0] + "_colegios.csv"
+    informe.tabla().to_csv(ruta, index=False)
+    print(
+        f"  colegios: {informe.filas(SIN_COINCIDENCIA)} filas sin coincidencia, "
+        f"{informe.filas(APROXIMADA)} aproximadas, {informe.filas(NORMALIZADA)} "
+        f"normalizadas -> {ruta}"
+    )
+
+
+def imprimir_resumen(instrumentacion, filas, total, procesos=1):
+    detallado = instrumentacion.detallado
+    print()
+    if procesos > 1:
+        print(
+            f"features, reindexado e inferencia: segundos sumados de {procesos} "
+            "procesos; espera_procesos: tiempo de reloj esperando resultados"
+        )
+    encabezado = f"{'etapa':<16} {'tiempo (s)':>12} {'filas/s':>14}"
+    print(encabezado + (f" {'memoria (MB)':>13}" if detallado else ""))
+    for etapa in instrumentacion.resumen():
+        nombre, t = etapa["etapa"], etapa["segundos"]
+        velocidad = "-"
+        if nombre != "carga" and t > 0:
+            velocidad = f"{filas / t:,.0f}"
+        linea = f"{nombre:<16} {t:>12.3f} {velocidad:>14}"
+        if detallado:
+            memoria = etapa["memoria_pico_mb"]
+            linea += f" {'-' if memoria is None else f'{memoria:,.1f}':>13}"
+        print(linea)
+
+    velocidad_total = f"{filas / total:,.0f}" if total > 0 else "-"
+    print(f"{'total':<16} {total:>12.3f} {velocidad_total:>14}")
+
+    pico = memoria_pico_mb()
+    if pico is not None:
+        print(f"Memoria pico del proceso: {pico:,.1f} MB")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Puntúa archivos de postulantes sin abrir la interfaz gráfica."
+    )
+    parser.add_argument(
+        "entradas", nargs="+",
+        help="Archivos (.xlsx, .csv, .parquet) o carpetas que los contienen"
+    )
+    parser.add_argument("-o", "--salida", default=None, help="Carpeta de salida")
+    parser.add_argument("-f", "--formato", choices=sorted(ESCRITORES), default="csv")
+    parser.add_argument("-r", "--recursivo", action="store_true")
+    parser.add_argument("--bloque", type=int, default=TAMANO_BLOQUE)
+    parser.add_argument(
+        "--procesos", type=int, default=None,
+        help="Procesos para features e inferencia (1 = secuencial; por defecto "
+             "varios solo si el total de filas llega a FILAS_MIN_PARALELO)"
+    )
+    parser.add_argument(
+        "--umbral", type=float, default=None,
+        help="Umbral de probabilidad de aprobar por debajo del cual se marca EN RIESGO"
+    )
+    parser.add_argument(
+        "--percentiles", action="store_true",
+        help="Agregar columnas PCTL_<variable> con el percentil frente al histórico"
+    )
+    parser.add_argument(
+        "--conservar", default=None, metavar="COL[,COL]",
+        help="Columnas del archivo que se copian a la salida junto a la predicción "
+             "(por defecto todas las que el modelo no usa, p. ej. identificadores)"
+    )
+    parser.add_argument(
+        "--perfil", action="store_true",
+        help="Perfil detallado: memoria por etapa (tracemalloc) y cProfile (más lento)"
+    )
+    args = parser.parse_args(argv)
+
+    archivos = expandir_entradas(args.entradas, args.recursivo)
+    if not archivos:
+        parser.error("No se encontraron archivos de entrada")
+    if args.salida:
+        os.makedirs(args.salida, exist_ok=True)
+
+    if args.perfil:
+        activar_detallado()
+
+    conservar = None
+    if args.conservar is not None:
+        conservar = [c.strip() for c in args.conservar.split(",") if c.strip()]
+
+    inicio = time.perf_counter()
+    instrumentacion = Instrumentacion("evaluar_lote", ETAPAS)
+    registro = obtener_registro()
+    if args.umbral is not None:
+        registro.criterio_riesgo.umbral = args.umbral
+
+    procesos = args.procesos
+    if procesos is None:
+        from core.puntuacion_paralela import procesos_recomendados
+        conteos = [_contar_filas(ruta) for ruta in archivos]
+        procesos = procesos_recomendados(
+            None if None in conteos else sum(conteos)
+        )
+
+    puntuador = None
+    if procesos > 1:
+        # Cada proceso carga su propio modelo; aquí solo hacen falta las tasas
+        from core.puntuacion_paralela import PuntuadorParalelo
+        puntuador = instrumentacion.medir(
+            "carga", PuntuadorParalelo, procesos, registro
+        )
+    else:
+        instrumentacion.medir(
+            "carga", lambda: (registro.motor, registro.indice_colegios)
+        )
+
+    filas_totales = 0
+    errores = 0
+    try:
+        for ruta in archivos:
+            salida = ruta_salida(ruta, args.salida, args.formato)
+            informe = InformeColegios()
+            try:
+                filas = evaluar_archivo(
+                    ruta, salida, registro, instrumentacion, args.bloque, puntuador,
+                    informe, args.percentiles, conservar
+                )
+            except Exception as e:
+                errores += 1
+                print(f"ERROR {ruta}: {e}", file=sys.stderr)
+                continue
+            filas_totales += filas
+            print(f"{ruta} -> {salida} ({filas} filas)")
+            if len(informe):
+                guardar_informe_colegios(informe, salida)
+    finally:
+        if puntuador is not None:
+            puntuador.cerrar()
+
+    imprimir_resumen(instrumentacion, filas_totales, time.perf_counter() - inicio, procesos)
+    medicion = instrumentacion.registrar(
+        archivos=len(archivos), filas=filas_totales, errores=errores,
+        procesos=procesos,
+    )
+    if "perfil" in medicion:
+        print()
+        print(medicion["perfil"]["resumen"])
+        if medicion["perfil"]["archivo"]:
+            print(f"Perfil completo: {medicion['perfil']['archivo']}")
+    return 1 if errores else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+import os
+
+import pandas as pd
+
+
+# ===============================
+# Escritores por bloques
+# ===============================
+class EscritorCSV:
+    def __init__(self, ruta, columnas=None):
+        self.ruta = ruta
+        self.columnas = columnas
+        self._f = open(ruta, "w", encoding="utf-8", newline="")
+        self._encabezado = True
+
+    def escribir(self, df):
+        if self.columnas is None:
+            self.columnas = list(df.columns)
+        df.to_csv(
+            self._f, columns=self.columnas, index=False, header=self._encabezado
+        )
+        self._encabezado = False
+
+    def cerrar(self):
+        self._f.close()
+
+
+class EscritorParquet:
+    def __init__(self, ruta, columnas=None):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ImportError("Para escribir archivos Parquet instale pyarrow") from None
+
+        self.ruta = ruta
+        self.columnas = columnas
+        self._escritor = None
+        self._esquema = None
+
+    def escribir(self, df):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if self.columnas is None:
+            self.columnas = list(df.columns)
+        df = df[self.columnas]
+
+        if self._escritor is None:
+            tabla = pa.Table.from_pandas(df, preserve_index=False)
+            # Columnas vacías en el primer bloque: se guardan como texto.
+            # Categóricas: el vocabulario puede crecer entre bloques, así que
+            # se fija el tipo de sus valores (Parquet igual las codifica por diccionario)
+            self._esquema = pa.schema([
+                campo.with_type(pa.string()) if pa.types.is_null(campo.type)
+                else campo.with_type(campo.type.value_type)
+                if pa.types.is_dictionary(campo.type)
+                else campo
+                for campo in tabla.schema
+            ])
+            self._escritor = pq.ParquetWriter(self.ruta, self._esquema)
+
+        tabla = pa.Table.from_pandas(df, schema=self._esquema, preserve_index=False)
+        self._escritor.write_table(tabla)
+
+    def cerrar(self):
+        if self._escritor is not None:
+            self._escritor.close()
+        elif not os.path.exists(self.ruta):
+            pd.DataFrame(columns=self.columnas or []).to_parquet(self.ruta)
+
+
+class EscritorExcel:
+    # Límite de filas de una hoja de Excel, sin contar el encabezado
+    MAX_FILAS = 1_048_575
+
+    def __init__(self, ruta, columnas=None):
+        from openpyxl import Workbook
+
+        self.ruta = ruta
+        self.columnas = columnas
+        # write_only: cada fila se serializa al agregarla, sin guardar celdas en memoria
+        self._libro = Workbook(write_only=True)
+        self._hoja = self._libro.create_sheet("Resultados")
+        self._filas = 0
+
+    def escribir(self, df):
+        if self.columnas is None:
+            self.columnas = list(df.columns)
+        if self._filas == 0:
+            self._hoja.append(self.columnas)
+
+        self._filas += len(df)
+        if self._filas > self.MAX_FILAS:
+            raise ValueError(
+                f"Excel admite hasta {self.MAX_FILAS} filas por hoja; "
+                f"exporte a CSV o Parquet"
+            )
+
+        valores = df[self.columnas].astype(object)
+        valores = valores.where(pd.notna(valores), None)
+        for fila in valores.itertuples(index=False, name=None):
+            self._hoja.append(fila)
+
+    def cerrar(self):
+        if self._filas == 0:
+            self._hoja.append(self.columnas or [])
+        self._libro.save(self.ruta)
+
+
+ESCRITORES = {
+    "csv": EscritorCSV,
+    "parquet": EscritorParquet,
+    "xlsx": EscritorExcel,
+}
+
+FILTRO_EXPORTACION = "CSV (*.csv);;Excel (*.xlsx);;Parquet (*.parquet)"
+
+
+def formato_salida(ruta):
+    extension = os.path.splitext(ruta)[1].lower().lstrip(".")
+    if extension == "pq":
+        extension = "parquet"
+    if extension not in ESCRITORES:
+        raise ValueError(
+            f"Formato de salida no soportado: {extension or ruta}. "
+            f"Use uno de: {', '.join(ESCRITORES)}"
+        )
+    return extension
+
+
+def abrir_escritor(ruta, columnas=None):
+    return ESCRITORES[formato_salida(ruta)](ruta, columnas)
+
+
+def exportar_por_bloques(df, ruta, columnas=None, tamano_bloque=5000, cancelado=None):
+    """Escribe df en bloques de filas; no se crea una segunda copia completa.
+
+    Generador: entrega las filas escritas tras cada bloque. Si cancelado()
+    devuelve True se detiene y el archivo queda con las filas escritas.
+    """
+    columnas = [c for c in (columnas or df.columns) if c in df.columns]
+    escritor = abrir_escritor(ruta, columnas)
+    try:
+        for inicio in range(0, len(df), tamano_bloque):
+            if cancelado is not None and cancelado():
+                return
+            bloque = df.iloc[inicio:inicio + tamano_bloque]
+            escritor.escribir(bloque)
+            yield inicio + len(bloque)
+    finally:
+        escritor.cerrar()
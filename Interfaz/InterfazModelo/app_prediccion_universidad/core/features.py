@@ -0,0 +1,138 @@
+import numpy as np
+import pandas as pd
+
+from core.indice_colegios import IndiceColegios
+
+
+CIUDAD_UNIVERSIDAD = "COCHABAMBA"
+PROVINCIA_UNIVERSIDAD = "COCHABAMBA (CERCADO)"
+
+# Columnas crudas que necesita construir_features
+COLUMNAS_ENTRADA = [
+    "ANIO", "FECHA_NAC", "ANIO_BACHILLERATO", "TRABAJA", "TIPO_COLEGIO",
+    "CIUDAD_COLEGIO", "PROVINCIA_COLEGIO", "NOMBRE_COLEGIO",
+]
+
+# Entradas crudas que se interpretan como números (pd.to_numeric)
+COLUMNAS_ENTRADA_NUMERICAS = ["ANIO", "ANIO_BACHILLERATO"]
+
+COLUMNAS_DERIVADAS = [
+    "EDAD", "MAYOR_EDAD", "ANIOS_POST_BACH", "TRABAJO_COLEGIO",
+    "MIGRA_UNIVERSIDAD", "TASA_APR_COLEGIO",
+]
+
+
+def _numerico(serie):
+    return pd.to_numeric(serie, errors="coerce").to_numpy(dtype="float64")
+
+
+def _distinto_de(serie, valor):
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        # Comparación sobre los códigos enteros
+        categorias = serie.cat.categories
+        codigo = categorias.get_loc(valor) if valor in categorias else -2
+        return serie.cat.codes.to_numpy() != codigo
+    return serie.to_numpy(dtype=object) != valor
+
+
+# ===============================
+# Features individuales (por columna)
+# ===============================
+def calcular_edad(anio, fecha_nac):
+    """Edad al 1 de enero del año del examen; 0 si falta la fecha."""
+    fecha = pd.to_datetime(fecha_nac, errors="coerce")
+    anio = _numerico(anio)
+
+    nacimiento = fecha.dt.year.to_numpy(dtype="float64")
+    mes = fecha.dt.month.to_numpy(dtype="float64")
+    dia = fecha.dt.day.to_numpy(dtype="float64")
+
+    # Si el cumpleaños es posterior al 1 de enero aún no se cumplieron los años
+    sin_cumplir = (mes > 1) | (dia > 1)
+    edad = anio - nacimiento - sin_cumplir
+
+    return np.nan_to_num(edad, nan=0.0).astype(int)
+
+
+def calcular_anios_post_bach(anio, anio_bachillerato):
+    """Años entre el bachillerato y el examen; 0 si el año de bachillerato falta o es 0."""
+    anio = _numerico(anio)
+    bach = _numerico(anio_bachillerato)
+
+    anios = np.where(bach > 0, anio - bach, 0.0)
+    return np.nan_to_num(anios, nan=0.0).astype(int)
+
+
+def calcular_trabajo_colegio(trabaja, tipo_colegio):
+    return (
+        trabaja.fillna("NO").astype(str) + "_" +
+        tipo_colegio.fillna("DESCONOCIDO").astype(str)
+    ).to_numpy(dtype=object)
+
+
+def calcular_migra_universidad(ciudad, provincia):
+    return (
+        _distinto_de(ciudad, CIUDAD_UNIVERSIDAD) |
+        _distinto_de(provincia, PROVINCIA_UNIVERSIDAD)
+    ).astype(int)
+
+
+def tasa_colegio(nombres, tasa_por_colegio):
+    """Tasa histórica de aprobación por colegio; 0.0 para colegios sin historial."""
+    if isinstance(getattr(nombres, "dtype", None), pd.CategoricalDtype):
+        # Una búsqueda por categoría y luego un take sobre los códigos;
+        # el código -1 (faltante) toma el 0.0 agregado al final
+        por_categoria = tasa_colegio(nombres.cat.categories, tasa_por_colegio)
+        return np.append(por_categoria, 0.0)[nombres.cat.codes.to_numpy()]
+    return (
+        pd.Series(nombres)
+        .map(tasa_por_colegio)
+        .fillna(0.0)
+        .to_numpy(dtype="float64")
+    )
+
+
+# ===============================
+# Pipeline completo
+# ===============================
+def construir_features(df, tasa_por_colegio, vocabularios=None):
+    """Agrega al DataFrame (en el lugar) las columnas derivadas que usa el modelo.
+
+    tasa_por_colegio puede ser la Serie de tasas (búsqueda exacta) o un
+    IndiceColegios. Con vocabularios, las columnas de texto quedan como
+    categóricas compartidas.
+    """
+    if vocabularios is not None:
+        vocabularios.categorizar(df)
+    df["EDAD"] = calcular_edad(df["ANIO"], df["FECHA_NAC"])
+    df["MAYOR_EDAD"] = (df["EDAD"].to_numpy() >= 18).astype(int)
+    df["ANIOS_POST_BACH"] = calcular_anios_post_bach(df["ANIO"], df["ANIO_BACHILLERATO"])
+    df["TRABAJO_COLEGIO"] = calcular_trabajo_colegio(df["TRABAJA"], df["TIPO_COLEGIO"])
+    df["MIGRA_UNIVERSIDAD"] = calcular_migra_universidad(
+        df["CIUDAD_COLEGIO"], df["PROVINCIA_COLEGIO"]
+    )
+    if isinstance(tasa_por_colegio, IndiceColegios):
+        # Búsqueda tolerante: también deja a qué colegio se asoció cada nombre
+        # y de qué nivel (colegio, municipio, ..., global) salió la tasa
+        tasa, referencia, coincidencia, nivel = tasa_por_colegio.resolver(df)
+        df["TASA_APR_COLEGIO"] = tasa
+        df["COLEGIO_REFERENCIA"] = referencia
+        df["COINCIDENCIA_COLEGIO"] = coincidencia
+        df["NIVEL_TASA_COLEGIO"] = nivel
+    else:
+        df["TASA_APR_COLEGIO"] = tasa_colegio(df["NOMBRE_COLEGIO"], tasa_por_colegio)
+    if vocabularios is not None:
+        vocabularios.categorizar(df, ["TRABAJO_COLEGIO"])
+    return df
+
+
+def features_registro(datos, tasa_por_colegio):
+    """construir_features para un solo postulante: dict crudo (como una fila
+    de los archivos del lote) -> dict con las columnas derivadas agregadas."""
+    df = construir_features(pd.DataFrame([datos]), tasa_por_colegio)
+    return df.to_dict("records")[0]
+
+
+def matriz_modelo(df, columnas_modelo):
+    """Entrada del modelo: columnas en el orden de entrenamiento, faltantes en 0."""
+    return df.reindex(columns=columnas_modelo, fill_value=0)
@@ -0,0 +1,202 @@
+"""Búsqueda tolerante de colegios para TASA_APR_COLEGIO.
+
+Un nombre del archivo se busca, en orden:
+  1. exacto en las tasas históricas;
+  2. normalizado (sin acentos, mayúsculas, puntuación ni espacios extra);
+  3. aproximado por trigramas, si la similitud supera UMBRAL_SIMILITUD y
+     los números del nombre coinciden ("COLEGIO 12" nunca es "COLEGIO 13").
+Las búsquedas se hacen una vez por nombre distinto, no por fila.
+
+Los nombres sin coincidencia toman la tasa de respaldo de su municipio,
+provincia o ciudad (ver core.tasas_niveles).
+"""
+import re
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from core.categorias import normalizar_nombres
+from core.tasas_niveles import NOMBRES_NIVEL, TasasNiveles
+
+
+UMBRAL_SIMILITUD = 0.75
+
+EXACTA = "exacta"
+NORMALIZADA = "normalizada"
+APROXIMADA = "aproximada"
+SIN_COINCIDENCIA = "sin_coincidencia"
+TIPOS_COINCIDENCIA = [EXACTA, NORMALIZADA, APROXIMADA, SIN_COINCIDENCIA]
+
+COLUMNAS_INFORME = [
+    "NOMBRE_COLEGIO", "COLEGIO_REFERENCIA", "COINCIDENCIA_COLEGIO",
+    "NIVEL_TASA_COLEGIO", "FILAS",
+]
+
+_NUMEROS = re.compile(r"\d+")
+
+
+def trigramas(nombre_normalizado):
+    texto = f"  {nombre_normalizado} "
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+
+# ===============================
+# Índice
+# ===============================
+class IndiceColegios:
+    """Índice de los colegios con tasa histórica (id = posición en tasas)."""
+
+    def __init__(self, tasas, apoyo=None, umbral=UMBRAL_SIMILITUD, respaldo=None):
+        self.nombres = pd.Index(tasas.index.astype(str))
+        self.tasas = tasas.to_numpy(dtype="float64")
+        self.umbral = umbral
+        self.respaldo = respaldo
+
+        # Nombres que normalizan igual: gana el colegio con más historial
+        apoyo = np.ones(len(self.nombres)) if apoyo is None else np.asarray(apoyo)
+        normalizados = normalizar_nombres(self.nombres)
+        self._por_normalizado = {}
+        for id_, clave in sorted(enumerate(normalizados), key=lambda p: apoyo[p[0]]):
+            self._por_normalizado[clave] = id_
+
+        self._trigramas = {}
+        self._tamanos = {}
+        self._numeros = {}
+        for clave, id_ in self._por_normalizado.items():
+            tri = trigramas(clave)
+            self._tamanos[id_] = len(tri)
+            self._numeros[id_] = _NUMEROS.findall(clave)
+            for t in tri:
+                self._trigramas.setdefault(t, []).append(id_)
+
+        # Resultados aproximados ya calculados (entre bloques del mismo lote)
+        self._aproximados = {}
+
+    @classmethod
+    def desde_estadisticas(cls, estadisticas):
+        tasas = estadisticas["tasas_colegio"]
+        return cls(
+            tasas["tasa"], apoyo=tasas["n"].to_numpy(),
+            respaldo=TasasNiveles.desde_estadisticas(estadisticas),
+        )
+
+    def __len__(self):
+        return len(self.nombres)
+
+    def aproximado(self, normalizado):
+        """(id, similitud) del colegio más parecido, o (-1, mejor similitud)."""
+        if normalizado in self._aproximados:
+            return self._aproximados[normalizado]
+
+        tri = trigramas(normalizado)
+        comunes = Counter()
+        for t in tri:
+            comunes.update(self._trigramas.get(t, ()))
+
+        numeros = _NUMEROS.findall(normalizado)
+        mejor, similitud = -1, 0.0
+        for id_, n in comunes.items():
+            # Coeficiente de Dice sobre los conjuntos de trigramas
+            s = 2.0 * n / (len(tri) + self._tamanos[id_])
+            if s > similitud and self._numeros[id_] == numeros:
+                mejor, similitud = id_, s
+
+        resultado = (mejor, similitud) if similitud >= self.umbral else (-1, similitud)
+        self._aproximados[normalizado] = resultado
+        return resultado
+
+    def buscar_unicos(self, unicos):
+        """ids y tipo de coincidencia para nombres distintos (Index de texto)."""
+        unicos = pd.Index(unicos).astype(str)
+        ids = self.nombres.get_indexer(unicos)
+        tipos = np.where(ids >= 0, 0, 3).astype("int8")
+
+        faltan = np.flatnonzero(ids < 0)
+        if len(faltan):
+            normalizados = normalizar_nombres(unicos[faltan])
+            for i, clave in zip(faltan, normalizados):
+                id_ = self._por_normalizado.get(clave, -1)
+                if id_ >= 0:
+                    ids[i], tipos[i] = id_, 1
+                    continue
+                id_, _ = self.aproximado(clave)
+                if id_ >= 0:
+                    ids[i], tipos[i] = id_, 2
+        return ids, tipos
+
+    def buscar(self, nombres):
+        """Por fila: tasa (0.0 sin coincidencia), colegio de referencia y tipo."""
+        if isinstance(nombres.dtype, pd.CategoricalDtype):
+            codigos = nombres.cat.codes.to_numpy()
+            unicos = nombres.cat.categories
+        else:
+            codigos, unicos = pd.factorize(nombres)
+
+        ids, tipos = self.buscar_unicos(unicos)
+        # El código -1 (nombre vacío) toma el elemento agregado al final
+        ids = np.append(ids, -1)[codigos]
+        tipos = np.append(tipos, 3)[codigos]
+
+        tasa = np.append(self.tasas, 0.0)[ids]
+        referencia = pd.Categorical.from_codes(ids, categories=self.nombres)
+        coincidencia = pd.Categorical.from_codes(tipos, categories=TIPOS_COINCIDENCIA)
+        return tasa, referencia, coincidencia
+
+    def resolver(self, df):
+        """Como buscar(), pero los colegios sin coincidencia toman la tasa del
+        nivel geográfico más específico con apoyo suficiente. Devuelve también
+        el nivel usado por fila."""
+        tasa, referencia, coincidencia = self.buscar(df["NOMBRE_COLEGIO"])
+        sin_historial = referencia.codes == -1
+
+        niveles = np.zeros(len(df), dtype="int8")
+        if self.respaldo is not None and sin_historial.any():
+            respaldo, niveles = self.respaldo.resolver(df, sin_historial)
+            tasa = np.where(sin_historial, respaldo, tasa)
+        nivel = pd.Categorical.from_codes(niveles, categories=NOMBRES_NIVEL)
+        return tasa, referencia, coincidencia, nivel
+
+
+# ===============================
+# Informe de nombres no exactos
+# ===============================
+class InformeColegios:
+    """Acumula, bloque a bloque, los nombres que no coincidieron exactamente."""
+
+    def __init__(self):
+        self._conteos = Counter()
+
+    def agregar(self, df):
+        if "COINCIDENCIA_COLEGIO" not in df.columns:
+            return
+        no_exactas = df["COINCIDENCIA_COLEGIO"] != EXACTA
+        if not no_exactas.any():
+            return
+        columnas = [c for c in COLUMNAS_INFORME[:-1] if c in df.columns]
+        grupos = (
+            df.loc[no_exactas, columnas]
+            .reindex(columns=COLUMNAS_INFORME[:-1])
+            .astype(object)
+            .fillna("")
+            .value_counts()
+        )
+        self._conteos.update(grupos.to_dict())
+
+    def __len__(self):
+        return len(self._conteos)
+
+    def filas(self, tipo):
+        return sum(n for clave, n in self._conteos.items() if clave[2] == tipo)
+
+    def tabla(self):
+        filas = [(*clave, n) for clave, n in self._conteos.items()]
+        tabla = pd.DataFrame(filas, columns=COLUMNAS_INFORME)
+        # Primero los nombres sin coincidencia, luego los aproximados
+        orden = tabla["COINCIDENCIA_COLEGIO"].map(TIPOS_COINCIDENCIA.index)
+        return (
+            tabla.assign(_orden=orden)
+            .sort_values(["_orden", "FILAS"], ascending=False)
+            .drop(columns="_orden")
+            .reset_index(drop=True)
+        )
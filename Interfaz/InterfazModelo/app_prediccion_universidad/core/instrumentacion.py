@@ -0,0 +1,256 @@
+"""Medición por etapas: tiempo, filas/s y memoria pico.
+
+Cada ejecución medida (un lote, una predicción, la carga de un artefacto)
+se agrega como una línea JSON a logs/instrumentacion.jsonl y se entrega a
+los oyentes suscritos (la interfaz la muestra en la barra de estado). El
+log se rota al superar TAMANO_MAX_LOG (se guardan COPIAS_LOG anteriores).
+
+Sin modo detallado solo se informa la memoria pico del proceso (el máximo
+desde que arrancó, no el de la ejecución). Modo detallado
+(PREDICCION_PERFIL_DETALLADO=1 o activar_detallado()): memoria pico por
+etapa con tracemalloc y perfil cProfile de la ejecución. Es bastante más
+lento; solo para diagnosticar.
+"""
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+RUTA_LOG = os.environ.get(
+    "PREDICCION_LOG_METRICAS",
+    os.path.join(BASE_DIR, "logs", "instrumentacion.jsonl")
+)
+
+TAMANO_MAX_LOG = int(os.environ.get("PREDICCION_LOG_MAX_BYTES", 5 * 2**20))
+COPIAS_LOG = 3
+
+FUNCIONES_PERFIL = 15
+
+_detallado = os.environ.get("PREDICCION_PERFIL_DETALLADO", "") not in ("", "0")
+_oyentes = []
+_log_lock = threading.Lock()
+# Un solo cProfile por hilo: las mediciones anidadas no abren otro
+_hilo = threading.local()
+
+
+def activar_detallado(activo=True):
+    global _detallado
+    _detallado = bool(activo)
+
+
+def suscribir(oyente):
+    """oyente(registro) se llama con cada medición registrada (desde cualquier hilo)."""
+    if oyente not in _oyentes:
+        _oyentes.append(oyente)
+
+
+def desuscribir(oyente):
+    if oyente in _oyentes:
+        _oyentes.remove(oyente)
+
+
+def memoria_pico_mb():
+    """Memoria residente máxima del proceso en MB desde que arrancó (None si
+    no se puede medir)."""
+    try:
+        import resource
+    except ImportError:
+        try:
+            import psutil
+        except ImportError:
+            return None
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss) / 2**20
+
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reporta KB, macOS bytes
+    return pico / 2**20 if sys.platform == "darwin" else pico / 2**10
+
+
+# ===============================
+# Medición de una ejecución
+# ===============================
+class Instrumentacion:
+    """Acumula tiempo y filas por etapa durante una ejecución.
+
+    Las etapas pueden medirse varias veces (una por bloque); los tiempos se
+    suman. `registrar()` cierra la ejecución, escribe el log y avisa a los
+    oyentes.
+    """
+
+    def __init__(self, contexto, etapas=(), detallado=None, ruta_log=None):
+        self.contexto = contexto
+        self.detallado = _detallado if detallado is None else detallado
+        self.ruta_log = ruta_log or RUTA_LOG
+        self.tiempos = dict.fromkeys(etapas, 0.0)
+        self.filas = dict.fromkeys(etapas, 0)
+        self.memoria_etapas = {}
+        self._inicio = time.perf_counter()
+
+        self._perfil = None
+        # Solo quien inicia tracemalloc lo detiene (las mediciones se anidan)
+        self._tracemalloc = False
+        if self.detallado:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._tracemalloc = True
+            if not getattr(_hilo, "perfilando", False):
+                self._perfil = cProfile.Profile()
+                self._perfil.enable()
+                _hilo.perfilando = True
+
+    @contextmanager
+    def etapa(self, nombre, filas=0):
+        if self.detallado:
+            tracemalloc.reset_peak()
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.tiempos[nombre] = (
+                self.tiempos.get(nombre, 0.0) + time.perf_counter() - inicio
+            )
+            self.filas[nombre] = self.filas.get(nombre, 0) + filas
+            if self.detallado:
+                pico = tracemalloc.get_traced_memory()[1] / 2**20
+                self.memoria_etapas[nombre] = max(
+                    pico, self.memoria_etapas.get(nombre, 0.0)
+                )
+
+    def medir(self, etapa, funcion, *args, filas=0):
+        with self.etapa(etapa, filas):
+            return funcion(*args)
+
+    def agregar_filas(self, etapa, filas):
+        self.filas[etapa] = self.filas.get(etapa, 0) + filas
+
+    def sumar(self, tiempos, filas):
+        """Agrega etapas medidas en otro proceso (p. ej. un trabajador del pool).
+
+        Los tiempos de varios procesos se suman: en modo paralelo una etapa
+        informa segundos de trabajo de todos los procesos, no tiempo de reloj.
+        """
+        for etapa, segundos in tiempos.items():
+            self.tiempos[etapa] = self.tiempos.get(etapa, 0.0) + segundos
+        for etapa, n in filas.items():
+            self.agregar_filas(etapa, n)
+
+    # ===============================
+    # Resumen y log
+    # ===============================
+    def resumen(self):
+        etapas = []
+        for nombre, segundos in self.tiempos.items():
+            filas = self.filas.get(nombre, 0)
+            etapas.append({
+                "etapa": nombre,
+                "segundos": round(segundos, 6),
+                "filas": filas,
+                "filas_s": round(filas / segundos, 1) if filas and segundos > 0 else None,
+                "memoria_pico_mb": (
+                    round(self.memoria_etapas[nombre], 2)
+                    if nombre in self.memoria_etapas else None
+                ),
+            })
+        return etapas
+
+    def registrar(self, **extra):
+        registro = {
+            "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "contexto": self.contexto,
+            "total_segundos": round(time.perf_counter() - self._inicio, 6),
+            "memoria_pico_proceso_mb": memoria_pico_mb(),
+            "detallado": self.detallado,
+            "etapas": self.resumen(),
+        }
+        registro.update(extra)
+
+        if self._perfil is not None:
+            self._perfil.disable()
+            _hilo.perfilando = False
+            registro["perfil"] = self._guardar_perfil()
+            self._perfil = None
+        if self._tracemalloc:
+            tracemalloc.stop()
+            self._tracemalloc = False
+
+        _escribir_log(self.ruta_log, registro)
+        for oyente in list(_oyentes):
+            try:
+                oyente(registro)
+            except Exception:
+                pass
+        return registro
+
+    def _guardar_perfil(self):
+        carpeta = os.path.dirname(self.ruta_log)
+        nombre = f"perfil_{self.contexto}_{time.strftime('%Y%m%d-%H%M%S')}.prof"
+        ruta = os.path.join(carpeta, nombre.replace(":", "_"))
+        try:
+            os.makedirs(carpeta, exist_ok=True)
+            self._perfil.dump_stats(ruta)
+        except OSError:
+            ruta = None
+
+        texto = io.StringIO()
+        pstats.Stats(self._perfil, stream=texto).sort_stats("cumulative").print_stats(
+            FUNCIONES_PERFIL
+        )
+        return {"archivo": ruta, "resumen": texto.getvalue()}
+
+
+def _rotar_log(ruta):
+    """instrumentacion.jsonl -> .1 -> .2 ...; se descarta la copia más antigua."""
+    for i in range(COPIAS_LOG - 1, 0, -1):
+        if os.path.exists(f"{ruta}.{i}"):
+            os.replace(f"{ruta}.{i}", f"{ruta}.{i + 1}")
+    os.replace(ruta, f"{ruta}.1")
+
+
+def _escribir_log(ruta, registro):
+    # Un fallo al escribir el log nunca debe interrumpir la evaluación
+    try:
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        linea = json.dumps(registro, ensure_ascii=False, default=str) + "\n"
+        with _log_lock:
+            if os.path.exists(ruta) and os.path.getsize(ruta) + len(linea) > TAMANO_MAX_LOG:
+                _rotar_log(ruta)
+            with open(ruta, "a", encoding="utf-8") as f:
+                f.write(linea)
+    except OSError:
+        pass
+
+
+def medir_una_vez(contexto, etapa, funcion, *args):
+    """Mide y registra una única llamada (p. ej. la carga de un artefacto)."""
+    instrumentacion = Instrumentacion(contexto, (etapa,))
+    resultado = instrumentacion.medir(etapa, funcion, *args)
+    instrumentacion.registrar()
+    return resultado
+
+
+def texto_resumen(registro):
+    """Una línea legible para la barra de estado."""
+    partes = []
+    for etapa in registro["etapas"]:
+        if etapa["segundos"] < 1:
+            texto = f"{etapa['etapa']} {etapa['segundos'] * 1000:.0f} ms"
+        else:
+            texto = f"{etapa['etapa']} {etapa['segundos']:.2f} s"
+        if etapa["filas_s"]:
+            texto += f" ({etapa['filas_s']:,.0f} filas/s)"
+        partes.append(texto)
+
+    linea = f"{registro['contexto']}: " + " · ".join(partes)
+    if registro.get("memoria_pico_proceso_mb"):
+        linea += f" · memoria pico del proceso {registro['memoria_pico_proceso_mb']:,.0f} MB"
+    return linea
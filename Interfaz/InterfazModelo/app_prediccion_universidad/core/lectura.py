@@ -0,0 +1,231 @@
+import os
+
+import pandas as pd
+
+from core.categorias import tipos_lectura
+from core.features import COLUMNAS_DERIVADAS, COLUMNAS_ENTRADA
+
+
+TAMANO_BLOQUE = 5000
+# El primer bloque es pequeño para mostrar resultados cuanto antes
+TAMANO_PRIMER_BLOQUE = 500
+
+FORMATOS = {
+    ".csv": "csv",
+    ".txt": "csv",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".xlsx": "excel",
+    ".xlsm": "excel",
+    ".xls": "excel_antiguo",
+}
+
+FILTRO_ARCHIVOS = "Postulantes (*.xlsx *.xlsm *.xls *.csv *.txt *.parquet *.pq)"
+
+
+def formato_archivo(ruta):
+    extension = os.path.splitext(ruta)[1].lower()
+    formato = FORMATOS.get(extension)
+    if formato is None:
+        raise ValueError(
+            f"Formato no soportado: {extension or ruta}. "
+            f"Use Excel (.xlsx), CSV o Parquet."
+        )
+    return formato
+
+
+# ===============================
+# Proyección de columnas
+# ===============================
+def columnas_necesarias(columnas_modelo, extra=()):
+    """Columnas crudas que hay que leer: entradas del modelo que vienen del
+    archivo, entradas del pipeline de features y columnas de la vista."""
+    derivadas = set(COLUMNAS_DERIVADAS) | {"RESULTADO_FINAL"}
+    columnas = [c for c in columnas_modelo if c not in derivadas]
+    for col in list(COLUMNAS_ENTRADA) + list(extra):
+        if col not in columnas and col not in derivadas:
+            columnas.append(col)
+    return columnas
+
+
+def columnas_conservadas(ruta, columnas_modelo):
+    """Columnas del archivo que el modelo no usa (identificadores, nombres...).
+
+    Se leen como extra para devolverlas junto a los resultados; el modelo
+    solo recibe sus propias columnas.
+    """
+    usadas = set(columnas_necesarias(columnas_modelo)) | set(COLUMNAS_DERIVADAS)
+    return [c for c in leer_encabezado(ruta) if c not in usadas]
+
+
+def _validar_columnas(disponibles, columnas):
+    faltantes = [c for c in COLUMNAS_ENTRADA if c not in disponibles]
+    if faltantes:
+        raise ValueError(
+            "Faltan columnas en el archivo: " + ", ".join(faltantes)
+        )
+    if columnas is None:
+        return list(disponibles)
+    return [c for c in disponibles if c in set(columnas)]
+
+
+def leer_encabezado(ruta):
+    """Nombres de columna del archivo, sin leer sus filas."""
+    formato = formato_archivo(ruta)
+
+    if formato == "csv":
+        return [str(c) for c in pd.read_csv(ruta, nrows=0).columns]
+
+    if formato == "parquet":
+        import pyarrow.parquet as pq
+        return list(pq.ParquetFile(ruta).schema_arrow.names)
+
+    if formato == "excel":
+        libro, hoja = _abrir_hoja(ruta)
+        try:
+            encabezado = next(hoja.iter_rows(max_row=1, values_only=True), ())
+            return [str(c) for c in encabezado]
+        finally:
+            libro.close()
+
+    return [str(c) for c in pd.read_excel(ruta, nrows=0).columns]
+
+
+# ===============================
+# Conteo de filas (para progreso/ETA)
+# ===============================
+def contar_filas(ruta):
+    """Número de filas de datos, o None si no se puede saber sin leer el archivo."""
+    formato = formato_archivo(ruta)
+
+    if formato == "csv":
+        saltos = 0
+        ultimo = b"\n"
+        with open(ruta, "rb") as f:
+            for parte in iter(lambda: f.read(1 << 20), b""):
+                saltos += parte.count(b"\n")
+                ultimo = parte[-1:]
+        if ultimo != b"\n":
+            saltos += 1
+        return max(saltos - 1, 0)
+
+    if formato == "parquet":
+        import pyarrow.parquet as pq
+        return pq.ParquetFile(ruta).metadata.num_rows
+
+    if formato == "excel":
+        libro, hoja = _abrir_hoja(ruta)
+        try:
+            if hoja.max_row is None:
+                return None
+            return max(hoja.max_row - 1, 0)
+        finally:
+            libro.close()
+
+    return None
+
+
+# ===============================
+# Lectura por bloques
+# ===============================
+def leer_por_bloques(ruta, tamano_bloque=TAMANO_BLOQUE,
+                     primer_bloque=TAMANO_PRIMER_BLOQUE, columnas=None, texto=()):
+    """Genera DataFrames de hasta tamano_bloque filas, en el orden del archivo.
+
+    Si se indica columnas, solo se leen esas (las que existan en el archivo).
+    Las columnas de `texto` se leen sin convertir (p. ej. un CI con ceros a
+    la izquierda) en los formatos que no guardan tipos (CSV y .xls).
+    """
+    lectores = {
+        "csv": _bloques_csv,
+        "parquet": _bloques_parquet,
+        "excel": _bloques_excel,
+        "excel_antiguo": _bloques_excel_antiguo,
+    }
+    primer_bloque = min(primer_bloque or tamano_bloque, tamano_bloque)
+    lector = lectores[formato_archivo(ruta)]
+    yield from lector(ruta, tamano_bloque, primer_bloque, columnas, texto)
+
+
+def _tipos_texto(usar, texto):
+    # Texto repetido (colegio, ciudad...) como categórica desde el parser
+    tipos = {col: str for col in texto if col in usar}
+    tipos.update(tipos_lectura(usar))
+    return tipos
+
+
+def _bloques_csv(ruta, tamano_bloque, primer_bloque, columnas, texto):
+    encabezado = pd.read_csv(ruta, nrows=0).columns
+    usar = _validar_columnas(encabezado, columnas)
+
+    with pd.read_csv(ruta, usecols=usar, dtype=_tipos_texto(usar, texto),
+                     chunksize=tamano_bloque) as lector:
+        try:
+            yield lector.get_chunk(primer_bloque)
+        except StopIteration:
+            return
+        yield from lector
+
+
+def _bloques_parquet(ruta, tamano_bloque, primer_bloque, columnas, texto):
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Para leer archivos Parquet instale pyarrow") from None
+
+    archivo = pq.ParquetFile(ruta)
+    usar = _validar_columnas(archivo.schema_arrow.names, columnas)
+
+    for lote in archivo.iter_batches(batch_size=tamano_bloque, columns=usar):
+        yield lote.to_pandas()
+
+
+def _abrir_hoja(ruta):
+    from openpyxl import load_workbook
+
+    # read_only: las filas se leen en streaming, sin cargar todo el libro
+    libro = load_workbook(ruta, read_only=True, data_only=True)
+    return libro, libro.worksheets[0]
+
+
+def _bloques_excel(ruta, tamano_bloque, primer_bloque, columnas, texto):
+    libro, hoja = _abrir_hoja(ruta)
+    try:
+        filas = hoja.iter_rows(values_only=True)
+        encabezado = next(filas, None)
+        if encabezado is None:
+            return
+
+        encabezado = [str(c) for c in encabezado]
+        usar = _validar_columnas(encabezado, columnas)
+        posiciones = [encabezado.index(c) for c in usar]
+
+        limite = primer_bloque
+        bloque = []
+        for fila in filas:
+            if all(v is None for v in fila):
+                continue
+            bloque.append([fila[i] if i < len(fila) else None for i in posiciones])
+            if len(bloque) >= limite:
+                yield pd.DataFrame(bloque, columns=usar)
+                bloque = []
+                limite = tamano_bloque
+
+        if bloque:
+            yield pd.DataFrame(bloque, columns=usar)
+    finally:
+        libro.close()
+
+
+def _bloques_excel_antiguo(ruta, tamano_bloque, primer_bloque, columnas, texto):
+    # .xls no admite lectura en streaming: se lee una vez y se entrega por bloques
+    encabezado = pd.read_excel(ruta, nrows=0).columns
+    usar = _validar_columnas(encabezado, columnas)
+    df = pd.read_excel(ruta, usecols=usar, dtype={c: str for c in texto if c in usar})
+
+    inicio = 0
+    limite = primer_bloque
+    while inicio < len(df):
+        yield df.iloc[inicio:inicio + limite].reset_index(drop=True)
+        inicio += limite
+        limite = tamano_bloque
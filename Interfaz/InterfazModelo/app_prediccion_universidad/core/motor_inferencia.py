@@ -0,0 +1,292 @@
+"""Inferencia directa sobre el booster de XGBoost.
+
+El modelo guardado es un Pipeline de imblearn: ColumnTransformer
+(StandardScaler + OneHotEncoder) -> RandomUnderSampler -> XGBClassifier.
+Para predecir, MotorInferencia extrae una sola vez las medias/escalas, las
+categorías del one-hot y el booster, y arma la matriz de entrada float32
+directamente en un buffer reutilizable (uno por hilo), que se pasa a
+Booster.inplace_predict sin DataFrame intermedio ni DMatrix. Para un solo
+postulante (formulario) matriz_registro llena la fila desde el dict de datos.
+Con puntuar_explicado se obtienen además, en la misma pasada, las
+contribuciones por variable (ver core.contribuciones).
+
+Si el modelo no tiene esa estructura se usa MotorPipeline, que llama al
+pipeline completo como antes.
+"""
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from core.features import matriz_modelo
+
+
+# Filas por pasada: acota el buffer (FILAS_POR_PASADA x n_features float32)
+FILAS_POR_PASADA = 16384
+
+# Hasta esta cantidad de filas se predice con un solo hilo: con pocas filas
+# repartir el trabajo entre hilos cuesta más de lo que ahorra
+FILAS_UN_HILO = 64
+
+# Hilos para lotes grandes; 0 = los que elija XGBoost (todos los núcleos)
+HILOS_INFERENCIA = int(os.environ.get("PREDICCION_HILOS_INFERENCIA", "0"))
+
+
+class ModeloNoCompatible(ValueError):
+    pass
+
+
+# ===============================
+# Motor directo sobre el booster
+# ===============================
+class MotorInferencia:
+    def __init__(self, modelo, columnas_modelo, hilos=HILOS_INFERENCIA):
+        self.modelo = modelo
+        self.columnas_modelo = list(columnas_modelo)
+        self.hilos = hilos
+
+        preproceso, estimador = _partes_pipeline(modelo)
+        self._numericas = []  # (columna, posición, media, escala)
+        self._categoricas = []  # (columna, inicio, Index de categorías)
+
+        posicion = 0
+        for nombre, transformador, columnas in preproceso.transformers_:
+            if transformador == "drop" or nombre == "remainder":
+                continue
+            tipo = type(transformador).__name__
+            if tipo == "StandardScaler":
+                media = transformador.mean_ if transformador.mean_ is not None else 0.0
+                escala = transformador.scale_ if transformador.scale_ is not None else 1.0
+                for i, col in enumerate(columnas):
+                    self._numericas.append((
+                        col, posicion,
+                        float(np.broadcast_to(media, len(columnas))[i]),
+                        float(np.broadcast_to(escala, len(columnas))[i]),
+                    ))
+                    posicion += 1
+            elif tipo == "OneHotEncoder":
+                if transformador.drop is not None or transformador.handle_unknown != "ignore":
+                    raise ModeloNoCompatible("OneHotEncoder con drop o sin handle_unknown='ignore'")
+                for col, categorias in zip(columnas, transformador.categories_):
+                    self._categoricas.append((col, posicion, pd.Index(categorias)))
+                    posicion += len(categorias)
+            else:
+                raise ModeloNoCompatible(f"Transformador no soportado: {tipo}")
+
+        self.n_features = posicion
+        # Para matriz_registro: posición de cada categoría en un dict
+        self._posiciones_categoricas = [
+            (col, inicio, {valor: i for i, valor in enumerate(categorias.tolist())})
+            for col, inicio, categorias in self._categoricas
+        ]
+        # Variables originales en el orden de sus columnas de entrada; las
+        # columnas del one-hot de cada variable son contiguas
+        inicios = sorted([(c[1], c[0]) for c in self._numericas + self._categoricas])
+        self.variables = [col for _, col in inicios]
+        self._inicios = np.array([inicio for inicio, _ in inicios])
+        self._booster = estimador.get_booster().copy()
+        if self._booster.num_features() != self.n_features:
+            raise ModeloNoCompatible(
+                f"El booster espera {self._booster.num_features()} columnas, "
+                f"el preproceso genera {self.n_features}"
+            )
+        if hilos:
+            self._booster.set_param({"nthread": hilos})
+        self._booster_fila = self._booster.copy()
+        self._booster_fila.set_param({"nthread": 1})
+
+        try:
+            self._rango = (0, estimador.best_iteration + 1)
+        except AttributeError:
+            self._rango = (0, 0)
+
+        self._local = threading.local()
+
+    @classmethod
+    def desde_modelo(cls, modelo, columnas_modelo, hilos=HILOS_INFERENCIA):
+        """Motor directo si el modelo lo permite; si no, el pipeline completo."""
+        try:
+            return cls(modelo, columnas_modelo, hilos)
+        except (ModeloNoCompatible, AttributeError, TypeError):
+            return MotorPipeline(modelo, columnas_modelo)
+
+    # ===============================
+    # Matriz de entrada
+    # ===============================
+    def _buffer(self, filas):
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None or len(buffer) < filas:
+            buffer = np.empty((filas, self.n_features), dtype=np.float32)
+            self._local.buffer = buffer
+        return buffer
+
+    def matriz(self, df):
+        """Entrada del booster para df (a lo sumo FILAS_POR_PASADA filas).
+
+        Devuelve una vista del buffer del hilo: se sobreescribe en la
+        siguiente llamada.
+        """
+        n = len(df)
+        X = self._buffer(n)[:n]
+        X.fill(0.0)
+
+        for col, posicion, media, escala in self._numericas:
+            # Columna faltante = 0, como matriz_modelo (reindex con fill_value=0)
+            valores = df[col].to_numpy(dtype="float64") if col in df.columns else 0.0
+            X[:, posicion] = (valores - media) / escala
+
+        filas = np.arange(n)
+        for col, inicio, categorias in self._categoricas:
+            if col not in df.columns:
+                continue
+            ids = _posiciones(df[col], categorias)
+            # Categoría desconocida o faltante: todo en 0 (handle_unknown='ignore')
+            conocidas = ids >= 0
+            X[filas[conocidas], inicio + ids[conocidas]] = 1.0
+        return X
+
+    def matriz_registro(self, datos):
+        """Entrada del booster (1 fila) para un postulante dado como dict
+        columna -> valor, sin pasar por un DataFrame. Mismo resultado que
+        matriz(pd.DataFrame([datos])); también es una vista del buffer."""
+        X = self._buffer(1)[:1]
+        X.fill(0.0)
+        fila = X[0]
+
+        for col, posicion, media, escala in self._numericas:
+            valor = datos.get(col, 0.0)
+            fila[posicion] = np.nan if valor is None else (float(valor) - media) / escala
+
+        for col, inicio, posiciones in self._posiciones_categoricas:
+            i = posiciones.get(datos.get(col), -1)
+            if i >= 0:
+                fila[inicio + i] = 1.0
+        return X
+
+    # ===============================
+    # Predicción
+    # ===============================
+    def predecir(self, X):
+        booster = self._booster_fila if len(X) <= FILAS_UN_HILO else self._booster
+        return np.asarray(booster.inplace_predict(X, iteration_range=self._rango))
+
+    def contribuciones(self, X):
+        """Contribución (log-odds) de cada variable original, más la base.
+
+        Matriz float32 de len(X) x (len(variables) + 1). approx_contribs=True:
+        atribuciones de Saabas, no TreeSHAP exacto (ver core.contribuciones).
+        """
+        # xgboost ya está cargado (lo importa el modelo al deserializarse);
+        # importarlo aquí evita que importar este módulo lo cargue
+        import xgboost as xgb
+
+        booster = self._booster_fila if len(X) <= FILAS_UN_HILO else self._booster
+        crudas = booster.predict(
+            xgb.DMatrix(X), pred_contribs=True, approx_contribs=True,
+            iteration_range=self._rango
+        )
+        agregadas = np.empty((len(X), len(self.variables) + 1), dtype=np.float32)
+        agregadas[:, :-1] = np.add.reduceat(crudas[:, :-1], self._inicios, axis=1)
+        agregadas[:, -1] = crudas[:, -1]
+        return agregadas
+
+    def puntuar(self, df, instrumentacion=None):
+        """Probabilidad de aprobar (clase 1) para cada fila de df."""
+        return self._puntuar(df, instrumentacion, False)[0]
+
+    def puntuar_explicado(self, df, instrumentacion=None):
+        """(probabilidad, contribuciones) para cada fila de df."""
+        return self._puntuar(df, instrumentacion, True)
+
+    def _puntuar(self, df, instrumentacion, explicar):
+        proba = np.empty(len(df), dtype=np.float32)
+        contribuciones = (
+            np.empty((len(df), len(self.variables) + 1), dtype=np.float32)
+            if explicar else None
+        )
+        for inicio in range(0, len(df), FILAS_POR_PASADA):
+            parte = df.iloc[inicio:inicio + FILAS_POR_PASADA]
+            fin = inicio + len(parte)
+            if instrumentacion is None:
+                X = self.matriz(parte)
+                proba[inicio:fin] = self.predecir(X)
+                if explicar:
+                    contribuciones[inicio:fin] = self.contribuciones(X)
+                continue
+
+            X = instrumentacion.medir("reindexado", self.matriz, parte, filas=len(parte))
+            proba[inicio:fin] = instrumentacion.medir(
+                "inferencia", self.predecir, X, filas=len(parte)
+            )
+            if explicar:
+                contribuciones[inicio:fin] = instrumentacion.medir(
+                    "contribuciones", self.contribuciones, X, filas=len(parte)
+                )
+        return proba, contribuciones
+
+
+# ===============================
+# Respaldo: pipeline completo
+# ===============================
+class MotorPipeline:
+    """Misma interfaz que MotorInferencia, usando predict_proba del pipeline."""
+
+    def __init__(self, modelo, columnas_modelo):
+        self.modelo = modelo
+        self.columnas_modelo = list(columnas_modelo)
+        self.variables = []
+
+    def matriz(self, df):
+        return matriz_modelo(df, self.columnas_modelo)
+
+    def matriz_registro(self, datos):
+        return self.matriz(pd.DataFrame([datos]))
+
+    def predecir(self, X):
+        return np.asarray(self.modelo.predict_proba(X)[:, 1])
+
+    def contribuciones(self, X):
+        # Sin acceso a las columnas del booster no hay contribuciones
+        return None
+
+    def puntuar(self, df, instrumentacion=None):
+        if instrumentacion is None:
+            return self.predecir(self.matriz(df))
+        X = instrumentacion.medir("reindexado", self.matriz, df, filas=len(df))
+        return instrumentacion.medir("inferencia", self.predecir, X, filas=len(df))
+
+    def puntuar_explicado(self, df, instrumentacion=None):
+        return self.puntuar(df, instrumentacion), None
+
+
+# ===============================
+# Auxiliares
+# ===============================
+def _partes_pipeline(modelo):
+    pasos = getattr(modelo, "steps", None)
+    if not pasos:
+        raise ModeloNoCompatible("El modelo no es un Pipeline")
+
+    preproceso = pasos[0][1]
+    estimador = pasos[-1][1]
+    if type(preproceso).__name__ != "ColumnTransformer":
+        raise ModeloNoCompatible("El primer paso no es un ColumnTransformer")
+    if preproceso.remainder != "drop":
+        raise ModeloNoCompatible("ColumnTransformer con remainder distinto de 'drop'")
+    if not hasattr(estimador, "get_booster"):
+        raise ModeloNoCompatible("El último paso no es un modelo de XGBoost")
+    for _, paso in pasos[1:-1]:
+        # Los muestreadores de imblearn solo actúan al entrenar
+        if not hasattr(paso, "fit_resample"):
+            raise ModeloNoCompatible(f"Paso intermedio no soportado: {type(paso).__name__}")
+    return preproceso, estimador
+
+
+def _posiciones(serie, categorias):
+    """Posición de cada valor en las categorías del one-hot (-1 si no está)."""
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        # Se traducen las categorías (pocas) y luego los códigos por fila
+        traduccion = categorias.get_indexer(serie.cat.categories.astype(object))
+        return np.append(traduccion, -1)[serie.cat.codes.to_numpy()]
+    return categorias.get_indexer(serie.to_numpy(dtype=object))
@@ -0,0 +1,84 @@
+import numpy as np
+
+from core.features import construir_features
+
+
+ETIQUETA_EN_RIESGO = "EN RIESGO"
+ETIQUETA_FUERA_RIESGO = "FUERA DE RIESGO"
+
+UMBRAL_RIESGO = 0.5
+
+# Bandas por probabilidad de aprobar: p < 0.35 -> ALTO, p < umbral -> MEDIO,
+# resto BAJO. ALTO y MEDIO son las dos bandas de EN RIESGO.
+CORTE_RIESGO_ALTO = 0.35
+NIVELES_RIESGO = ("ALTO", "MEDIO", "BAJO")
+
+
+# ===============================
+# Inferencia
+# ===============================
+def puntuar(modelo, X):
+    """Probabilidad de aprobar (clase 1) con una sola pasada del modelo.
+
+    modelo puede ser el pipeline o un motor de core.motor_inferencia.
+    """
+    if hasattr(modelo, "puntuar"):
+        return modelo.puntuar(X)
+    return np.asarray(modelo.predict_proba(X)[:, 1])
+
+
+def puntuar_bloque(motor, tasa_por_colegio, df, vocabularios=None, contribuciones=False,
+                   instrumentacion=None):
+    """Features + probabilidad para un bloque de postulantes (en el lugar).
+
+    Devuelve (df, contribuciones): con contribuciones=True, la matriz float32
+    de contribuciones alineada con las filas de df (ver core.contribuciones);
+    si no, None. Con instrumentacion se miden features, reindexado,
+    inferencia y contribuciones.
+    """
+    if instrumentacion is None:
+        construir_features(df, tasa_por_colegio, vocabularios)
+    else:
+        instrumentacion.medir(
+            "features", construir_features, df, tasa_por_colegio, vocabularios,
+            filas=len(df)
+        )
+    if contribuciones:
+        df["PROBABILIDAD"], matriz = motor.puntuar_explicado(df, instrumentacion)
+        return df, matriz
+    df["PROBABILIDAD"] = motor.puntuar(df, instrumentacion)
+    return df, None
+
+
+# ===============================
+# Criterio de riesgo
+# ===============================
+class CriterioRiesgo:
+    """Convierte probabilidades en etiquetas sin volver a llamar al modelo."""
+
+    def __init__(self, umbral=UMBRAL_RIESGO, corte_alto=CORTE_RIESGO_ALTO):
+        self.umbral = float(umbral)
+        self.corte_alto = float(corte_alto)
+        self.niveles = np.asarray(NIVELES_RIESGO, dtype=object)
+
+    @property
+    def cortes(self):
+        return np.array([min(self.corte_alto, self.umbral), self.umbral])
+
+    def en_riesgo(self, proba):
+        return np.asarray(proba) < self.umbral
+
+    def etiquetar(self, proba):
+        return np.where(
+            self.en_riesgo(proba), ETIQUETA_EN_RIESGO, ETIQUETA_FUERA_RIESGO
+        ).astype(object)
+
+    def nivel(self, proba):
+        return self.niveles[np.digitize(np.asarray(proba), self.cortes)]
+
+    def reetiquetar(self, df):
+        """Recalcula PREDICCION y NIVEL_RIESGO a partir de PROBABILIDAD."""
+        proba = df["PROBABILIDAD"].to_numpy()
+        df["PREDICCION"] = self.etiquetar(proba)
+        df["NIVEL_RIESGO"] = self.nivel(proba)
+        return df
@@ -0,0 +1,169 @@
+"""Re-evaluación incremental de un archivo ya evaluado.
+
+Cada fila leída se identifica por un hash de su contenido (las columnas de
+entrada, no la posición). Al volver a cargar el archivo solo se puntúan las
+filas nuevas o modificadas; las demás toman el resultado de la evaluación
+anterior (también sus contribuciones, si se guardaron). Si cambia el
+modelo o las columnas leídas no se reutiliza nada.
+"""
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+
+COLUMNA_HASH = "HASH_FILA"
+
+
+def _normalizar(serie, numerica):
+    # El dtype que infiere el lector cambia con el contenido del bloque (una
+    # celda vacía vuelve float64 una columna int64, Excel entrega object):
+    # el mismo valor debe dar el mismo hash en cualquier bloque
+    if numerica or pd.api.types.is_numeric_dtype(serie.dtype):
+        if isinstance(serie.dtype, pd.CategoricalDtype):
+            serie = serie.astype(object)
+        return pd.to_numeric(serie, errors="coerce").astype("float64")
+    texto = serie.astype(object)
+    return texto.where(texto.notna(), "").astype(str)
+
+
+def hash_filas(df, columnas=None, numericas=()):
+    """Hash de 64 bits por fila sobre las columnas dadas (sin el índice).
+
+    Las columnas de `numericas` (y las que ya son numéricas) se comparan
+    como float64; el resto como texto.
+    """
+    columnas = sorted(df.columns if columnas is None else columnas)
+    numericas = set(numericas)
+    normalizado = pd.DataFrame(
+        {col: _normalizar(df[col], col in numericas) for col in columnas},
+        index=df.index,
+    )
+    return pd.util.hash_pandas_object(normalizado, index=False).to_numpy()
+
+
+# ===============================
+# Resultados de la evaluación anterior
+# ===============================
+class ResultadosPrevios:
+    """Resultados ya puntuados (con su COLUMNA_HASH) indexados por hash.
+
+    contribuciones: matriz alineada con las filas de df, o None.
+    """
+
+    def __init__(self, df, firma, contribuciones=None):
+        self.df = df
+        self.firma = firma
+        self.contribuciones = contribuciones
+        hashes = df[COLUMNA_HASH].to_numpy()
+        # Filas idénticas tienen el mismo resultado: basta la primera
+        unicas = ~pd.Index(hashes).duplicated()
+        self._hashes = pd.Index(hashes[unicas])
+        self._posiciones = np.flatnonzero(unicas)
+
+    def __len__(self):
+        return len(self._hashes)
+
+    def buscar(self, hashes):
+        """Posición en df de cada hash, -1 si no estaba."""
+        ids = self._hashes.get_indexer(hashes)
+        return np.where(ids >= 0, self._posiciones[ids], -1)
+
+
+# ===============================
+# Evaluación incremental
+# ===============================
+class PuntuacionIncremental:
+    """Separa cada bloque leído en filas reutilizables y filas a puntuar, y
+    vuelve a unir ambas partes en el orden original.
+
+    Uso:
+        nuevos = incremental.nuevos(bloques)        # solo filas a puntuar
+        resultados = incremental.combinar(puntuar(nuevos))
+
+    Los bloques puntuados y los combinados son pares (df, contribuciones);
+    con contribuciones=True solo se reutilizan resultados que las tengan.
+    """
+
+    def __init__(self, previos, firma, vocabularios=None, columnas=None, numericas=(),
+                 contribuciones=False):
+        if previos is not None and previos.firma != firma:
+            previos = None
+        if previos is not None and contribuciones and previos.contribuciones is None:
+            previos = None
+        self.previos = previos
+        self.firma = firma
+        self.contribuciones = contribuciones
+        self.vocabularios = vocabularios
+        self.columnas = columnas
+        self.numericas = numericas
+        self.reutilizadas = 0
+        self._pendientes = deque()
+
+    def nuevos(self, bloques, instrumentacion=None):
+        for df in bloques:
+            if instrumentacion is not None:
+                with instrumentacion.etapa("hash", len(df)):
+                    df[COLUMNA_HASH] = hash_filas(df, self.columnas, self.numericas)
+            else:
+                df[COLUMNA_HASH] = hash_filas(df, self.columnas, self.numericas)
+            if self.previos is None:
+                self._pendientes.append((df, None))
+                yield df
+                continue
+
+            posiciones = self.previos.buscar(df[COLUMNA_HASH].to_numpy())
+            self._pendientes.append((df, posiciones))
+            faltan = posiciones < 0
+            # Un bloque sin cambios no pasa por el modelo
+            if faltan.any():
+                yield df[faltan]
+
+    def combinar(self, puntuados):
+        puntuados = iter(puntuados)
+        siguiente = None  # bloque puntuado que aún no se unió a su bloque leído
+        while True:
+            if not self._pendientes:
+                # Pedir un bloque puntuado hace avanzar la lectura
+                siguiente = next(puntuados, None)
+                if not self._pendientes:
+                    return
+
+            leido, posiciones = self._pendientes.popleft()
+            if posiciones is not None and (posiciones >= 0).all():
+                yield self._unir(leido, posiciones, None)
+                continue
+
+            if siguiente is None:
+                siguiente = next(puntuados)
+            yield self._unir(leido, posiciones, siguiente)
+            siguiente = None
+
+    def _unir(self, leido, posiciones, puntuado):
+        if posiciones is None:
+            return puntuado
+
+        reutilizar = posiciones >= 0
+        self.reutilizadas += int(reutilizar.sum())
+        previas = self.previos.df.iloc[posiciones[reutilizar]].copy()
+        matriz_previa = None
+        if self.contribuciones:
+            matriz_previa = self.previos.contribuciones[posiciones[reutilizar]]
+        if puntuado is None:
+            previas.index = leido.index
+            return previas, matriz_previa
+
+        df, matriz = puntuado
+        partes = [df, previas]
+        if self.vocabularios is not None:
+            unido = self.vocabularios.concatenar(partes)
+        else:
+            unido = pd.concat(partes)
+        # Volver al orden del archivo
+        orden = np.concatenate([np.flatnonzero(~reutilizar), np.flatnonzero(reutilizar)])
+        devolver = np.argsort(orden, kind="stable")
+        unido = unido.iloc[devolver]
+        unido.index = leido.index
+        if matriz is None or matriz_previa is None:
+            return unido, None
+        return unido, np.concatenate([matriz, matriz_previa])[devolver]
@@ -0,0 +1,156 @@
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from core.artefactos import RegistroArtefactos, obtener_registro
+from core.instrumentacion import Instrumentacion
+from core.motor_inferencia import MotorInferencia
+from core.puntuacion import puntuar_bloque
+
+
+TAMANO_PARTICION = 5000
+
+# Por debajo de estas filas el pool no compensa lo que cuesta arrancar los
+# procesos y cargar el modelo en cada uno. bench.bench_paralelo midió ~2,1 s
+# de arranque y ~7 µs/fila en secuencial: con escalado ideal en 2 núcleos el
+# pool empieza a ganar hacia las 585 000 filas
+FILAS_MIN_PARALELO = 600_000
+
+
+# ===============================
+# Estado de cada proceso trabajador
+# ===============================
+_motor = None
+_tasa_por_colegio = None
+_vocabularios = None
+_contribuciones = False
+
+
+def _limitar_hilos(modelo, hilos):
+    # Cada proceso usa un solo hilo: el paralelismo lo da el pool
+    estimador = modelo.steps[-1][1] if hasattr(modelo, "steps") else modelo
+    if hasattr(estimador, "get_params") and "n_jobs" in estimador.get_params():
+        estimador.set_params(n_jobs=hilos)
+
+
+def _inicializar_trabajador(base_dir, hilos, contribuciones):
+    global _motor, _tasa_por_colegio, _vocabularios, _contribuciones
+
+    registro = RegistroArtefactos(base_dir)
+    modelo = registro.modelo
+    _limitar_hilos(modelo, hilos)
+    _motor = MotorInferencia.desde_modelo(modelo, registro.columnas_modelo, hilos)
+    # Índice de colegios y vocabularios salen del snapshot de estadísticas
+    _tasa_por_colegio = registro.indice_colegios
+    _vocabularios = registro.vocabularios
+    _contribuciones = contribuciones
+
+
+def _puntuar_particion(df):
+    # Cada etapa se mide aquí y se suma en el proceso principal
+    instrumentacion = Instrumentacion("particion", detallado=False)
+    df, matriz = puntuar_bloque(
+        _motor, _tasa_por_colegio, df, _vocabularios, _contribuciones, instrumentacion
+    )
+    return df, matriz, instrumentacion.tiempos, instrumentacion.filas
+
+
+def procesos_disponibles():
+    return os.cpu_count() or 1
+
+
+def procesos_recomendados(filas):
+    """Procesos para un lote de `filas` (-1 o None si no se conoce): el pool
+    solo se usa desde FILAS_MIN_PARALELO filas y con más de un núcleo."""
+    if filas is None or filas < FILAS_MIN_PARALELO:
+        return 1
+    return procesos_disponibles()
+
+
+# ===============================
+# Puntuación en un pool de procesos
+# ===============================
+class PuntuadorParalelo:
+    """Pool de procesos que cargan el modelo una sola vez en su inicializador.
+
+    Los resultados se devuelven siempre en el orden de entrada.
+    """
+
+    def __init__(self, procesos=None, registro=None, hilos_por_proceso=1,
+                 contribuciones=False):
+        registro = registro or obtener_registro()
+        self.procesos = procesos or procesos_disponibles()
+        # Bloques en vuelo: acota la memoria sin dejar procesos ociosos
+        self.max_pendientes = 2 * self.procesos
+
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.procesos,
+            # spawn: no se hereda el estado de Qt ni de los hilos del proceso padre
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_inicializar_trabajador,
+            initargs=(registro.base_dir, hilos_por_proceso, contribuciones),
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    def cerrar(self):
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+    def puntuar_bloques(self, bloques, instrumentacion=None):
+        """Genera los pares (df, contribuciones) en el mismo orden en que se leen.
+
+        Con instrumentacion se suman las etapas medidas en cada proceso.
+        """
+        pendientes = deque()
+        for bloque in bloques:
+            pendientes.append(self._pool.submit(_puntuar_particion, bloque))
+            if len(pendientes) >= self.max_pendientes:
+                yield self._recibir(pendientes.popleft(), instrumentacion)
+
+        while pendientes:
+            yield self._recibir(pendientes.popleft(), instrumentacion)
+
+    def _recibir(self, futuro, instrumentacion):
+        df, matriz, tiempos, filas = futuro.result()
+        if instrumentacion is not None:
+            instrumentacion.sumar(tiempos, filas)
+        return df, matriz
+
+    def puntuar(self, df, tamano_particion=TAMANO_PARTICION):
+        particiones = (
+            df.iloc[inicio:inicio + tamano_particion].copy()
+            for inicio in range(0, len(df), tamano_particion)
+        )
+        resultados = [df for df, _ in self.puntuar_bloques(particiones)]
+        if not resultados:
+            return df.assign(PROBABILIDAD=pd.Series(dtype="float64"))
+        return pd.concat(resultados)
+
+
+def medir_espera(resultados, instrumentacion, etapas_propias=("lectura",)):
+    """Recorre los resultados de puntuar_bloques midiendo como "espera_procesos"
+    el tiempo que este hilo queda bloqueado, sin las etapas que corre mientras
+    tanto (la lectura de los bloques que se envían)."""
+    def propio():
+        return sum(instrumentacion.tiempos.get(etapa, 0.0) for etapa in etapas_propias)
+
+    while True:
+        previo = propio()
+        inicio = time.perf_counter()
+        puntuado = next(resultados, None)
+        espera = time.perf_counter() - inicio - (propio() - previo)
+        instrumentacion.tiempos["espera_procesos"] = (
+            instrumentacion.tiempos.get("espera_procesos", 0.0) + espera
+        )
+        if puntuado is None:
+            return
+        instrumentacion.agregar_filas("espera_procesos", len(puntuado[0]))
+        yield puntuado
@@ -0,0 +1,124 @@
+"""Análisis "qué pasaría si" para un postulante.
+
+A partir de los datos de un postulante se arma la grilla completa de
+variaciones de una sola variable (cada valor posible de cada variable, el
+resto igual) y se puntúa toda la grilla con una sola llamada al modelo.
+Las variables son los datos crudos del formulario; las derivadas (EDAD,
+MAYOR_EDAD, ANIOS_POST_BACH...) se recalculan con construir_features en
+cada punto de la grilla.
+"""
+import numpy as np
+import pandas as pd
+
+from core.features import construir_features, matriz_modelo
+from core.puntuacion import puntuar
+
+
+# La tasa del colegio no se elige en el formulario: se recorre de 0% a 100%
+VALORES_TASA = np.round(np.linspace(0.0, 1.0, 21), 2).tolist()
+
+COLUMNAS_SENSIBILIDAD = ["VARIABLE", "VALOR", "PROBABILIDAD", "ACTUAL"]
+
+
+def _fecha_nac_para_edad(datos, edades):
+    """Fechas de nacimiento con el mismo día y mes que la del postulante y
+    el año que da cada edad al 1 de enero del año del examen."""
+    fecha = pd.Timestamp(datos["FECHA_NAC"])
+    sin_cumplir = (fecha.month, fecha.day) > (1, 1)
+    # El 29 de febrero no existe en todos los años
+    dia = min(fecha.day, 28) if fecha.month == 2 else fecha.day
+    return [
+        f"{int(datos['ANIO']) - int(edad) - sin_cumplir:04d}-{fecha.month:02d}-{dia:02d}"
+        for edad in edades
+    ]
+
+
+# Variables derivadas que se recorren cambiando el dato crudo del que salen
+CRUDA_POR_VARIABLE = {
+    "EDAD": ("FECHA_NAC", _fecha_nac_para_edad),
+}
+
+
+def grilla_sensibilidad(datos, valores):
+    """DataFrame con una fila por (variable, valor): los datos del postulante
+    con solo esa variable cambiada. Devuelve (grilla, variables, valores)."""
+    variables = [col for col, opciones in valores.items() if len(opciones)]
+    tamanos = [len(valores[col]) for col in variables]
+    total = sum(tamanos)
+
+    columnas = {col: np.full(total, valor, dtype=object) for col, valor in datos.items()}
+    columna_variable = np.repeat(np.asarray(variables, dtype=object), tamanos)
+    columna_valor = np.empty(total, dtype=object)
+
+    inicio = 0
+    for col, n in zip(variables, tamanos):
+        fin = inicio + n
+        columna_valor[inicio:fin] = list(valores[col])
+        # Solo cambia el tramo de la variable; el resto conserva el dato base
+        columnas.setdefault(col, np.full(total, None, dtype=object))
+        columnas[col][inicio:fin] = columna_valor[inicio:fin]
+        if col in CRUDA_POR_VARIABLE:
+            cruda, convertir = CRUDA_POR_VARIABLE[col]
+            columnas[cruda][inicio:fin] = convertir(datos, valores[col])
+        inicio = fin
+
+    grilla = pd.DataFrame(columnas).infer_objects()
+    return grilla, columna_variable, columna_valor
+
+
+def sensibilidad(modelo, columnas_modelo, datos, valores, tasa_por_colegio=None):
+    """Probabilidad de aprobar para cada variación de una sola variable.
+
+    Una fila por (variable, valor); ACTUAL marca el valor que ya tiene el
+    postulante. Con tasa_por_colegio, datos tiene los datos crudos y las
+    columnas derivadas se recalculan para cada fila de la grilla.
+    """
+    grilla, variables, opciones = grilla_sensibilidad(datos, valores)
+    if tasa_por_colegio is not None:
+        tasa = grilla["TASA_APR_COLEGIO"].to_numpy(copy=True)
+        construir_features(grilla, tasa_por_colegio)
+        # La tasa recorrida no sale del colegio: se conserva en su tramo
+        recorrida = variables == "TASA_APR_COLEGIO"
+        grilla.loc[recorrida, "TASA_APR_COLEGIO"] = tasa[recorrida]
+    proba = puntuar(modelo, matriz_modelo(grilla, columnas_modelo))
+
+    actual = np.array(
+        [_mismo_valor(datos.get(var), valor) for var, valor in zip(variables, opciones)]
+    )
+    return pd.DataFrame({
+        "VARIABLE": variables,
+        "VALOR": opciones,
+        "PROBABILIDAD": proba,
+        "ACTUAL": actual,
+    })
+
+
+def resumen_sensibilidad(tabla, proba_actual):
+    """Por variable: mejor y peor valor y cuánto puede subir la probabilidad.
+
+    Ordenado de la variable que más puede mejorar el resultado a la que menos.
+    """
+    filas = []
+    for variable, grupo in tabla.groupby("VARIABLE", sort=False):
+        mejor = grupo.loc[grupo["PROBABILIDAD"].idxmax()]
+        peor = grupo.loc[grupo["PROBABILIDAD"].idxmin()]
+        filas.append({
+            "VARIABLE": variable,
+            "MEJOR_VALOR": mejor["VALOR"],
+            "PROB_MAXIMA": mejor["PROBABILIDAD"],
+            "PEOR_VALOR": peor["VALOR"],
+            "PROB_MINIMA": peor["PROBABILIDAD"],
+            "MEJORA_MAXIMA": mejor["PROBABILIDAD"] - proba_actual,
+        })
+    return (
+        pd.DataFrame(filas)
+        .sort_values("MEJORA_MAXIMA", ascending=False)
+        .reset_index(drop=True)
+    )
+
+
+def _mismo_valor(a, b):
+    try:
+        return float(a) == float(b)
+    except (TypeError, ValueError):
+        return a == b
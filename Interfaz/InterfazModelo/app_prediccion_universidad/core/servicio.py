@@ -0,0 +1,461 @@
+"""Servicio local de puntuación (HTTP/JSON sobre asyncio, sin dependencias extra).
+
+Uso (desde la carpeta de la aplicación):
+    python -m core.servicio --puerto 8765
+    python -m core.servicio --prueba 2000       # servidor + cliente de prueba en loopback
+
+Endpoints:
+    POST /puntuar        un postulante (objeto JSON)
+    POST /puntuar_lote   varios postulantes (lista JSON o {"postulantes": [...]})
+    GET  /metricas       latencia p50/p99, rendimiento y tamaño medio de lote
+    GET  /salud
+"""
+import argparse
+import asyncio
+import json
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from core.artefactos import obtener_registro
+from core.features import COLUMNAS_ENTRADA, construir_features
+
+
+VENTANA_MS = 5
+MAX_LOTE = 512
+
+RAZONES = {200: "OK", 400: "Bad Request", 404: "Not Found", 500: "Internal Server Error"}
+
+_ESCALARES = (str, int, float, bool, type(None))
+
+
+class RegistroInvalido(ValueError):
+    """Un postulante que no se puede puntuar; se responde 400 sin llegar al lote."""
+
+
+# ===============================
+# Puntuación de registros JSON
+# ===============================
+def validar_registro(datos):
+    if not isinstance(datos, dict):
+        raise RegistroInvalido("Cada postulante debe ser un objeto JSON")
+    invalidas = [col for col, valor in datos.items() if not isinstance(valor, _ESCALARES)]
+    if invalidas:
+        raise RegistroInvalido(
+            "Se esperaban valores simples (texto o número) en: " + ", ".join(invalidas)
+        )
+    return datos
+
+
+def es_crudo(datos):
+    """Registro con el formato de los archivos del lote (ANIO, FECHA_NAC, TRABAJA...)."""
+    return all(col in datos for col in COLUMNAS_ENTRADA)
+
+
+def preparar_registros(df, registro, crudos=None):
+    """Acepta registros crudos (como los archivos del lote y el formulario de
+    TabModelo) o ya derivados (columnas del modelo); todos los de df del
+    mismo formato.
+
+    crudos=None lo decide por las columnas de df.
+    """
+    if crudos is None:
+        crudos = all(col in df.columns for col in COLUMNAS_ENTRADA)
+    if crudos:
+        construir_features(df, registro.indice_colegios)
+    elif "TASA_APR_COLEGIO" not in df.columns and "NOMBRE_COLEGIO" in df.columns:
+        df["TASA_APR_COLEGIO"] = registro.indice_colegios.resolver(df)[0]
+
+    for col in registro.num_features:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0)
+    return df
+
+
+def puntuar_registros(registros, registro):
+    """El formato se decide por registro: crudos y derivados se preparan y
+    puntúan por separado y el resultado vuelve en el orden recibido."""
+    registros = list(registros)
+    proba = np.empty(len(registros))
+    formatos = np.array([es_crudo(datos) for datos in registros], dtype=bool)
+    for crudos in (True, False):
+        posiciones = np.flatnonzero(formatos == crudos)
+        if len(posiciones) == 0:
+            continue
+        df = pd.DataFrame(
+            [registros[i] for i in posiciones], index=pd.RangeIndex(len(posiciones))
+        )
+        df = preparar_registros(df, registro, crudos)
+        proba[posiciones] = registro.motor.puntuar(df)
+
+    criterio = registro.criterio_riesgo
+    etiquetas = criterio.etiquetar(proba)
+    niveles = criterio.nivel(proba)
+    return [
+        {"probabilidad": float(p), "prediccion": e, "nivel_riesgo": n}
+        for p, e, n in zip(proba, etiquetas, niveles)
+    ]
+
+
+# ===============================
+# Agrupación de solicitudes individuales
+# ===============================
+class AgrupadorSolicitudes:
+    """Junta las solicitudes que llegan dentro de una ventana corta y las
+    puntúa con una sola llamada vectorizada al modelo."""
+
+    def __init__(self, funcion_lote, ventana_ms=VENTANA_MS, max_lote=MAX_LOTE):
+        self.funcion_lote = funcion_lote
+        self.ventana = ventana_ms / 1000.0
+        self.max_lote = max_lote
+        self._cola = asyncio.Queue()
+        self._tarea = None
+        self.lotes = 0
+        self.registros = 0
+
+    def iniciar(self):
+        self._tarea = asyncio.create_task(self._bucle())
+
+    async def detener(self):
+        if self._tarea is not None:
+            self._tarea.cancel()
+            try:
+                await self._tarea
+            except asyncio.CancelledError:
+                pass
+
+    async def enviar(self, registro):
+        futuro = asyncio.get_running_loop().create_future()
+        await self._cola.put((registro, futuro))
+        return await futuro
+
+    async def _bucle(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            lote = [await self._cola.get()]
+            limite = loop.time() + self.ventana
+
+            while len(lote) < self.max_lote:
+                restante = limite - loop.time()
+                if restante <= 0:
+                    break
+                try:
+                    lote.append(await asyncio.wait_for(self._cola.get(), restante))
+                except asyncio.TimeoutError:
+                    break
+
+            registros = [r for r, _ in lote]
+            try:
+                # El modelo corre en un hilo para no bloquear el bucle de eventos
+                resultados = await loop.run_in_executor(None, self.funcion_lote, registros)
+            except Exception as e:
+                if len(lote) == 1:
+                    resultados = [e]
+                else:
+                    # Un registro defectuoso no hace fallar a los demás del lote
+                    resultados = await loop.run_in_executor(
+                        None, self._por_separado, registros
+                    )
+
+            self.lotes += 1
+            self.registros += len(lote)
+            for (_, futuro), resultado in zip(lote, resultados):
+                if futuro.done():
+                    continue
+                if isinstance(resultado, Exception):
+                    futuro.set_exception(resultado)
+                else:
+                    futuro.set_result(resultado)
+
+    def _por_separado(self, registros):
+        resultados = []
+        for datos in registros:
+            try:
+                resultados.append(self.funcion_lote([datos])[0])
+            except Exception as e:
+                resultados.append(e)
+        return resultados
+
+
+# ===============================
+# Métricas
+# ===============================
+class Metricas:
+    def __init__(self, muestras=10000):
+        self.latencias = deque(maxlen=muestras)
+        self.solicitudes = 0
+        self.inicio = time.perf_counter()
+
+    def registrar(self, segundos):
+        self.solicitudes += 1
+        self.latencias.append(segundos)
+
+    def resumen(self, agrupador=None):
+        transcurrido = time.perf_counter() - self.inicio
+        datos = {
+            "solicitudes": self.solicitudes,
+            "rendimiento_rps": self.solicitudes / transcurrido if transcurrido > 0 else 0.0,
+        }
+        if self.latencias:
+            lat = np.asarray(self.latencias) * 1000
+            datos["latencia_ms"] = {
+                "p50": float(np.percentile(lat, 50)),
+                "p99": float(np.percentile(lat, 99)),
+                "max": float(lat.max()),
+            }
+        if agrupador is not None and agrupador.lotes:
+            datos["lotes"] = agrupador.lotes
+            datos["tamano_medio_lote"] = agrupador.registros / agrupador.lotes
+        return datos
+
+
+# ===============================
+# Servidor HTTP mínimo
+# ===============================
+class ServicioPuntuacion:
+    def __init__(self, registro=None, host="127.0.0.1", puerto=8765,
+                 ventana_ms=VENTANA_MS, max_lote=MAX_LOTE):
+        self.registro = registro or obtener_registro()
+        self.host = host
+        self.puerto = puerto
+        self.metricas = Metricas()
+        self.agrupador = AgrupadorSolicitudes(
+            lambda registros: puntuar_registros(registros, self.registro),
+            ventana_ms, max_lote
+        )
+        self._servidor = None
+
+    async def iniciar(self):
+        # Carga y calentamiento antes de aceptar conexiones
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            None, puntuar_registros, registros_de_ejemplo(self.registro, 1), self.registro
+        )
+
+        self.agrupador.iniciar()
+        self._servidor = await asyncio.start_server(self._atender, self.host, self.puerto)
+        self.puerto = self._servidor.sockets[0].getsockname()[1]
+
+    async def detener(self):
+        if self._servidor is not None:
+            self._servidor.close()
+            await self._servidor.wait_closed()
+        await self.agrupador.detener()
+
+    async def _atender(self, reader, writer):
+        try:
+            while True:
+                linea = await reader.readline()
+                if not linea:
+                    break
+                metodo, ruta, _ = linea.decode("latin-1").split(" ", 2)
+
+                cabeceras = {}
+                while True:
+                    linea = await reader.readline()
+                    if linea in (b"\r\n", b"\n", b""):
+                        break
+                    clave, valor = linea.decode("latin-1").split(":", 1)
+                    cabeceras[clave.strip().lower()] = valor.strip()
+
+                largo = int(cabeceras.get("content-length", 0))
+                cuerpo = await reader.readexactly(largo) if largo else b""
+
+                inicio = time.perf_counter()
+                estado, respuesta = await self._despachar(metodo, ruta, cuerpo)
+                if ruta.startswith("/puntuar"):
+                    self.metricas.registrar(time.perf_counter() - inicio)
+
+                cerrar = cabeceras.get("connection", "").lower() == "close"
+                datos = json.dumps(respuesta, ensure_ascii=False).encode("utf-8")
+                writer.write(
+                    (
+                        f"HTTP/1.1 {estado} {RAZONES[estado]}\r\n"
+                        f"Content-Type: application/json; charset=utf-8\r\n"
+                        f"Content-Length: {len(datos)}\r\n"
+                        f"Connection: {'close' if cerrar else 'keep-alive'}\r\n\r\n"
+                    ).encode("latin-1") + datos
+                )
+                await writer.drain()
+                if cerrar:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _despachar(self, metodo, ruta, cuerpo):
+        try:
+            if metodo == "GET" and ruta == "/salud":
+                return 200, {"estado": "ok"}
+
+            if metodo == "GET" and ruta == "/metricas":
+                return 200, self.metricas.resumen(self.agrupador)
+
+            if metodo == "POST" and ruta == "/puntuar":
+                datos = json.loads(cuerpo or b"{}")
+                if not isinstance(datos, dict):
+                    return 400, {"error": "Se esperaba un objeto JSON con un postulante"}
+                # Se valida antes de entrar al lote compartido con otras solicitudes
+                return 200, await self.agrupador.enviar(validar_registro(datos))
+
+            if metodo == "POST" and ruta == "/puntuar_lote":
+                datos = json.loads(cuerpo or b"[]")
+                if isinstance(datos, dict):
+                    datos = datos.get("postulantes", [])
+                if not isinstance(datos, list):
+                    return 400, {"error": "Se esperaba una lista de postulantes"}
+                if not datos:
+                    return 200, {"resultados": []}
+                for i, postulante in enumerate(datos):
+                    try:
+                        validar_registro(postulante)
+                    except RegistroInvalido as e:
+                        raise RegistroInvalido(f"Postulante {i}: {e}") from None
+                loop = asyncio.get_running_loop()
+                resultados = await loop.run_in_executor(
+                    None, puntuar_registros, datos, self.registro
+                )
+                return 200, {"resultados": resultados}
+
+            return 404, {"error": f"Ruta no encontrada: {metodo} {ruta}"}
+
+        except json.JSONDecodeError as e:
+            return 400, {"error": f"JSON inválido: {e}"}
+        except RegistroInvalido as e:
+            return 400, {"error": str(e)}
+        except Exception as e:
+            return 500, {"error": str(e)}
+
+
+# ===============================
+# Cliente de prueba (loopback)
+# ===============================
+def registros_de_ejemplo(registro, n, semilla=0):
+    """Postulantes ya derivados (columnas del modelo), tomados de las
+    opciones del snapshot de referencia."""
+    rng = np.random.default_rng(semilla)
+    opciones = registro.estadisticas["opciones"]
+    registros = []
+    for _ in range(n):
+        datos = {
+            col: valores[rng.integers(len(valores))]
+            for col, valores in opciones.items()
+            if col in registro.cat_features or col == "NOMBRE_COLEGIO"
+        }
+        datos["PERIODO"] = int(rng.integers(1, 3))
+        datos["OPC_INGRESO"] = int(rng.integers(1, 4))
+        datos["ANIO_BACHILLERATO"] = int(rng.integers(1995, 2011))
+        datos["ANIOS_POST_BACH"] = int(rng.integers(0, 6))
+        datos["MAYOR_EDAD"] = int(rng.integers(0, 2))
+        datos["MIGRA_UNIVERSIDAD"] = int(rng.integers(0, 2))
+        registros.append(datos)
+    return registros
+
+
+async def _solicitud(reader, writer, metodo, ruta, cuerpo=None):
+    datos = b"" if cuerpo is None else json.dumps(cuerpo).encode("utf-8")
+    writer.write(
+        (
+            f"{metodo} {ruta} HTTP/1.1\r\nHost: localhost\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(datos)}\r\n\r\n"
+        ).encode("latin-1") + datos
+    )
+    await writer.drain()
+
+    estado = int((await reader.readline()).split()[1])
+    largo = 0
+    while True:
+        linea = await reader.readline()
+        if linea in (b"\r\n", b""):
+            break
+        clave, valor = linea.decode("latin-1").split(":", 1)
+        if clave.strip().lower() == "content-length":
+            largo = int(valor)
+    return estado, json.loads(await reader.readexactly(largo))
+
+
+async def cliente_prueba(host, puerto, registros, concurrencia=64):
+    pendientes = deque(registros)
+    latencias = []
+
+    async def conexion():
+        reader, writer = await asyncio.open_connection(host, puerto)
+        try:
+            while pendientes:
+                datos = pendientes.popleft()
+                inicio = time.perf_counter()
+                estado, _ = await _solicitud(reader, writer, "POST", "/puntuar", datos)
+                latencias.append(time.perf_counter() - inicio)
+                if estado != 200:
+                    raise RuntimeError(f"Respuesta {estado}")
+        finally:
+            writer.close()
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(conexion() for _ in range(concurrencia)))
+    transcurrido = time.perf_counter() - inicio
+
+    reader, writer = await asyncio.open_connection(host, puerto)
+    _, metricas = await _solicitud(reader, writer, "GET", "/metricas")
+    writer.close()
+
+    lat = np.asarray(latencias) * 1000
+    return {
+        "solicitudes": len(latencias),
+        "rendimiento_rps": len(latencias) / transcurrido,
+        "latencia_cliente_ms": {
+            "p50": float(np.percentile(lat, 50)),
+            "p99": float(np.percentile(lat, 99)),
+        },
+        "servidor": metricas,
+    }
+
+
+async def _ejecutar(args):
+    servicio = ServicioPuntuacion(
+        host=args.host, puerto=args.puerto,
+        ventana_ms=args.ventana_ms, max_lote=args.max_lote
+    )
+    await servicio.iniciar()
+    print(f"Servicio de puntuación en http://{servicio.host}:{servicio.puerto}")
+
+    try:
+        if args.prueba:
+            registros = registros_de_ejemplo(servicio.registro, args.prueba)
+            resultado = await cliente_prueba(
+                servicio.host, servicio.puerto, registros, args.concurrencia
+            )
+            print(json.dumps(resultado, indent=2, ensure_ascii=False))
+        else:
+            await asyncio.Event().wait()
+    finally:
+        await servicio.detener()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servicio local de puntuación")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=8765)
+    parser.add_argument("--ventana-ms", type=float, default=VENTANA_MS)
+    parser.add_argument("--max-lote", type=int, default=MAX_LOTE)
+    parser.add_argument(
+        "--prueba", type=int, default=0,
+        help="Levanta el servicio en un puerto libre y envía N solicitudes de prueba"
+    )
+    parser.add_argument("--concurrencia", type=int, default=64)
+    args = parser.parse_args(argv)
+
+    if args.prueba:
+        args.puerto = 0
+
+    try:
+        asyncio.run(_ejecutar(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Tasas de aprobación de respaldo para colegios sin historial.
+
+Si el colegio no está en el histórico, se usa la tasa del nivel geográfico
+más específico con suficientes postulantes: municipio, provincia, ciudad y,
+si ninguno alcanza, la tasa global. Las tasas por nivel están suavizadas
+hacia la tasa global (m-estimate), así un municipio con 3 postulantes no
+queda con 0% o 100%.
+"""
+import numpy as np
+import pandas as pd
+
+from core.categorias import normalizar_nombres
+
+
+# Del más específico al más general
+NIVELES = [
+    ("MUNICIPIO", "municipio"),
+    ("PROVINCIA_COLEGIO", "provincia"),
+    ("CIUDAD_COLEGIO", "ciudad"),
+]
+COLEGIO = "colegio"
+GLOBAL = "global"
+NOMBRES_NIVEL = [COLEGIO] + [nombre for _, nombre in NIVELES] + [GLOBAL]
+
+# Postulantes "virtuales" con la tasa global que se agregan a cada grupo
+SUAVIZADO = 10.0
+APOYO_MINIMO = 30
+
+
+# ===============================
+# Compilación (snapshot)
+# ===============================
+def calcular_tasas_niveles(aprobado, df, suavizado=SUAVIZADO):
+    """{columna: DataFrame(tasa, n)} con la tasa suavizada de cada nivel."""
+    tasa_global = float(aprobado.mean()) if len(aprobado) else 0.0
+
+    tablas = {}
+    for col, _ in NIVELES:
+        if col not in df.columns:
+            continue
+        grupos = aprobado.groupby(df[col], observed=True).agg(["sum", "count"])
+        tabla = pd.DataFrame(
+            {
+                "tasa": (grupos["sum"] + suavizado * tasa_global)
+                / (grupos["count"] + suavizado),
+                "n": grupos["count"].astype("int32"),
+            },
+            index=pd.Index(grupos.index.astype(str), name=col),
+        )
+        tablas[col] = tabla.sort_index()
+    return tablas, tasa_global
+
+
+# ===============================
+# Búsqueda
+# ===============================
+class TasasNiveles:
+    """Resuelve, para todo un bloque a la vez, la tasa de respaldo por fila."""
+
+    def __init__(self, tablas, tasa_global, apoyo_minimo=APOYO_MINIMO):
+        self.tasa_global = float(tasa_global)
+        self.apoyo_minimo = apoyo_minimo
+
+        # Por nivel: índice de nombres normalizados y sus tasas y apoyos.
+        # Si dos nombres normalizan igual gana el de más postulantes.
+        self._niveles = []
+        for col, nombre in NIVELES:
+            if col not in tablas:
+                continue
+            tabla = tablas[col].assign(
+                clave=normalizar_nombres(tablas[col].index)
+            ).sort_values("n").drop_duplicates("clave", keep="last")
+            self._niveles.append((
+                col,
+                NOMBRES_NIVEL.index(nombre),
+                pd.Index(tabla["clave"]),
+                tabla["tasa"].to_numpy(dtype="float64"),
+                tabla["n"].to_numpy(),
+            ))
+
+    @classmethod
+    def desde_estadisticas(cls, estadisticas):
+        return cls(
+            estadisticas.get("tasas_niveles", {}),
+            estadisticas.get("tasa_global", estadisticas["tasa_media_colegios"]),
+        )
+
+    def _buscar_nivel(self, serie, claves, tasas, apoyos):
+        """Tasa y apoyo por fila de un nivel (apoyo 0 si el valor no existe)."""
+        if isinstance(serie.dtype, pd.CategoricalDtype):
+            codigos = serie.cat.codes.to_numpy()
+            unicos = serie.cat.categories
+        else:
+            codigos, unicos = pd.factorize(serie)
+
+        ids = np.append(claves.get_indexer(normalizar_nombres(unicos)), -1)[codigos]
+        return np.append(tasas, 0.0)[ids], np.append(apoyos, 0)[ids]
+
+    def resolver(self, df, pendientes=None):
+        """(tasa, nivel) por fila; nivel es el índice en NOMBRES_NIVEL.
+
+        pendientes: máscara de las filas a resolver (las demás quedan con
+        nivel 0, "colegio", y tasa NaN para que las complete quien llama).
+        """
+        n = len(df)
+        pendientes = (
+            np.ones(n, dtype=bool) if pendientes is None else np.asarray(pendientes).copy()
+        )
+        tasa = np.full(n, np.nan)
+        nivel = np.zeros(n, dtype="int8")
+
+        for col, codigo, claves, tasas, apoyos in self._niveles:
+            if not pendientes.any():
+                break
+            if col not in df.columns:
+                continue
+            tasa_nivel, apoyo = self._buscar_nivel(df[col], claves, tasas, apoyos)
+            usar = pendientes & (apoyo >= self.apoyo_minimo)
+            tasa[usar] = tasa_nivel[usar]
+            nivel[usar] = codigo
+            pendientes &= ~usar
+
+        tasa[pendientes] = self.tasa_global
+        nivel[pendientes] = NOMBRES_NIVEL.index(GLOBAL)
+        return tasa, nivel
@@ -1,3 +1,8 @@
+import time
+
+# Antes de cualquier otra importación: el arranque se mide desde aquí
+INICIO = time.perf_counter()
+
 import sys
 import os
 import ctypes
@@ -11,9 +16,10 @@ def main():
     # ===============================
     # Identidad de la aplicación (Windows)
     # ===============================
-    ctypes.windll.shell32.SetCurrentProcessExplicitAppUserModelID(
-        "umss.prediccion.universitaria.v1"
-    )
+    if sys.platform == "win32":
+        ctypes.windll.shell32.SetCurrentProcessExplicitAppUserModelID(
+            "umss.prediccion.universitaria.v1"
+        )
 
     app = QApplication(sys.argv)
 
@@ -33,7 +39,7 @@ def main():
     # ===============================
     # Ventana principal
     # ===============================
-    ventana = MainWindow()
+    ventana = MainWindow(inicio=INICIO)
     ventana.show()
 
     sys.exit(app.exec())
@@ -0,0 +1,124 @@
+"""Prueba de arranque en frío.
+
+Uso (desde la carpeta de la aplicación):
+    python test_arranque.py
+
+1. Importa ui.main_window en un proceso nuevo con `python -X importtime` y
+   guarda el perfil completo en logs/importtime_main_window.txt.
+   Falla si antes de mostrar la ventana se importa alguna librería pesada
+   (pandas, numpy, joblib, xgboost, sklearn, scipy, matplotlib) o si la
+   importación supera PRESUPUESTO_IMPORTACION_S.
+2. Abre la ventana (sin pantalla, plataforma offscreen) en otro proceso
+   nuevo y falla si el primer pintado supera PRESUPUESTO_PINTADO_S.
+
+Los presupuestos se pueden ajustar con las variables de entorno
+PREDICCION_PRESUPUESTO_IMPORTACION y PREDICCION_PRESUPUESTO_PINTADO.
+"""
+import os
+import subprocess
+import sys
+
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+RUTA_PERFIL = os.path.join(BASE_DIR, "logs", "importtime_main_window.txt")
+
+PRESUPUESTO_IMPORTACION_S = float(os.environ.get("PREDICCION_PRESUPUESTO_IMPORTACION", "0.5"))
+PRESUPUESTO_PINTADO_S = float(os.environ.get("PREDICCION_PRESUPUESTO_PINTADO", "2.0"))
+
+PESADAS = ("pandas", "numpy", "joblib", "xgboost", "sklearn", "scipy", "matplotlib")
+
+MODULOS_MOSTRADOS = 15
+
+# Proceso hijo: crea la ventana y sale después del primer pintado
+VENTANA = """
+import time
+INICIO = time.perf_counter()
+import sys
+from PyQt6.QtCore import QTimer
+from PyQt6.QtWidgets import QApplication
+from ui.main_window import MainWindow
+
+app = QApplication(sys.argv)
+ventana = MainWindow(inicio=INICIO)
+ventana.show()
+
+def revisar():
+    pintado = ventana.arranque.tiempos["primer_pintado"]
+    if pintado:
+        print(f"PINTADO {pintado:.4f}")
+        ventana.close()
+        app.quit()
+    else:
+        QTimer.singleShot(10, revisar)
+
+QTimer.singleShot(0, revisar)
+app.exec()
+"""
+
+
+def ejecutar(argumentos, entorno=None):
+    return subprocess.run(
+        [sys.executable] + argumentos, cwd=BASE_DIR, capture_output=True, text=True,
+        env=dict(os.environ, **(entorno or {})),
+    )
+
+
+# ===============================
+# Perfil de importación
+# ===============================
+def perfil_importacion():
+    """(líneas de -X importtime, segundos totales, módulos importados)."""
+    proceso = ejecutar(["-X", "importtime", "-c", "import ui.main_window"])
+    if proceso.returncode != 0:
+        raise RuntimeError(proceso.stderr)
+
+    lineas = [l for l in proceso.stderr.splitlines() if l.startswith("import time:")]
+    modulos = {}
+    for linea in lineas[1:]:  # la primera es el encabezado
+        # "import time: propio | acumulado | módulo" (microsegundos)
+        _, acumulado, nombre = linea[len("import time:"):].split("|")
+        modulos[nombre.strip()] = int(acumulado) / 1e6
+    total = modulos.get("ui.main_window", 0.0)
+
+    os.makedirs(os.path.dirname(RUTA_PERFIL), exist_ok=True)
+    with open(RUTA_PERFIL, "w", encoding="utf-8") as f:
+        f.write("\n".join(lineas) + "\n")
+    return lineas, total, modulos
+
+
+def primer_pintado():
+    proceso = ejecutar(["-c", VENTANA], {"QT_QPA_PLATFORM": "offscreen"})
+    for linea in proceso.stdout.splitlines():
+        if linea.startswith("PINTADO "):
+            return float(linea.split()[1])
+    raise RuntimeError(proceso.stderr or "La ventana no llegó a pintarse")
+
+
+def main():
+    errores = []
+
+    _, total, modulos = perfil_importacion()
+    print(f"Importar ui.main_window: {total:.3f} s (presupuesto {PRESUPUESTO_IMPORTACION_S} s)")
+    for nombre, segundos in sorted(modulos.items(), key=lambda m: -m[1])[:MODULOS_MOSTRADOS]:
+        print(f"  {segundos:8.3f} s  {nombre}")
+    print(f"Perfil completo en {RUTA_PERFIL}")
+
+    pesadas = sorted({n.split(".")[0] for n in modulos} & set(PESADAS))
+    if pesadas:
+        errores.append(f"Librerías pesadas importadas antes de la ventana: {', '.join(pesadas)}")
+    if total > PRESUPUESTO_IMPORTACION_S:
+        errores.append(f"Importación de {total:.3f} s > {PRESUPUESTO_IMPORTACION_S} s")
+
+    pintado = primer_pintado()
+    print(f"Primer pintado: {pintado:.3f} s (presupuesto {PRESUPUESTO_PINTADO_S} s)")
+    if pintado > PRESUPUESTO_PINTADO_S:
+        errores.append(f"Primer pintado en {pintado:.3f} s > {PRESUPUESTO_PINTADO_S} s")
+
+    for error in errores:
+        print("ERROR:", error)
+    print("OK" if not errores else "FALLÓ")
+    return 1 if errores else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
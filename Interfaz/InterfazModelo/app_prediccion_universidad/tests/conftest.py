@@ -0,0 +1,39 @@
+"""Pruebas de equivalencia: las optimizaciones deben dar los mismos
+resultados que el camino de referencia.
+
+Uso (desde la carpeta de la aplicación):
+    python -m pytest -q tests
+
+Los test_*.py de la carpeta de la aplicación son scripts que se corren
+aparte (python test_arranque.py); no forman parte de esta suite.
+"""
+import os
+import sys
+import tempfile
+
+import pytest
+
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+# Las mediciones de las pruebas no van al log de la aplicación
+os.environ.setdefault(
+    "PREDICCION_LOG_METRICAS",
+    os.path.join(tempfile.gettempdir(), "prediccion_pruebas", "instrumentacion.jsonl")
+)
+
+
+@pytest.fixture(scope="session")
+def registro():
+    from core.artefactos import obtener_registro
+
+    return obtener_registro()
+
+
+@pytest.fixture(scope="session")
+def postulantes(registro):
+    """Postulantes sintéticos con el esquema de los archivos de entrada."""
+    from bench.generador import generar_postulantes
+
+    return generar_postulantes(3000, registro, semilla=7)
@@ -0,0 +1,35 @@
+import threading
+
+from core.cache_prediccion import CachePrediccion
+
+
+def test_cache_desde_varios_hilos():
+    cache = CachePrediccion(capacidad=64)
+    errores = []
+
+    def usar(hilo):
+        try:
+            for i in range(3000):
+                clave = f"{hilo}-{i % 100}"
+                if cache.obtener(clave, "firma") is None:
+                    cache.guardar(clave, i, "firma")
+        except Exception as e:
+            errores.append(e)
+
+    hilos = [threading.Thread(target=usar, args=(h,)) for h in range(8)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+
+    assert not errores
+    assert len(cache) == 64
+    assert cache.consultas == 8 * 3000
+
+
+def test_cache_se_vacia_al_cambiar_la_firma():
+    cache = CachePrediccion()
+    cache.guardar("a", 0.5, "v1")
+    assert cache.obtener("a", "v1") == 0.5
+    assert cache.obtener("a", "v2") is None
+    assert len(cache) == 0
@@ -0,0 +1,39 @@
+import numpy as np
+
+from core.contribuciones import MatrizContribuciones
+from core.features import construir_features
+from core.puntuacion import puntuar_bloque
+
+
+def test_contribuciones_suman_el_margen(registro, postulantes):
+    motor = registro.motor
+    df = construir_features(postulantes.copy(), registro.indice_colegios)
+
+    proba, matriz = motor.puntuar_explicado(df)
+    assert matriz.dtype == np.float32
+    assert matriz.shape == (len(df), len(motor.variables) + 1)
+
+    # Variables + base = log-odds de la probabilidad (Saabas también suma exacto)
+    margen = np.log(proba / (1 - proba))
+    np.testing.assert_allclose(matriz.sum(axis=1), margen, rtol=0, atol=1e-4)
+
+
+def test_matriz_por_bloques_alineada_con_las_filas(registro, postulantes):
+    motor = registro.motor
+    acumulada = MatrizContribuciones(motor.variables)
+    matrices = []
+    for inicio in range(0, len(postulantes), 700):
+        bloque = postulantes.iloc[inicio:inicio + 700].copy()
+        _, matriz = puntuar_bloque(
+            motor, registro.indice_colegios, bloque, registro.vocabularios,
+            contribuciones=True
+        )
+        acumulada.agregar(matriz)
+        matrices.append(matriz)
+
+    assert len(acumulada) == len(postulantes)
+    todas = np.concatenate(matrices)
+    for i in [0, 699, 700, len(postulantes) - 1]:
+        fila = acumulada.fila(i)
+        assert list(fila) == motor.variables
+        np.testing.assert_array_equal(list(fila.values()), todas[i, :-1])
@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+
+from bench.bench_features import datos_prueba, features_fila_por_fila
+from core.features import calcular_edad, construir_features, features_registro
+
+
+def test_edad_igual_a_la_regla_original():
+    df = datos_prueba(5000, semilla=3)
+    referencia = features_fila_por_fila(df.copy(), pd.Series(dtype="float64"))
+    nuevo = construir_features(df.copy(), pd.Series(dtype="float64"))
+
+    np.testing.assert_array_equal(nuevo["EDAD"], referencia["EDAD"])
+    np.testing.assert_array_equal(nuevo["MAYOR_EDAD"], referencia["MAYOR_EDAD"])
+
+
+def test_edad_en_los_bordes_del_anio():
+    fechas = ["2000-01-01", "2000-01-02", "2000-12-31", "2000-02-29", "1999-02-01", None]
+    anio = pd.Series([2018] * len(fechas))
+    edad = calcular_edad(anio, pd.Series(fechas, dtype=object))
+
+    # Al 1 de enero solo cumplió años quien nació un 1 de enero
+    np.testing.assert_array_equal(edad, [18, 17, 17, 17, 18, 0])
+
+
+def test_formulario_y_lote_derivan_igual(registro, postulantes):
+    lote = construir_features(postulantes.head(200).copy(), registro.indice_colegios)
+
+    for i, datos in enumerate(postulantes.head(200).to_dict("records")):
+        fila = features_registro(datos, registro.indice_colegios)
+        for col in ["EDAD", "MAYOR_EDAD", "ANIOS_POST_BACH", "TRABAJO_COLEGIO",
+                    "MIGRA_UNIVERSIDAD", "TASA_APR_COLEGIO"]:
+            assert fila[col] == lote[col].iloc[i], (i, col)
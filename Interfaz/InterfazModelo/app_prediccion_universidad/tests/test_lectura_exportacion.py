@@ -0,0 +1,33 @@
+import pandas as pd
+import pytest
+
+from bench.generador import guardar
+from core.evaluar_lote import evaluar_archivo
+from core.instrumentacion import Instrumentacion
+
+
+def _leer_salida(ruta):
+    if ruta.endswith(".parquet"):
+        return pd.read_parquet(ruta)
+    if ruta.endswith(".xlsx"):
+        return pd.read_excel(ruta, dtype={"CI": str})
+    return pd.read_csv(ruta, dtype={"CI": str})
+
+
+@pytest.mark.parametrize("entrada", ["csv", "xlsx", "parquet"])
+@pytest.mark.parametrize("salida", ["csv", "xlsx", "parquet"])
+def test_ci_conserva_ceros_a_la_izquierda(registro, postulantes, tmp_path, entrada, salida):
+    df = postulantes.head(1200).copy()
+    df.insert(0, "CI", [f"{i:08d}" for i in range(len(df))])
+    ruta = str(tmp_path / f"postulantes.{entrada}")
+    guardar(df, ruta)
+
+    ruta_salida = str(tmp_path / f"resultados.{salida}")
+    filas = evaluar_archivo(
+        ruta, ruta_salida, registro, Instrumentacion("prueba", detallado=False),
+        tamano_bloque=500
+    )
+
+    resultado = _leer_salida(ruta_salida)
+    assert filas == len(df)
+    assert resultado["CI"].tolist() == df["CI"].tolist()
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+
+from core.features import construir_features, matriz_modelo
+from core.motor_inferencia import FILAS_POR_PASADA, MotorInferencia
+
+
+def test_motor_igual_a_predict_proba(registro, postulantes):
+    assert isinstance(registro.motor, MotorInferencia)
+    df = construir_features(postulantes.copy(), registro.indice_colegios)
+
+    esperado = registro.modelo.predict_proba(matriz_modelo(df, registro.columnas_modelo))[:, 1]
+    np.testing.assert_allclose(registro.motor.puntuar(df), esperado, rtol=0, atol=1e-6)
+
+
+def test_motor_varias_pasadas(registro, postulantes):
+    # Más filas que FILAS_POR_PASADA: el buffer se reutiliza entre pasadas
+    repeticiones = FILAS_POR_PASADA // len(postulantes) + 2
+    df = construir_features(
+        pd.concat([postulantes] * repeticiones, ignore_index=True), registro.indice_colegios
+    )
+    proba = registro.motor.puntuar(df).reshape(repeticiones, -1)
+    np.testing.assert_array_equal(proba, np.tile(proba[0], (repeticiones, 1)))
+
+
+def test_matriz_registro_igual_a_matriz(registro, postulantes):
+    motor = registro.motor
+    df = construir_features(postulantes.head(300).copy(), registro.indice_colegios)
+    # Valores desconocidos: categoría fuera del one-hot y columna faltante
+    df.loc[df.index[::10], "SEXO"] = "OTRO"
+    df = df.astype({"SEXO": object})
+
+    # Las dos matrices son vistas del mismo buffer: se copia la primera
+    for datos in df.to_dict("records")[::3]:
+        esperado = motor.matriz(pd.DataFrame([datos])).copy()
+        np.testing.assert_array_equal(motor.matriz_registro(datos), esperado)
+    datos.pop("PERIODO")
+    esperado = motor.matriz(pd.DataFrame([datos])).copy()
+    np.testing.assert_array_equal(motor.matriz_registro(datos), esperado)
+
+
+def test_fila_del_formulario_igual_a_predict_proba(registro, postulantes):
+    df = construir_features(postulantes.head(100).copy(), registro.indice_colegios)
+    esperado = registro.modelo.predict_proba(matriz_modelo(df, registro.columnas_modelo))[:, 1]
+
+    proba = [
+        registro.motor.predecir(registro.motor.matriz_registro(datos))[0]
+        for datos in df.to_dict("records")
+    ]
+    np.testing.assert_allclose(proba, esperado, rtol=0, atol=1e-6)
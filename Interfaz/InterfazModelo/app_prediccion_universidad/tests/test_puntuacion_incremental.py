@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+
+from core.features import COLUMNAS_ENTRADA_NUMERICAS
+from core.puntuacion import puntuar_bloque
+from core.puntuacion_incremental import PuntuacionIncremental, ResultadosPrevios
+
+
+def _evaluar(df, registro, previos=None, tamano=400):
+    """Mismo recorrido que WorkerEvaluacion: bloques -> incremental -> modelo."""
+    incremental = PuntuacionIncremental(
+        previos, registro.firma_puntuacion, registro.vocabularios,
+        numericas=list(registro.num_features) + COLUMNAS_ENTRADA_NUMERICAS,
+        contribuciones=True,
+    )
+    bloques = (
+        df.iloc[inicio:inicio + tamano].copy().reset_index(drop=True)
+        for inicio in range(0, len(df), tamano)
+    )
+    puntuados = (
+        puntuar_bloque(
+            registro.motor, registro.indice_colegios, bloque, registro.vocabularios,
+            contribuciones=True
+        )
+        for bloque in incremental.nuevos(bloques)
+    )
+    partes = list(incremental.combinar(puntuados))
+    resultado = registro.vocabularios.concatenar([df for df, _ in partes])
+    matriz = np.concatenate([matriz for _, matriz in partes])
+    return resultado.reset_index(drop=True), matriz, incremental.reutilizadas
+
+
+def _editar(postulantes):
+    """Archivo editado: filas modificadas, borradas, agregadas y reordenadas."""
+    df = postulantes.copy()
+    df.loc[df.index[::7], "ANIO_BACHILLERATO"] = df["ANIO_BACHILLERATO"].iloc[::7] - 1
+    df.loc[df.index[3::11], "FECHA_NAC"] = pd.Timestamp("1990-03-04")
+    df.loc[df.index[5::13], "NOMBRE_COLEGIO"] = "COLEGIO QUE NO EXISTE"
+    df = df.drop(df.index[10:60])
+    nuevos = postulantes.sample(150, random_state=1).assign(ANIO=2031)
+    df = pd.concat([df.iloc[:900], nuevos, df.iloc[900:]])
+    return df.iloc[::-1].reset_index(drop=True)
+
+
+def test_incremental_igual_a_evaluacion_completa(registro, postulantes):
+    anterior, matriz_anterior, _ = _evaluar(postulantes, registro)
+    previos = ResultadosPrevios(anterior, registro.firma_puntuacion, matriz_anterior)
+
+    editado = _editar(postulantes)
+    completo, matriz_completa, _ = _evaluar(editado.copy(), registro)
+    incremental, matriz_incremental, reutilizadas = _evaluar(
+        editado.copy(), registro, previos
+    )
+
+    assert 0 < reutilizadas < len(editado)
+    assert len(incremental) == len(completo) == len(editado)
+    for col in ["EDAD", "ANIOS_POST_BACH", "TASA_APR_COLEGIO", "PROBABILIDAD"]:
+        np.testing.assert_array_equal(incremental[col], completo[col], err_msg=col)
+    assert incremental["NOMBRE_COLEGIO"].astype(str).tolist() == \
+        completo["NOMBRE_COLEGIO"].astype(str).tolist()
+    np.testing.assert_array_equal(matriz_incremental, matriz_completa)
@@ -0,0 +1,32 @@
+import numpy as np
+
+from core.puntuacion import puntuar_bloque
+from core.puntuacion_paralela import PuntuadorParalelo
+
+
+def _bloques(postulantes, tamano=700):
+    return [
+        postulantes.iloc[inicio:inicio + tamano].copy().reset_index(drop=True)
+        for inicio in range(0, len(postulantes), tamano)
+    ]
+
+
+def test_paralelo_igual_a_secuencial(registro, postulantes):
+    secuencial = [
+        puntuar_bloque(
+            registro.motor, registro.indice_colegios, bloque, registro.vocabularios,
+            contribuciones=True
+        )
+        for bloque in _bloques(postulantes)
+    ]
+    with PuntuadorParalelo(2, registro, contribuciones=True) as puntuador:
+        paralelo = list(puntuador.puntuar_bloques(_bloques(postulantes)))
+
+    assert len(paralelo) == len(secuencial)
+    for (df_s, matriz_s), (df_p, matriz_p) in zip(secuencial, paralelo):
+        # Mismo orden de filas y mismos valores, bloque por bloque
+        assert df_p["NOMBRE_COLEGIO"].astype(str).tolist() == \
+            df_s["NOMBRE_COLEGIO"].astype(str).tolist()
+        np.testing.assert_array_equal(df_p["EDAD"], df_s["EDAD"])
+        np.testing.assert_array_equal(df_p["PROBABILIDAD"], df_s["PROBABILIDAD"])
+        np.testing.assert_array_equal(matriz_p, matriz_s)
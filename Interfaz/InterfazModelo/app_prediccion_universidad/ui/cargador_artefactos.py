@@ -0,0 +1,44 @@
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from core.instrumentacion import Instrumentacion
+
+
+ETAPAS = ("importacion", "estadisticas", "modelo", "motor", "calentamiento")
+
+
+class CargadorArtefactos(QThread):
+    """Carga modelo y datos de referencia fuera del hilo de la GUI.
+
+    Termina con una predicción de calentamiento; `listo` se emite cuando la
+    aplicación ya puede predecir sin esperas.
+    """
+
+    listo = pyqtSignal()
+    error = pyqtSignal(str)
+
+    def __init__(self, registro=None):
+        super().__init__()
+        self.registro = registro
+
+    def run(self):
+        instrumentacion = Instrumentacion("carga_inicial", ETAPAS)
+        mensaje = None
+        completo = False
+        try:
+            # pandas, numpy y el resto del núcleo se importan en este hilo,
+            # no antes de mostrar la ventana
+            with instrumentacion.etapa("importacion"):
+                from core.artefactos import obtener_registro
+            registro = self.registro or obtener_registro()
+            # Al cerrar la ventana (requestInterruption) se corta entre etapas
+            completo = registro.precargar(instrumentacion, self.isInterruptionRequested)
+        except Exception as e:
+            mensaje = str(e)
+        instrumentacion.registrar(
+            estado="error" if mensaje else "completo" if completo else "interrumpido"
+        )
+
+        if mensaje:
+            self.error.emit(mensaje)
+        elif completo:
+            self.listo.emit()
@@ -0,0 +1,128 @@
+import numpy as np
+
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg
+from matplotlib.figure import Figure
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QComboBox
+
+from core.sensibilidad import resumen_sensibilidad
+
+
+# Variables con muchos valores (municipio, provincia): se grafican los
+# mejores y los peores, además del valor actual
+MAX_BARRAS = 20
+
+COLOR_ACTUAL = "#B02A37"
+COLOR_BARRAS = "#0B4F95"
+
+
+class DialogoSensibilidad(QDialog):
+    """Probabilidad de aprobar al cambiar una sola variable del postulante."""
+
+    def __init__(self, tabla, proba_actual, umbral, etiquetas=None, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("¿Qué cambiaría el resultado?")
+        self.resize(900, 640)
+
+        self.tabla = tabla
+        self.proba_actual = proba_actual
+        self.umbral = umbral
+        self.etiquetas = etiquetas or {}
+        self.resumen = resumen_sensibilidad(tabla, proba_actual)
+
+        layout = QVBoxLayout(self)
+
+        encabezado = QLabel(
+            f"Probabilidad actual de aprobación: {proba_actual:.2%} "
+            f"(umbral de riesgo {umbral:.0%}). Cada gráfico cambia una sola "
+            "variable y deja las demás como están."
+        )
+        encabezado.setWordWrap(True)
+        layout.addWidget(encabezado)
+
+        selector = QHBoxLayout()
+        selector.addWidget(QLabel("Variable:"))
+        self.combo_variable = QComboBox()
+        for _, fila in self.resumen.iterrows():
+            nombre = self.etiquetas.get(fila["VARIABLE"], fila["VARIABLE"])
+            self.combo_variable.addItem(
+                f"{nombre} (hasta {fila['MEJORA_MAXIMA'] * 100:+.1f} puntos)",
+                fila["VARIABLE"]
+            )
+        self.combo_variable.currentIndexChanged.connect(self.graficar)
+        selector.addWidget(self.combo_variable, 1)
+        layout.addLayout(selector)
+
+        self.figura = Figure(figsize=(8, 5), tight_layout=True)
+        self.canvas = FigureCanvasQTAgg(self.figura)
+        layout.addWidget(self.canvas, 1)
+
+        self.label_resumen = QLabel(self._texto_resumen())
+        self.label_resumen.setWordWrap(True)
+        layout.addWidget(self.label_resumen)
+
+        self.graficar()
+
+    def _texto_resumen(self):
+        mejoras = self.resumen[self.resumen["MEJORA_MAXIMA"] > 0.005].head(3)
+        if mejoras.empty:
+            return "Ningún cambio de una sola variable mejora la probabilidad."
+        partes = [
+            f"{self.etiquetas.get(f['VARIABLE'], f['VARIABLE'])} = {f['MEJOR_VALOR']} "
+            f"({f['PROB_MAXIMA']:.1%})"
+            for _, f in mejoras.iterrows()
+        ]
+        return "Cambios que más suben la probabilidad: " + "; ".join(partes)
+
+    # ===============================
+    # Gráfico
+    # ===============================
+    def graficar(self):
+        variable = self.combo_variable.currentData()
+        if variable is None:
+            return
+        grupo = self.tabla[self.tabla["VARIABLE"] == variable]
+
+        self.figura.clear()
+        ax = self.figura.add_subplot(111)
+        nombre = self.etiquetas.get(variable, variable)
+
+        if _es_numerica(grupo["VALOR"]):
+            x = grupo["VALOR"].astype(float).to_numpy()
+            orden = np.argsort(x)
+            ax.plot(x[orden], grupo["PROBABILIDAD"].to_numpy()[orden],
+                    marker="o", color=COLOR_BARRAS)
+            actual = grupo[grupo["ACTUAL"]]
+            ax.scatter(actual["VALOR"].astype(float), actual["PROBABILIDAD"],
+                       s=90, color=COLOR_ACTUAL, zorder=3, label="Valor actual")
+            ax.axhline(self.umbral, linestyle="--", color="#6C757D", label="Umbral")
+            ax.set_xlabel(nombre)
+            ax.set_ylabel("Probabilidad de aprobar")
+        else:
+            grupo = _recortar(grupo.sort_values("PROBABILIDAD"))
+            colores = np.where(grupo["ACTUAL"], COLOR_ACTUAL, COLOR_BARRAS)
+            posiciones = np.arange(len(grupo))
+            ax.barh(posiciones, grupo["PROBABILIDAD"], color=colores)
+            ax.set_yticks(posiciones, grupo["VALOR"].astype(str), fontsize=8)
+            ax.axvline(self.umbral, linestyle="--", color="#6C757D", label="Umbral")
+            ax.set_xlabel("Probabilidad de aprobar")
+            ax.set_title(nombre)
+
+        ax.legend(loc="best", fontsize=8)
+        self.canvas.draw_idle()
+
+
+def _es_numerica(valores):
+    try:
+        valores.astype(float)
+        return True
+    except (TypeError, ValueError):
+        return False
+
+
+def _recortar(grupo):
+    if len(grupo) <= MAX_BARRAS:
+        return grupo
+    mitad = MAX_BARRAS // 2
+    extremos = grupo.iloc[np.r_[0:mitad, len(grupo) - mitad:len(grupo)]]
+    indices = extremos.index.union(grupo.index[grupo["ACTUAL"].to_numpy()])
+    return grupo.loc[indices].sort_values("PROBABILIDAD")
@@ -1,19 +1,70 @@
 import os
+import time
 
 from PyQt6.QtWidgets import (
-    QMainWindow, QWidget, QVBoxLayout, QTabWidget
+    QMainWindow, QWidget, QVBoxLayout, QTabWidget, QLabel, QMessageBox
 )
 from PyQt6.QtGui import QIcon
+from PyQt6.QtCore import QObject, Qt, QTimer, pyqtSignal
 
-from ui.tab_modelo import TabModelo
-from ui.tab_perfil_est import TabPerfilEst
-from ui.tab_evaluar_ests import TabEvaluarEsts
+from core import instrumentacion
+from ui.cargador_artefactos import CargadorArtefactos
+
+
+# Espera máxima al hilo de carga al cerrar la ventana
+ESPERA_CIERRE_MS = 2000
+
+
+class EmisorMetricas(QObject):
+    # Las mediciones pueden llegar desde el worker: la señal las pasa al hilo de la GUI
+    medicion = pyqtSignal(dict)
+
+
+class PestanaDiferida(QWidget):
+    """Lugar de una pestaña que se construye la primera vez que se muestra."""
+
+    def __init__(self, nombre, fabrica):
+        super().__init__()
+        self.nombre = nombre
+        self.fabrica = fabrica
+        self.widget = None
+
+        self._layout = QVBoxLayout(self)
+        self._layout.setContentsMargins(0, 0, 0, 0)
+        self.aviso = QLabel("⏳ Cargando modelo y datos de referencia...")
+        self.aviso.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.aviso.setStyleSheet("font-size:16px; color:#6C757D;")
+        self._layout.addWidget(self.aviso)
+
+    def construir(self):
+        if self.widget is None:
+            self.widget = instrumentacion.medir_una_vez("pestanas", self.nombre, self.fabrica)
+            self.aviso.setVisible(False)
+            self._layout.addWidget(self.widget)
+        return self.widget
 
 
 class MainWindow(QMainWindow):
-    def __init__(self):
+    def __init__(self, inicio=None):
         super().__init__()
 
+        # Instante de arranque (main.py lo toma antes de importar PyQt6)
+        self.inicio = time.perf_counter() if inicio is None else inicio
+        self.arranque = instrumentacion.Instrumentacion(
+            "arranque", ("primer_pintado", "primera_prediccion")
+        )
+        self._pintado = False
+        self.artefactos_listos = False
+
+        # ===============================
+        # Diagnóstico: tiempos por etapa en la barra de estado
+        # ===============================
+        self.emisor_metricas = EmisorMetricas(self)
+        self.emisor_metricas.medicion.connect(self.mostrar_metricas)
+        self._oyente_metricas = self.emisor_metricas.medicion.emit
+        instrumentacion.suscribir(self._oyente_metricas)
+        self.statusBar()
+
         # ===============================
         # Título y tamaño
         # ===============================
@@ -28,22 +79,21 @@ class MainWindow(QMainWindow):
         self.setWindowIcon(QIcon(ICON_PATH))
 
         # ===============================
-        # Tabs
+        # Tabs: cada una se construye la primera vez que se selecciona,
+        # después de que terminan de cargarse los artefactos. Los módulos
+        # de las pestañas (pandas, numpy) tampoco se importan antes.
         # ===============================
         self.tabs = QTabWidget()
 
-        self.tab_modelo = TabModelo()
-        self.tab_perfil = TabPerfilEst()
-        self.tab_evaluar = TabEvaluarEsts()
-        # 🔗 Enlace entre pestañas
-
-        self.tabs.addTab(self.tab_modelo, "Modelo Predictivo")
-        self.tabs.addTab(self.tab_perfil, "Perfil Estadístico")
-        self.tabs.addTab(self.tab_evaluar, "Evaluación Masiva")
-
-        # Comunicación entre pestañas
-        self.tab_modelo.tab_perfil = self.tab_perfil
-        self.tab_modelo.tabs_widget = self.tabs
+        self.pestanas = {
+            "modelo": PestanaDiferida("TabModelo", self._crear_tab_modelo),
+            "perfil": PestanaDiferida("TabPerfilEst", self._crear_tab_perfil),
+            "evaluar": PestanaDiferida("TabEvaluarEsts", self._crear_tab_evaluar),
+        }
+        self.tabs.addTab(self.pestanas["modelo"], "Modelo Predictivo")
+        self.tabs.addTab(self.pestanas["perfil"], "Perfil Estadístico")
+        self.tabs.addTab(self.pestanas["evaluar"], "Evaluación Masiva")
+        self.tabs.currentChanged.connect(self.construir_pestana_actual)
 
         # ===============================
         # Layout central
@@ -53,6 +103,17 @@ class MainWindow(QMainWindow):
         layout.addWidget(self.tabs)
         self.setCentralWidget(container)
 
+        self.statusBar().setStyleSheet("color: #6C757D; font-size: 12px;")
+        self.statusBar().showMessage("Cargando modelo y datos de referencia...")
+
+        # ===============================
+        # Carga de artefactos en segundo plano
+        # ===============================
+        self.cargador = CargadorArtefactos()
+        self.cargador.listo.connect(self.artefactos_cargados)
+        self.cargador.error.connect(self.error_artefactos)
+        self.cargador.start()
+
         # ===============================
         # Estilos globales
         # ===============================
@@ -103,3 +164,101 @@ class MainWindow(QMainWindow):
                 color: white;
             }
         """)
+
+    # ===============================
+    # Pestañas diferidas
+    # ===============================
+    @property
+    def tab_modelo(self):
+        return self.pestanas["modelo"].construir()
+
+    @property
+    def tab_perfil(self):
+        return self.pestanas["perfil"].construir()
+
+    @property
+    def tab_evaluar(self):
+        return self.pestanas["evaluar"].construir()
+
+    def _crear_tab_modelo(self):
+        from ui.tab_modelo import TabModelo
+
+        tab = TabModelo()
+        # Comunicación entre pestañas
+        tab.prediccion_lista.connect(self.mostrar_perfil)
+        return tab
+
+    def _crear_tab_perfil(self):
+        from ui.tab_perfil_est import TabPerfilEst
+
+        return TabPerfilEst()
+
+    def _crear_tab_evaluar(self):
+        from ui.tab_evaluar_ests import TabEvaluarEsts
+
+        return TabEvaluarEsts()
+
+    def mostrar_perfil(self, datos, proba, contribuciones):
+        self.tab_perfil.actualizar_perfil(datos, proba, contribuciones)
+        self.tabs.setCurrentWidget(self.pestanas["perfil"])
+
+    def construir_pestana_actual(self):
+        if self.artefactos_listos:
+            self.tabs.currentWidget().construir()
+
+    # ===============================
+    # Arranque
+    # ===============================
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not self._pintado:
+            self._pintado = True
+            # Corre al volver al bucle de eventos, después del primer pintado
+            QTimer.singleShot(0, self._primer_pintado)
+
+    def _primer_pintado(self):
+        self.arranque.tiempos["primer_pintado"] = time.perf_counter() - self.inicio
+        self._registrar_arranque()
+
+    def artefactos_cargados(self):
+        # La carga termina con una predicción de calentamiento
+        self.arranque.tiempos["primera_prediccion"] = time.perf_counter() - self.inicio
+        self.artefactos_listos = True
+        self.construir_pestana_actual()
+        self._registrar_arranque()
+
+    def error_artefactos(self, mensaje):
+        for pestana in self.pestanas.values():
+            pestana.aviso.setText(f"No se pudieron cargar el modelo o los datos:\n{mensaje}")
+        QMessageBox.critical(self, "Error al cargar", mensaje)
+
+    def _registrar_arranque(self):
+        # Una sola línea de log, cuando se conocen ambos tiempos
+        tiempos = self.arranque.tiempos
+        if not (tiempos["primer_pintado"] and tiempos["primera_prediccion"]):
+            return
+        self.arranque.registrar(
+            primer_pintado_s=round(tiempos["primer_pintado"], 4),
+            primera_prediccion_s=round(tiempos["primera_prediccion"], 4),
+        )
+
+    # ===============================
+    # Diagnóstico
+    # ===============================
+    def mostrar_metricas(self, registro):
+        self.statusBar().showMessage(instrumentacion.texto_resumen(registro))
+        self.statusBar().setToolTip(
+            f"Registro completo en {instrumentacion.RUTA_LOG}"
+        )
+
+    def closeEvent(self, event):
+        # No destruir el hilo de carga mientras sigue leyendo: se le pide que
+        # se detenga en la próxima etapa y se espera un tiempo acotado
+        self.cargador.requestInterruption()
+        if not self.cargador.wait(ESPERA_CIERRE_MS):
+            # Una etapa en curso (p. ej. leer el modelo) no se puede cortar a
+            # mitad; la aplicación se está cerrando, así que se corta el hilo
+            self.cargador.terminate()
+            self.cargador.wait(ESPERA_CIERRE_MS)
+        instrumentacion.desuscribir(self._oyente_metricas)
+        super().closeEvent(event)
@@ -0,0 +1,202 @@
+from bisect import bisect_right
+
+import pandas as pd
+
+from PyQt6.QtCore import (
+    Qt, QAbstractTableModel, QModelIndex, QEvent, QRectF, pyqtSignal
+)
+from PyQt6.QtGui import QColor, QPainter
+from PyQt6.QtWidgets import QStyledItemDelegate, QStyle
+
+from core.puntuacion import ETIQUETA_FUERA_RIESGO
+
+
+COLUMNA_PERFIL = "PERFIL"
+
+
+# ==========================================
+# Modelo de tabla respaldado por el DataFrame
+# ==========================================
+class ModeloResultados(QAbstractTableModel):
+    """Expone las columnas del DataFrame de resultados sin crear un objeto
+    Qt por celda: la vista solo pide los datos de las filas visibles."""
+
+    def __init__(self, columnas, etiquetas=None, parent=None):
+        super().__init__(parent)
+        self.columnas = list(columnas)
+        self.etiquetas = etiquetas or {}
+        # Los resultados llegan por bloques: se guardan las columnas de cada
+        # bloque tal cual y la fila inicial de cada uno, sin concatenar
+        self._partes = []
+        self._inicios = []
+        self._valores = []
+        self._filas = 0
+
+    def _columnas_de(self, df):
+        # Las categóricas se guardan como Categorical (códigos): convertirlas
+        # con to_numpy crearía un objeto de texto por fila
+        return {
+            col: df[col].array if isinstance(df[col].dtype, pd.CategoricalDtype)
+            else df[col].to_numpy()
+            for col in self.columnas
+            if col in df.columns
+        }
+
+    def _anexar(self, df):
+        self._partes.append(df)
+        self._inicios.append(self._filas)
+        self._valores.append(self._columnas_de(df))
+        self._filas += len(df)
+
+    def _sincronizar(self, partes):
+        self._partes, self._inicios, self._valores = [], [], []
+        self._filas = 0
+        for df in partes:
+            if len(df):
+                self._anexar(df)
+
+    # ===============================
+    # Carga de datos
+    # ===============================
+    def set_resultados(self, df):
+        self.beginResetModel()
+        self._sincronizar([] if df is None else [df])
+        self.endResetModel()
+
+    def agregar(self, df):
+        """Agrega al final las filas de un bloque nuevo (solo se leen sus columnas)."""
+        if len(df) == 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._filas, self._filas + len(df) - 1)
+        self._anexar(df)
+        self.endInsertRows()
+
+    def refrescar(self, df=None):
+        """Vuelve a leer las columnas (p. ej. tras reetiquetar) sin reconstruir la vista.
+
+        df: las mismas filas en un solo DataFrame, si reemplaza a los bloques.
+        """
+        if self._filas == 0:
+            return
+        self._sincronizar(self._partes if df is None else [df])
+        self.dataChanged.emit(
+            self.index(0, 0),
+            self.index(self._filas - 1, len(self.columnas) - 1)
+        )
+
+    def _ubicar(self, fila):
+        parte = bisect_right(self._inicios, fila) - 1
+        return parte, fila - self._inicios[parte]
+
+    def fila(self, fila):
+        """La fila completa (Series) del DataFrame del que proviene."""
+        parte, local = self._ubicar(fila)
+        return self._partes[parte].iloc[local]
+
+    def valor(self, fila, col):
+        parte, local = self._ubicar(fila)
+        valores = self._valores[parte].get(col)
+        if valores is None:
+            return None
+        return valores[local]
+
+    # ===============================
+    # Interfaz de QAbstractTableModel
+    # ===============================
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._filas
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columnas)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+
+        col = self.columnas[index.column()]
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            if col == COLUMNA_PERFIL:
+                return "Ver perfil"
+            valor = self.valor(index.row(), col)
+            if col == "PROBABILIDAD":
+                return f"{valor:.2%}"
+            return str(valor)
+
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return Qt.AlignmentFlag.AlignCenter
+
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            col = self.columnas[section]
+            return self.etiquetas.get(col, col)
+        return str(section + 1)
+
+
+# ==========================================
+# Delegado: celda PREDICCION y acción "Ver perfil"
+# ==========================================
+class DelegadoResultados(QStyledItemDelegate):
+    ver_perfil = pyqtSignal(int)
+
+    COLORES_PREDICCION = {
+        True: (QColor("#1E7E34"), QColor("#D4EDDA")),
+        False: (QColor("#B02A37"), QColor("#F8D7DA")),
+    }
+
+    def __init__(self, modelo, parent=None):
+        super().__init__(parent)
+        self.modelo = modelo
+
+    def _columna(self, index):
+        return self.modelo.columnas[index.column()]
+
+    def paint(self, painter, option, index):
+        col = self._columna(index)
+
+        if col == "PREDICCION":
+            valor = self.modelo.valor(index.row(), col)
+            texto_color, fondo = self.COLORES_PREDICCION[valor == ETIQUETA_FUERA_RIESGO]
+
+            painter.save()
+            painter.fillRect(option.rect, fondo)
+            painter.setPen(texto_color)
+            fuente = painter.font()
+            fuente.setBold(True)
+            painter.setFont(fuente)
+            painter.drawText(option.rect, Qt.AlignmentFlag.AlignCenter, str(valor))
+            painter.restore()
+            return
+
+        if col == COLUMNA_PERFIL:
+            painter.save()
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            rect = QRectF(option.rect).adjusted(8, 6, -8, -6)
+            hover = bool(option.state & QStyle.StateFlag.State_MouseOver)
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(QColor("#4A90E2" if hover else "#0B4F95"))
+            painter.drawRoundedRect(rect, 8, 8)
+            painter.setPen(QColor("white"))
+            fuente = painter.font()
+            fuente.setBold(True)
+            painter.setFont(fuente)
+            painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, "Ver perfil")
+            painter.restore()
+            return
+
+        super().paint(painter, option, index)
+
+    def editorEvent(self, event, model, option, index):
+        if (
+            self._columna(index) == COLUMNA_PERFIL
+            and event.type() == QEvent.Type.MouseButtonRelease
+            and event.button() == Qt.MouseButton.LeftButton
+        ):
+            self.ver_perfil.emit(index.row())
+            return True
+        return super().editorEvent(event, model, option, index)
+
@@ -1,16 +1,31 @@
 import os
-import joblib
+
 import pandas as pd
-import numpy as np
 
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel,
-    QFileDialog, QMessageBox, QTableWidget,
-    QTableWidgetItem, QFrame, QDialog, QFormLayout
+    QFileDialog, QMessageBox, QTableView, QHeaderView,
+    QFrame, QDialog, QFormLayout,
+    QDoubleSpinBox, QProgressBar, QCheckBox
 )
 
 from PyQt6.QtCore import Qt
+from core.artefactos import obtener_registro
+from core.contribuciones import MatrizContribuciones, factores_principales, texto_efecto
+from core.distribuciones import texto_percentil
+from core.exportacion import FILTRO_EXPORTACION
+from core.indice_colegios import (
+    APROXIMADA, COLUMNAS_INFORME, EXACTA, SIN_COINCIDENCIA
+)
+from core.instrumentacion import Instrumentacion
+from core.lectura import FILTRO_ARCHIVOS
+from core.puntuacion_incremental import ResultadosPrevios
+from core.puntuacion_paralela import FILAS_MIN_PARALELO, procesos_disponibles
+from ui.modelo_resultados import (
+    ModeloResultados, DelegadoResultados, COLUMNA_PERFIL
+)
 from ui.worker_evaluacion import WorkerEvaluacion
+from ui.worker_exportacion import WorkerExportacion
 
 
 
@@ -32,11 +47,19 @@ ETIQUETAS = {
     "TRABAJO_COLEGIO": "Tipo de colegio",
     "MAYOR_EDAD": "Mayor de edad",
     "MIGRA_UNIVERSIDAD": "Migración universitaria",
+    "TASA_APR_COLEGIO": "Tasa de aprobación del colegio",
     "PREDICCION": "Resultado esperado",
+    "NIVEL_RIESGO": "Nivel de riesgo",
     "PROBABILIDAD": "Probabilidad de aprobar"
 }
 
 
+COLUMNAS_TABLA = [
+    "SEXO", "EDAD", "NOMBRE_COLEGIO",
+    "PREDICCION", "NIVEL_RIESGO", "PROBABILIDAD", "PERFIL"
+]
+
+
 class TabEvaluarEsts(QWidget):
     def __init__(self):
         super().__init__()
@@ -56,198 +79,379 @@ class TabEvaluarEsts(QWidget):
         self.card.setObjectName("card")
         card_layout = QVBoxLayout(self.card)
 
-        self.btn_cargar = QPushButton("📂 Cargar archivo Excel (.xlsx)")
-        self.btn_cargar.clicked.connect(self.cargar_excel)
-        card_layout.addWidget(self.btn_cargar)
+        botones_layout = QHBoxLayout()
+        self.btn_cargar = QPushButton("📂 Cargar archivo (Excel, CSV o Parquet)")
+        self.btn_cargar.clicked.connect(self.cargar_archivo)
+        botones_layout.addWidget(self.btn_cargar)
+
+        self.btn_exportar = QPushButton("💾 Exportar resultados")
+        self.btn_exportar.setEnabled(False)
+        self.btn_exportar.clicked.connect(self.exportar_resultados)
+        botones_layout.addWidget(self.btn_exportar)
+
+        # Nombres de colegio que no coincidieron exactamente con el histórico
+        self.btn_informe_colegios = QPushButton("")
+        self.btn_informe_colegios.setVisible(False)
+        self.btn_informe_colegios.clicked.connect(self.ver_informe_colegios)
+        botones_layout.addWidget(self.btn_informe_colegios)
+        card_layout.addLayout(botones_layout)
+
+        # Progreso y cancelación del lote
+        progreso_layout = QHBoxLayout()
+        self.barra_progreso = QProgressBar()
+        self.barra_progreso.setVisible(False)
+        progreso_layout.addWidget(self.barra_progreso)
+
+        self.label_progreso = QLabel("")
+        progreso_layout.addWidget(self.label_progreso)
+
+        self.btn_cancelar = QPushButton("Cancelar")
+        self.btn_cancelar.setVisible(False)
+        self.btn_cancelar.clicked.connect(self.cancelar_evaluacion)
+        progreso_layout.addWidget(self.btn_cancelar)
+        card_layout.addLayout(progreso_layout)
+
+        # Umbral de riesgo: cambiarlo solo reetiqueta, no vuelve a predecir
+        umbral_layout = QHBoxLayout()
+        umbral_layout.addWidget(QLabel("Umbral de riesgo (probabilidad de aprobar)"))
+        self.spin_umbral = QDoubleSpinBox()
+        self.spin_umbral.setRange(0.05, 0.95)
+        self.spin_umbral.setSingleStep(0.05)
+        self.spin_umbral.setDecimals(2)
+        umbral_layout.addWidget(self.spin_umbral)
+        umbral_layout.addStretch()
+
+        # Modo paralelo: reparte features e inferencia entre procesos, solo en
+        # archivos de FILAS_MIN_PARALELO filas o más (en los chicos no compensa)
+        self.chk_paralelo = QCheckBox(
+            f"Usar varios procesos desde {FILAS_MIN_PARALELO:,} filas "
+            f"({procesos_disponibles()} núcleos)"
+        )
+        self.chk_paralelo.setChecked(procesos_disponibles() > 1)
+        self.chk_paralelo.setEnabled(procesos_disponibles() > 1)
+        umbral_layout.addWidget(self.chk_paralelo)
+
+        # Factores del perfil: se calculan al puntuar (la inferencia es más lenta)
+        self.chk_contribuciones = QCheckBox("Explicar cada resultado")
+        self.chk_contribuciones.setChecked(True)
+        umbral_layout.addWidget(self.chk_contribuciones)
+
+        # Exportar durante la evaluación: cada bloque se escribe apenas se
+        # puntúa, sin esperar a tener todos los resultados en memoria
+        self.chk_exportar_al_evaluar = QCheckBox("Guardar resultados mientras se evalúa")
+        umbral_layout.addWidget(self.chk_exportar_al_evaluar)
+        card_layout.addLayout(umbral_layout)
+
+        # Tabla virtual: solo se dibujan las filas visibles
+        self.modelo_tabla = ModeloResultados(COLUMNAS_TABLA, parent=self)
+        self.delegado_tabla = DelegadoResultados(self.modelo_tabla, self)
+        self.delegado_tabla.ver_perfil.connect(self.ver_perfil)
+
+        self.tabla = QTableView()
+        self.tabla.setModel(self.modelo_tabla)
+        self.tabla.setItemDelegate(self.delegado_tabla)
+        self.tabla.setMouseTracking(True)
+        self.tabla.setAlternatingRowColors(True)
+        self.tabla.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+
+        filas = self.tabla.verticalHeader()
+        filas.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        filas.setDefaultSectionSize(44)
+
+        cabecera = self.tabla.horizontalHeader()
+        cabecera.setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        col_perfil = COLUMNAS_TABLA.index(COLUMNA_PERFIL)
+        cabecera.setSectionResizeMode(col_perfil, QHeaderView.ResizeMode.Fixed)
+        self.tabla.setColumnWidth(col_perfil, 120)
 
-        self.tabla = QTableWidget()
         card_layout.addWidget(self.tabla)
 
         self.layout.addWidget(self.card)
                 
-        # Cargar modelo y dataset base
-
-        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        # Modelo y dataset base (compartidos, se cargan al primer uso)
 
-        self.modelo = joblib.load(
-            os.path.join(base_dir, "model", "modelo_XGBOOST.joblib")
-        )
-
-        with open(os.path.join(base_dir, "model", "columnas_modelo.pkl"), "rb") as f:
-            self.columnas_modelo = joblib.load(f)
+        self.registro = obtener_registro()
 
-        self.df_hist = pd.read_csv(
-            os.path.join(base_dir, "data", "dataset_eda.csv")
-        )
+        self.spin_umbral.setValue(self.registro.criterio_riesgo.umbral)
+        self.spin_umbral.valueChanged.connect(self.cambiar_umbral)
 
-        self.tasa_por_colegio = (
-            self.df_hist
-            .groupby("NOMBRE_COLEGIO")["RESULTADO_FINAL"]
-            .apply(lambda x: (x == "APR").mean())
-            .to_dict()
-        )
-       
         self.df_resultados = None
+        # Bloques recibidos durante la evaluación: se concatenan una sola vez
+        # al terminar
+        self.bloques_resultados = []
+        # Contribuciones por variable, alineadas con las filas de resultados
+        self.contribuciones_resultados = None
+        # Resultados de la última evaluación: al recargar un archivo corregido
+        # solo se vuelven a puntuar las filas nuevas o modificadas
+        self.resultados_previos = None
 
         self.aplicar_estilos()
     
-    # Cargar Excel
+    # Cargar archivo (xlsx, csv o parquet)
     
-    def cargar_excel(self):
+    def cargar_archivo(self):
         ruta, _ = QFileDialog.getOpenFileName(
-            self, "Seleccionar archivo Excel", "", "Excel (*.xlsx)"
+            self, "Seleccionar archivo de postulantes", "", FILTRO_ARCHIVOS
         )
 
         if not ruta:
             return
 
+        salida = None
+        if self.chk_exportar_al_evaluar.isChecked():
+            salida = self.pedir_ruta_exportacion()
+            if not salida:
+                return
+
         self.btn_cargar.setEnabled(False)
-        self.tabla.setRowCount(0)
+        self.btn_exportar.setEnabled(False)
+        self.btn_informe_colegios.setVisible(False)
+        self.informe_colegios = None
+        self.df_resultados = None
+        self.bloques_resultados = []
+        self.contribuciones_resultados = None
+        self.modelo_tabla.set_resultados(None)
+
+        self.barra_progreso.setValue(0)
+        self.barra_progreso.setVisible(True)
+        self.btn_cancelar.setEnabled(True)
+        self.btn_cancelar.setVisible(True)
+        self.label_progreso.setText("Leyendo archivo...")
+
+        # Llenado de la tabla: ocurre en el hilo de la GUI, se mide aparte del worker
+        self.instrumentacion_tabla = Instrumentacion("tabla_resultados", ("tabla",))
 
+        procesos = None if self.chk_paralelo.isChecked() else 1
         self.worker = WorkerEvaluacion(
-            ruta,
-            self.modelo,
-            self.columnas_modelo,
-            self.tasa_por_colegio
+            ruta, self.registro, procesos=procesos, previos=self.resultados_previos,
+            contribuciones=self.chk_contribuciones.isChecked(),
+            salida=salida, columnas_salida=self.columnas_vista(),
         )
 
-        self.worker.terminado.connect(self.mostrar_resultados)
+        self.worker.parcial.connect(self.agregar_resultados)
+        self.worker.progreso.connect(self.actualizar_progreso)
+        self.worker.terminado.connect(self.finalizar_evaluacion)
+        self.worker.informe_colegios.connect(self.recibir_informe_colegios)
         self.worker.error.connect(self.mostrar_error)
+        self.worker_activo = self.worker
         self.worker.start()
 
-    # Preparar datos
+    def cancelar_evaluacion(self):
+        # Cancela la evaluación o la exportación en curso
+        self.btn_cancelar.setEnabled(False)
+        self.label_progreso.setText("Cancelando...")
+        self.worker_activo.cancelar()
+
+    # Resultados parciales y progreso
+
+    def agregar_resultados(self, df, matriz):
+        with self.instrumentacion_tabla.etapa("tabla", len(df)):
+            self.bloques_resultados.append(df)
+            self.modelo_tabla.agregar(df)
+            if matriz is not None:
+                if self.contribuciones_resultados is None:
+                    self.contribuciones_resultados = MatrizContribuciones(
+                        self.registro.motor.variables
+                    )
+                self.contribuciones_resultados.agregar(matriz)
+
+    def unir_bloques(self):
+        """Concatena una sola vez los bloques recibidos en df_resultados."""
+        if not self.bloques_resultados:
+            return
+        with self.instrumentacion_tabla.etapa("tabla"):
+            self.df_resultados = self.registro.vocabularios.concatenar(
+                self.bloques_resultados
+            )
+            self.bloques_resultados = []
+            self.modelo_tabla.refrescar(self.df_resultados)
+            if self.contribuciones_resultados is not None:
+                self.contribuciones_resultados.unir()
+
+    def actualizar_progreso(self, hechas, total, velocidad, eta):
+        if total > 0:
+            self.barra_progreso.setRange(0, total)
+            self.barra_progreso.setValue(min(hechas, total))
+        else:
+            self.barra_progreso.setRange(0, 0)
 
-    def preparar_datos(self, df):
+        texto = f"{hechas} filas · {velocidad:,.0f} filas/s"
+        if eta >= 0:
+            texto += f" · ETA {eta:.0f} s"
+        self.label_progreso.setText(texto)
 
-        df["FECHA_NAC"] = pd.to_datetime(df["FECHA_NAC"], errors="coerce")
+    def finalizar_evaluacion(self, hechas, cancelado):
+        self.btn_cargar.setEnabled(True)
+        self.btn_exportar.setEnabled(hechas > 0)
+        self.btn_cancelar.setVisible(False)
+        self.barra_progreso.setVisible(False)
 
-      
-        df["EDAD"] = df.apply(
-            lambda fila: fila["ANIO"] - fila["FECHA_NAC"].year
-            - ((1, 1) < (fila["FECHA_NAC"].month, fila["FECHA_NAC"].day))
-            if pd.notnull(fila["FECHA_NAC"]) else np.nan,
-            axis=1
-        )
+        reutilizadas = self.worker.reutilizadas
+        if cancelado:
+            texto = f"Evaluación cancelada: se conservan {hechas} filas evaluadas"
+        else:
+            texto = f"Evaluación completa: {hechas} filas"
+        if reutilizadas:
+            texto += (
+                f" ({reutilizadas} sin cambios reutilizadas, "
+                f"{hechas - reutilizadas} puntuadas)"
+            )
+        if self.worker.salida:
+            texto += f" · guardadas en {os.path.basename(self.worker.salida)}"
+        self.label_progreso.setText(texto)
+        self.unir_bloques()
+        self.instrumentacion_tabla.registrar(filas=hechas)
+
+        if self.df_resultados is not None:
+            contribuciones = None
+            if self.contribuciones_resultados is not None:
+                contribuciones = self.contribuciones_resultados.matriz()
+            self.resultados_previos = ResultadosPrevios(
+                self.df_resultados, self.registro.firma_puntuacion, contribuciones
+            )
+
+    # Informe de colegios
+
+    def recibir_informe_colegios(self, informe):
+        self.informe_colegios = informe
+        if len(informe) == 0:
+            return
 
-        df["EDAD"] = (
-            pd.to_numeric(df["EDAD"], errors="coerce")
-            .fillna(0)
-            .astype(int)
+        por_tipo = informe.groupby("COINCIDENCIA_COLEGIO")["FILAS"].sum()
+        sin = int(por_tipo.get(SIN_COINCIDENCIA, 0))
+        aproximadas = int(por_tipo.get(APROXIMADA, 0))
+        self.btn_informe_colegios.setText(
+            f"⚠️ Colegios: {sin} filas sin coincidencia, {aproximadas} aproximadas"
         )
+        self.btn_informe_colegios.setVisible(True)
 
-        df["MAYOR_EDAD"] = (df["EDAD"] >= 18).astype(int)
+    def ver_informe_colegios(self):
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Nombres de colegio sin coincidencia exacta")
+        dialog.resize(760, 480)
+        layout = QVBoxLayout(dialog)
 
-     
-        
-        df["ANIOS_POST_BACH"] = (
-            df["ANIO"] - df["ANIO_BACHILLERATO"]
+        nota = QLabel(
+            "Los colegios sin coincidencia se evaluaron con la tasa de su municipio, "
+            "provincia o ciudad (o la global). Revise las coincidencias aproximadas."
         )
+        nota.setWordWrap(True)
+        layout.addWidget(nota)
 
-        df["ANIOS_POST_BACH"] = (
-            pd.to_numeric(df["ANIOS_POST_BACH"], errors="coerce")
-            .fillna(0)
-            .astype(int)
-        )
-        
-        df["TRABAJO_COLEGIO"] = (
-            df["TRABAJA"].fillna("NO").astype(str) + "_" +
-            df["TIPO_COLEGIO"].fillna("DESCONOCIDO").astype(str)
+        modelo = ModeloResultados(COLUMNAS_INFORME, parent=dialog)
+        modelo.set_resultados(self.informe_colegios)
+        tabla = QTableView()
+        tabla.setModel(modelo)
+        tabla.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(tabla)
+
+        dialog.exec()
+
+    # Exportar resultados (en segundo plano, por bloques)
+
+    def columnas_vista(self):
+        # Columnas de la vista en el orden en que se muestran, sin la de acción
+        cabecera = self.tabla.horizontalHeader()
+        columnas = []
+        for visual in range(cabecera.count()):
+            logico = cabecera.logicalIndex(visual)
+            if cabecera.isSectionHidden(logico):
+                continue
+            col = self.modelo_tabla.columnas[logico]
+            if col != COLUMNA_PERFIL:
+                columnas.append(col)
+        return columnas
+
+    def columnas_exportacion(self):
+        # Primero las columnas del archivo que el modelo no usa (identificadores),
+        # luego las de la vista
+        columnas = list(self.worker.columnas_extra or [])
+        return columnas + [c for c in self.columnas_vista() if c not in columnas]
+
+    def pedir_ruta_exportacion(self):
+        ruta, filtro = QFileDialog.getSaveFileName(
+            self, "Exportar resultados", "resultados.csv", FILTRO_EXPORTACION
         )
+        if ruta and not os.path.splitext(ruta)[1]:
+            ruta += "." + filtro.split("*.")[1].rstrip(")")
+        return ruta
+
+    def exportar_resultados(self):
+        # Escribe por bloques los resultados que ya tiene la tabla; "Guardar
+        # resultados mientras se evalúa" los escribe desde la evaluación
+        if self.df_resultados is None or len(self.df_resultados) == 0:
+            return
 
-        df["MIGRA_UNIVERSIDAD"] = (
-            (df["CIUDAD_COLEGIO"] != "COCHABAMBA") |
-            (df["PROVINCIA_COLEGIO"] != "COCHABAMBA (CERCADO)")
-        ).astype(int)
+        ruta = self.pedir_ruta_exportacion()
+        if not ruta:
+            return
 
-        df["TASA_APR_COLEGIO"] = (
-            df["NOMBRE_COLEGIO"]
-            .map(self.tasa_por_colegio)
-            .fillna(0.0)
+        # Mientras se exporta no se reetiqueta ni se reemplaza df_resultados
+        self.btn_cargar.setEnabled(False)
+        self.btn_exportar.setEnabled(False)
+        self.spin_umbral.setEnabled(False)
+
+        self.barra_progreso.setRange(0, len(self.df_resultados))
+        self.barra_progreso.setValue(0)
+        self.barra_progreso.setVisible(True)
+        self.btn_cancelar.setEnabled(True)
+        self.btn_cancelar.setVisible(True)
+        self.label_progreso.setText("Exportando...")
+
+        self.worker_exportacion = WorkerExportacion(
+            self.df_resultados, ruta, self.columnas_exportacion()
         )
+        self.worker_exportacion.progreso.connect(self.actualizar_progreso_exportacion)
+        self.worker_exportacion.terminado.connect(self.finalizar_exportacion)
+        self.worker_exportacion.error.connect(self.mostrar_error_exportacion)
+        self.worker_activo = self.worker_exportacion
+        self.worker_exportacion.start()
 
-        return df
-    
-    # Predicción
-    
-    def predecir(self, df):
-        X = df.reindex(columns=self.columnas_modelo, fill_value=0)
+    def actualizar_progreso_exportacion(self, escritas, total):
+        self.barra_progreso.setValue(escritas)
+        self.label_progreso.setText(f"Exportando: {escritas} de {total} filas")
+
+    def _fin_exportacion(self):
+        self.btn_cargar.setEnabled(True)
+        self.btn_exportar.setEnabled(True)
+        self.spin_umbral.setEnabled(True)
+        self.btn_cancelar.setVisible(False)
+        self.barra_progreso.setVisible(False)
+
+    def finalizar_exportacion(self, ruta, escritas, cancelado):
+        self._fin_exportacion()
+        if cancelado:
+            self.label_progreso.setText(
+                f"Exportación cancelada: {escritas} filas en {os.path.basename(ruta)}"
+            )
+        else:
+            self.label_progreso.setText(
+                f"Exportadas {escritas} filas a {os.path.basename(ruta)}"
+            )
 
-        pred = self.modelo.predict(X)
-        proba = self.modelo.predict_proba(X)[:, 1]
+    def mostrar_error_exportacion(self, mensaje):
+        self._fin_exportacion()
+        self.label_progreso.setText("")
+        QMessageBox.critical(self, "Error al exportar", mensaje)
 
-        df["PREDICCION"] = np.where(pred == 1, "FUERA DE RIESGO","EN RIESGO")
-        df["PROBABILIDAD"] = proba
+    # Umbral de riesgo
 
-        self.df_resultados = df
-        self.mostrar_tabla(df)
+    def cambiar_umbral(self, valor):
+        self.registro.criterio_riesgo.umbral = valor
+
+        if self.df_resultados is not None:
+            self.registro.criterio_riesgo.reetiquetar(self.df_resultados)
+            self.modelo_tabla.refrescar(self.df_resultados)
+        elif self.bloques_resultados:
+            # Evaluación en curso: se reetiquetan los bloques que muestra la tabla
+            for df in self.bloques_resultados:
+                self.registro.criterio_riesgo.reetiquetar(df)
+            self.modelo_tabla.refrescar()
 
-       # Tabla resumida
-    def mostrar_resultados(self, df):
-        
-        self.btn_cargar.setEnabled(True)
-        self.df_resultados = df.reset_index(drop=True)
-
-        columnas = [
-            "SEXO", "EDAD", "NOMBRE_COLEGIO",
-            "PREDICCION", "PROBABILIDAD", "PERFIL"
-        ]
-
-        self.tabla.setRowCount(len(df))
-        self.tabla.setColumnCount(len(columnas))
-        self.tabla.setHorizontalHeaderLabels(columnas)
-
-        for i, row in self.df_resultados.iterrows():
-            for j, col in enumerate(columnas):
-                                
-                if col == "PERFIL":
-                    btn = QPushButton("Ver perfil")
-                    btn.setStyleSheet("""
-                        QPushButton {
-                            background-color: #0B4F95;
-                            color: white;
-                            border-radius: 8px;
-                            padding: 14px 14p
-                            
-                            font-weight: bold;
-                            font-size: 12px;
-                        }
-                        QPushButton:hover {
-                            background-color: #4A90E2;
-                        }
-                    """)
-                    btn.clicked.connect(lambda _, idx=i: self.ver_perfil(idx))
-                    self.tabla.setCellWidget(i, j, btn)
-                    self.tabla.setRowHeight(i, 44)
-                    continue
-
-                # ---------------------------
-                # DATOS NORMALES
-                # ---------------------------
-                valor = row[col]
-                if col == "PROBABILIDAD":
-                    valor = f"{valor:.2%}"
-
-                item = QTableWidgetItem(str(valor))
-                item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-
-               
-                if col == "PREDICCION":
-                    if valor == "FUERA DE RIESGO":
-                        item.setForeground(Qt.GlobalColor.darkGreen)
-                    else:
-                        item.setForeground(Qt.GlobalColor.red)
-
-
-                self.tabla.setItem(i, j, item)
-
-        self.tabla.resizeColumnsToContents()
-        
-        col_perfil = columnas.index("PERFIL")
-        self.tabla.setColumnWidth(col_perfil, 120)
-    
     # Perfil individual
     def ver_perfil(self, idx):
-        fila = self.df_resultados.iloc[idx]
+        # También durante la evaluación, antes de concatenar los bloques
+        fila = self.modelo_tabla.fila(idx)
 
         dialog = QDialog(self)
         dialog.setWindowTitle("Perfil del Postulante")
@@ -320,6 +524,16 @@ class TabEvaluarEsts(QWidget):
         add_item("Período académico", fila.get("PERIODO"))
         add_item("Opción de ingreso", fila.get("OPC_INGRESO"))
         add_item("Nombre del colegio", fila.get("NOMBRE_COLEGIO"))
+        coincidencia = fila.get("COINCIDENCIA_COLEGIO", EXACTA)
+        if coincidencia != EXACTA:
+            referencia = fila.get("COLEGIO_REFERENCIA")
+            add_item(
+                "Colegio en el histórico",
+                f"{referencia} ({coincidencia})" if pd.notna(referencia) else "Sin coincidencia"
+            )
+        nivel = fila.get("NIVEL_TASA_COLEGIO", "colegio")
+        if pd.notna(nivel) and nivel != "colegio":
+            add_item("Tasa de aprobación usada", f"{fila.get('TASA_APR_COLEGIO'):.2%} (por {nivel})")
         add_item("Ciudad del colegio", fila.get("CIUDAD_COLEGIO"))
         add_item("Provincia del colegio", fila.get("PROVINCIA_COLEGIO"))
         add_item("Año de bachillerato", fila.get("ANIO_BACHILLERATO"))
@@ -344,12 +558,42 @@ class TabEvaluarEsts(QWidget):
         )
         add_item("Años post bachillerato", fila.get("ANIOS_POST_BACH"))
 
+        # ===============================
+        # POSICIÓN FRENTE AL HISTÓRICO
+        # ===============================
+        percentiles = self.registro.distribuciones.percentiles_fila(fila)
+        if percentiles:
+            add_section("Posición frente a postulantes anteriores")
+            for col, por_grupo in percentiles.items():
+                nombre = ETIQUETAS.get(col, "Tasa de aprobación del colegio")
+                add_item(nombre, texto_percentil(por_grupo))
+
+        # ===============================
+        # QUÉ EXPLICA EL RESULTADO
+        # ===============================
+        # Contribuciones calculadas al puntuar el lote: no se llama al modelo
+        contribuciones = {}
+        if self.contribuciones_resultados is not None:
+            contribuciones = self.contribuciones_resultados.fila(idx)
+        a_favor, en_contra = factores_principales(contribuciones, prob)
+        if a_favor or en_contra:
+            add_section("Qué explica el resultado")
+            for col, efecto in a_favor:
+                add_item(f"▲ {ETIQUETAS.get(col, col)}", texto_efecto(efecto))
+            for col, efecto in en_contra:
+                add_item(f"▼ {ETIQUETAS.get(col, col)}", texto_efecto(efecto))
+
         layout.addStretch()
         dialog.exec()
 
     def mostrar_error(self, mensaje):
+        self.unir_bloques()
         self.btn_cargar.setEnabled(True)
+        self.btn_cancelar.setVisible(False)
+        self.barra_progreso.setVisible(False)
+        self.label_progreso.setText("")
         QMessageBox.critical(self, "Error", mensaje)
+
     def aplicar_estilos(self):
         self.setStyleSheet("""
             /* ===============================
@@ -394,7 +638,7 @@ class TabEvaluarEsts(QWidget):
             /* ===============================
             TABLA
             =============================== */
-            QTableWidget {
+            QTableView {
                 background-color: #FFFFFF;
                 border: 1px solid #DADADA;
                 gridline-color: #E0E0E0;
@@ -404,11 +648,11 @@ class TabEvaluarEsts(QWidget):
                 font-size: 13px;
             }
 
-            QTableWidget::item {
+            QTableView::item {
                 padding: 6px;
             }
 
-            QTableWidget::item:selected {
+            QTableView::item:selected {
                 background-color: #E6F0FA;
                 color: #000000;
             }
@@ -432,21 +676,6 @@ class TabEvaluarEsts(QWidget):
             QHeaderView::section:last {
                 border-top-right-radius: 8px;
             }
-
-            /* ===============================
-            BOTÓN "VER PERFIL" EN TABLA
-            =============================== */
-            QTableWidget QPushButton {
-                background-color: #0B4F95;
-                color: white;
-                border-radius: 6px;
-                padding: 4px 10px;
-                font-size: 12px;
-            }
-
-            QTableWidget QPushButton:hover {
-                background-color: #4A90E2;
-            }
         """)
 
 
@@ -1,14 +1,17 @@
-import os
-import joblib
-import pickle
-import pandas as pd
-
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QPushButton,
     QComboBox, QMessageBox, QFormLayout,
-    QHBoxLayout, QFrame
+    QHBoxLayout, QFrame, QDateEdit
+)
+from PyQt6.QtCore import Qt, QDate, pyqtSignal
+
+from core.artefactos import obtener_registro
+from core.cache_prediccion import CachePrediccion
+from core.features import (
+    COLUMNAS_DERIVADAS, COLUMNAS_ENTRADA_NUMERICAS, features_registro, tasa_colegio
 )
-from PyQt6.QtCore import Qt
+from core.instrumentacion import Instrumentacion
+from core.sensibilidad import VALORES_TASA, sensibilidad
 
 
 # ===============================
@@ -26,11 +29,28 @@ ETIQUETAS_COLUMNAS = {
     "ESTADO_CIVIL": "Estado civil",
     "EDAD": "Edad del postulante en el examen",
     "ANIOS_POST_BACH": "Años posteriores al bachillerato",
-    "TRABAJO_COLEGIO": "Tipo de colegio",
+    "TRABAJO_COLEGIO": "Trabajo y tipo de colegio",
     "MAYOR_EDAD": "Mayor de edad",
     "MIGRA_UNIVERSIDAD": "Migración universitaria previa",
+    "ANIO": "Año del examen de ingreso",
+    "FECHA_NAC": "Fecha de nacimiento",
+    "TRABAJA": "¿Trabaja?",
+    "TIPO_COLEGIO": "Tipo de colegio",
 }
 
+# Las columnas derivadas no se eligen en el formulario: se piden los datos
+# crudos y se calculan con construir_features, igual que en el lote
+ENTRADAS_DERIVADAS = {
+    "EDAD": ["ANIO", "FECHA_NAC"],
+    "ANIOS_POST_BACH": ["ANIO"],
+    "TRABAJO_COLEGIO": ["TRABAJA", "TIPO_COLEGIO"],
+}
+
+EDADES_SENSIBILIDAD = range(15, 43)
+
+# Fecha mínima del selector: se muestra vacía hasta que se elige una
+FECHA_SIN_ELEGIR = QDate(1900, 1, 1)
+
 NUMERICAS_MODELO = {
     "PERIODO",
     "OPC_INGRESO",
@@ -44,6 +64,9 @@ NUMERICAS_MODELO = {
 
 
 class TabModelo(QWidget):
+    # datos del postulante, probabilidad, {variable: contribución}
+    prediccion_lista = pyqtSignal(object, float, object)
+
     def __init__(self):
         super().__init__()
 
@@ -86,6 +109,20 @@ class TabModelo(QWidget):
 
         self.layout.addLayout(resultado_layout)
 
+        # Qué pasaría si: se habilita después de una predicción
+        self.btn_sensibilidad = QPushButton("🔍 ¿Qué cambiaría el resultado?")
+        self.btn_sensibilidad.setEnabled(False)
+        self.btn_sensibilidad.clicked.connect(self.ver_sensibilidad)
+        self.layout.addWidget(self.btn_sensibilidad)
+        self.ultimo_datos = None
+        self.ultima_proba = None
+
+        # Aciertos de la caché de predicciones
+        self.label_cache = QLabel("")
+        self.label_cache.setObjectName("cache")
+        self.label_cache.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.layout.addWidget(self.label_cache)
+
         self.setLayout(self.main_layout)
         self.aplicar_estilos()
 
@@ -93,47 +130,143 @@ class TabModelo(QWidget):
     # Predicción
     # ===============================
     def predecir(self):
+        instrumentacion = Instrumentacion(
+            "prediccion_individual",
+            ("entrada", "features", "reindexado", "inferencia", "perfil")
+        )
         try:
-            datos = {}
+            with instrumentacion.etapa("entrada", 1):
+                datos = {}
+
+                for col, widget in self.inputs.items():
+                    if widget.currentIndex() == -1:
+                        raise ValueError(f"Seleccione un valor para {col}")
+
+                    datos[col] = self.valor_opcion(col, widget, widget.currentIndex())
+
+                if self.input_fecha_nac.date() == FECHA_SIN_ELEGIR:
+                    raise ValueError("Seleccione la fecha de nacimiento")
+                datos["FECHA_NAC"] = self.input_fecha_nac.date().toString("yyyy-MM-dd")
+                if datos["ANIO"] < datos["ANIO_BACHILLERATO"]:
+                    raise ValueError(
+                        "El año del examen no puede ser anterior al de bachillerato"
+                    )
+
+                # 🔴 DATOS EXTRA PARA PERFIL (NO VAN AL MODELO)
+                datos["NOMBRE_COLEGIO"] = self.combo_colegio.currentText()
+
+            # EDAD, MAYOR_EDAD, ANIOS_POST_BACH, TRABAJO_COLEGIO, MIGRA_UNIVERSIDAD
+            # y la tasa del colegio (o la de su municipio, provincia o ciudad)
+            datos = instrumentacion.medir(
+                "features", features_registro, datos, self.registro.indice_colegios,
+                filas=1
+            )
+
+            # Si se reemplazó el archivo del modelo, se recarga y la caché se vacía
+            self.registro.recargar_modelo_si_cambio()
+            # Fila float32 del motor llenada desde el dict, sin DataFrame ni reindex
+            X = instrumentacion.medir(
+                "reindexado", self.registro.motor.matriz_registro, datos, filas=1
+            )
+
+            proba, contribuciones = instrumentacion.medir(
+                "inferencia", self.probabilidad, X, filas=1
+            )
+            self.ultimo_datos = datos
+            self.ultima_proba = proba
+            self.btn_sensibilidad.setEnabled(True)
 
-            for col, widget in self.inputs.items():
-                if widget.currentIndex() == -1:
-                    raise ValueError(f"Seleccione un valor para {col}")
+            # ✅ ENVIAR AL PERFIL (la ventana principal cambia de pestaña)
+            instrumentacion.medir(
+                "perfil", self.prediccion_lista.emit, datos, proba, contribuciones
+            )
 
-                if col in ["MAYOR_EDAD", "MIGRA_UNIVERSIDAD"]:
-                    datos[col] = int(widget.currentData())
-                elif col in NUMERICAS_MODELO:
-                    datos[col] = float(widget.currentText())
-                else:
-                    datos[col] = widget.currentText()
+        except Exception as e:
+            QMessageBox.critical(self, "Error", str(e))
+
+        finally:
+            instrumentacion.registrar(
+                aciertos_cache=self.cache.aciertos, consultas_cache=self.cache.consultas
+            )
 
-            # 🔴 DATOS EXTRA PARA PERFIL (NO VAN AL MODELO)
-            datos["NOMBRE_COLEGIO"] = self.combo_colegio.currentText()
-            datos["TASA_APR_COLEGIO"] = float(self.tasa_actual)
 
-            df = pd.DataFrame([datos])
-            df = df.reindex(columns=self.columnas_modelo, fill_value=0)
+    def probabilidad(self, X):
+        """(probabilidad, {variable: contribución}) para la fila X del motor."""
+        firma = self.registro.firma_modelo
+
+        clave = self.cache.clave(X)
+        resultado = self.cache.obtener(clave, firma)
+        if resultado is None:
+            motor = self.registro.motor
+            proba = motor.predecir(X)
+            matriz = motor.contribuciones(X)
+            contribuciones = {}
+            if matriz is not None:
+                contribuciones = dict(zip(motor.variables, matriz[0, :-1].tolist()))
+            resultado = (float(proba[0]), contribuciones)
+            self.cache.guardar(clave, resultado, firma)
+
+        self.label_cache.setText(
+            f"Caché: {self.cache.aciertos} aciertos de {self.cache.consultas} consultas"
+        )
+        return resultado
 
-            pred = self.modelo.predict(df)[0]
-            proba = self.modelo.predict_proba(df)[0][1]
+    def valor_opcion(self, col, widget, indice):
+        """Valor de la opción `indice` de un combo, con el tipo que espera el modelo."""
+        if col in NUMERICAS_MODELO or col in COLUMNAS_ENTRADA_NUMERICAS:
+            return float(widget.itemText(indice))
+        return widget.itemText(indice)
 
-            # ✅ ENVIAR AL PERFIL
-            self.tab_perfil.actualizar_perfil(datos, proba)
+    # ===============================
+    # Qué pasaría si
+    # ===============================
+    def ver_sensibilidad(self):
+        if self.ultimo_datos is None:
+            return
 
-            # 🔁 CAMBIAR DE PESTAÑA AUTOMÁTICAMENTE
-            self.tabs_widget.setCurrentIndex(
-                self.tabs_widget.indexOf(self.tab_perfil)
+        instrumentacion = Instrumentacion("sensibilidad", ("grilla", "grafico"))
+        try:
+            # Todos los valores del formulario para cada variable, en una sola llamada
+            valores = {
+                col: [self.valor_opcion(col, widget, i) for i in range(widget.count())]
+                for col, widget in self.inputs.items()
+            }
+            # La edad se recorre cambiando el año de nacimiento
+            valores["EDAD"] = sorted(set(EDADES_SENSIBILIDAD) | {self.ultimo_datos["EDAD"]})
+            valores["TASA_APR_COLEGIO"] = sorted(
+                set(VALORES_TASA) | {self.ultimo_datos["TASA_APR_COLEGIO"]}
             )
 
+            with instrumentacion.etapa("grilla"):
+                # Las derivadas se recalculan para cada punto de la grilla
+                tabla = sensibilidad(
+                    self.registro.motor, self.columnas_modelo, self.ultimo_datos, valores,
+                    self.registro.indice_colegios
+                )
+            instrumentacion.agregar_filas("grilla", len(tabla))
+
+            with instrumentacion.etapa("grafico"):
+                # matplotlib se importa recién al abrir el primer gráfico
+                from ui.dialogo_sensibilidad import DialogoSensibilidad
+
+                dialogo = DialogoSensibilidad(
+                    tabla, self.ultima_proba, self.criterio_riesgo.umbral,
+                    dict(ETIQUETAS_COLUMNAS, TASA_APR_COLEGIO="Tasa de aprobación del colegio"),
+                    parent=self,
+                )
         except Exception as e:
             QMessageBox.critical(self, "Error", str(e))
+            return
+        finally:
+            instrumentacion.registrar()
 
+        dialogo.exec()
 
     # ===============================
     # Mostrar resultado (RIESGO)
     # ===============================
-    def mostrar_resultado(self, pred, proba):
-        if proba < 0.5:
+    def mostrar_resultado(self, proba):
+        if self.criterio_riesgo.en_riesgo(proba):
             estado = "EN RIESGO"
             icono = "⚠️"
             color = "#B02A37"
@@ -166,96 +299,97 @@ class TabModelo(QWidget):
     # Cargar modelo y datos
     # ===============================
     def cargar_artifactos(self):
-        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        data_path = os.path.join(base_dir, "data", "dataset_eda.csv")
+        registro = obtener_registro()
 
-        self.df_ref = pd.read_csv(data_path)
-
-        self.tasa_por_colegio = (
-            self.df_ref
-            .groupby("NOMBRE_COLEGIO")["RESULTADO_FINAL"]
-            .apply(lambda x: (x == "APR").mean())
-            .to_dict()
-        )
-
-        self.modelo = joblib.load("model/modelo_XGBOOST.joblib")
-
-        with open("model/columnas_modelo.pkl", "rb") as f:
-            self.columnas_modelo = pickle.load(f)
-
-        with open("model/cat_features.pkl", "rb") as f:
-            self.cat_features = pickle.load(f)
-
-        self.tasa_actual = 0.0
+        self.registro = registro
+        self.cache = CachePrediccion()
+        self.opciones = registro.estadisticas["opciones"]
+        self.tasa_por_colegio = registro.tasa_por_colegio
+        # El modelo lo carga y lo entrega el registro al predecir
+        self.columnas_modelo = registro.columnas_modelo
+        self.criterio_riesgo = registro.criterio_riesgo
 
     # ===============================
     # Crear inputs
     # ===============================
     def crear_inputs(self):
         combo_colegio = QComboBox()
-        colegios = sorted(
-            self.df_ref["NOMBRE_COLEGIO"]
-            .dropna()
-            .astype(str)
-            .unique()
-            .tolist()
-        )
-        combo_colegio.addItems(colegios)
+        combo_colegio.addItems(self.opciones["NOMBRE_COLEGIO"])
         combo_colegio.setCurrentIndex(-1)
         combo_colegio.currentTextChanged.connect(self.actualizar_tasa_colegio)
 
         self.form.addRow(QLabel("Nombre del colegio"), combo_colegio)
         self.combo_colegio = combo_colegio
 
+        agregadas = set()
         for col in self.columnas_modelo:
-            if col in ["RESULTADO_FINAL", "AREA_CARRERA", "TASA_APR_COLEGIO"]:
+            if col in ["RESULTADO_FINAL", "AREA_CARRERA"]:
                 continue
+            # Cada derivada se reemplaza por sus datos crudos (una sola vez cada uno)
+            campos = ENTRADAS_DERIVADAS.get(col, []) if col in COLUMNAS_DERIVADAS else [col]
+            for campo in campos:
+                if campo not in agregadas:
+                    agregadas.add(campo)
+                    self.crear_input(campo)
+
+    def crear_input(self, col):
+        label = QLabel(ETIQUETAS_COLUMNAS.get(col, col))
+
+        if col == "FECHA_NAC":
+            fecha = QDateEdit()
+            fecha.setCalendarPopup(True)
+            fecha.setDisplayFormat("dd/MM/yyyy")
+            fecha.setMinimumDate(FECHA_SIN_ELEGIR)
+            fecha.setMaximumDate(QDate.currentDate())
+            fecha.setSpecialValueText(" ")
+            fecha.setDate(FECHA_SIN_ELEGIR)
+            self.form.addRow(label, fecha)
+            self.input_fecha_nac = fecha
+            return
+
+        combo = QComboBox()
+
+        if col == "ANIO_BACHILLERATO":
+            combo.addItems([str(a) for a in range(1995, 2011)])
+        elif col == "ANIO":
+            combo.addItems([str(a) for a in self.anios_examen()])
+        elif col == "TRABAJA":
+            combo.addItems(self.opciones_trabajo_colegio()[0])
+        elif col == "TIPO_COLEGIO":
+            combo.addItems(self.opciones_trabajo_colegio()[1])
+        else:
+            combo.addItems(self.opciones.get(col, []))
 
-            label = ETIQUETAS_COLUMNAS.get(col, col)
-
-            combo = QComboBox()
-
-            if col == "ANIO_BACHILLERATO":
-                combo.addItems([str(a) for a in range(1995, 2011)])
-            elif col == "EDAD":
-                combo.addItems([str(e) for e in range(15, 43)])
-            elif col == "ANIOS_POST_BACH":
-                combo.addItems(["0", "1", "2", "3", "4", "5"])
-            elif col == "MAYOR_EDAD":
-                combo.addItem("No", 0)
-                combo.addItem("Sí", 1)
-            elif col == "MIGRA_UNIVERSIDAD":
-                combo.addItem("No", 0)
-                combo.addItem("Sí", 1)
-            else:
-                valores = (
-                    self.df_ref[col]
-                    .dropna()
-                    .astype(str)
-                    .sort_values()
-                    .unique()
-                    .tolist()
-                )
-                combo.addItems(valores)
+        combo.setCurrentIndex(-1)
+        self.form.addRow(label, combo)
+        self.inputs[col] = combo
+
+    def opciones_trabajo_colegio(self):
+        """Opciones de TRABAJA y TIPO_COLEGIO, separadas de las de TRABAJO_COLEGIO."""
+        partes = [v.split("_", 1) for v in self.opciones.get("TRABAJO_COLEGIO", [])]
+        trabaja = sorted({p[0] for p in partes})
+        tipos = sorted({p[1] for p in partes if len(p) > 1})
+        return trabaja, tipos
 
-            combo.setCurrentIndex(-1)
-            self.form.addRow(QLabel(label), combo)
-            self.inputs[col] = combo
+    def anios_examen(self):
+        """Del primer año de bachillerato al último más los años posteriores."""
+        bach = [int(a) for a in self.opciones.get("ANIO_BACHILLERATO", [])] or [1995, 2010]
+        post = [int(a) for a in self.opciones.get("ANIOS_POST_BACH", [])] or [0]
+        return range(min(bach), max(bach) + max(post) + 1)
 
     # ===============================
     # Actualizar tasa colegio
     # ===============================
     def actualizar_tasa_colegio(self, nombre):
-        tasa = self.tasa_por_colegio.get(nombre)
-        if tasa is not None:
-            self.tasa_actual = float(tasa)
+        if nombre in self.tasa_por_colegio.index:
+            tasa = float(tasa_colegio([nombre], self.tasa_por_colegio)[0])
             self.label_tasa_info.setText(
-                f"Tasa de aprobación del colegio: {self.tasa_actual:.2%}"
+                f"Tasa de aprobación del colegio: {tasa:.2%}"
             )
         else:
-            self.tasa_actual = 0.0
             self.label_tasa_info.setText(
-                "Tasa de aprobación del colegio: No disponible"
+                "Tasa de aprobación del colegio: No disponible "
+                "(se usará la de su municipio, provincia o ciudad)"
             )
 
     # ===============================
@@ -278,6 +412,11 @@ class TabModelo(QWidget):
                 border-radius: 6px;
                 border: 1px solid #0B4F95;
             }
+            QLabel#cache {
+                color: #6C757D;
+                font-weight: normal;
+                font-size: 11px;
+            }
             QPushButton {
                 background-color: #0B4F95;
                 color: white;
@@ -287,7 +426,3 @@ class TabModelo(QWidget):
                 font-size: 14px;
             }
         """)
-
-    def set_tab_perfil(self, tab_perfil, tab_widget):
-        self.tab_perfil = tab_perfil
-        self.tabs_widget = tab_widget
@@ -1,12 +1,13 @@
-import os
-import pandas as pd
-
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QFrame,
     QHBoxLayout, QGridLayout, QScrollArea
 )
 from PyQt6.QtCore import Qt
 
+from core.artefactos import obtener_registro
+from core.contribuciones import factores_principales, texto_efecto
+from core.distribuciones import texto_percentil
+
 
 NUMERICAS_MODELO = {
     "PERIODO",
@@ -25,22 +26,18 @@ class TabPerfilEst(QWidget):
         super().__init__()
 
         # ===============================
-        # Cargar dataset histórico
+        # Estadísticas históricas (snapshot)
         # ===============================
-        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        data_path = os.path.join(base_dir, "data", "dataset_eda.csv")
-        self.df = pd.read_csv(data_path)
-
-        self.df["RESULTADO_FINAL"] = self.df["RESULTADO_FINAL"].astype(str)
-
-        self.tasa_por_colegio = (
-            self.df
-            .groupby("NOMBRE_COLEGIO")["RESULTADO_FINAL"]
-            .apply(lambda x: (x == "APR").mean())
-        )
+        registro = obtener_registro()
+        estadisticas = registro.estadisticas
+        self.criterio_riesgo = registro.criterio_riesgo
+        self.medias = estadisticas["medias"]
+        self.tasa_media_colegios = estadisticas["tasa_media_colegios"]
+        self.distribuciones = registro.distribuciones
 
         self.datos_postulante = None
         self.probabilidad = None
+        self.contribuciones = {}
 
         # ===============================
         # Layout raíz
@@ -99,9 +96,10 @@ class TabPerfilEst(QWidget):
     # ==================================================
     # Recibir datos desde el modelo
     # ==================================================
-    def actualizar_perfil(self, datos_postulante, probabilidad):
+    def actualizar_perfil(self, datos_postulante, probabilidad, contribuciones=None):
         self.datos_postulante = datos_postulante
         self.probabilidad = probabilidad
+        self.contribuciones = contribuciones or {}
         self._calcular_estadisticas()
 
     # ==================================================
@@ -119,7 +117,7 @@ class TabPerfilEst(QWidget):
         # ===============================
         # Resumen de riesgo
         # ===============================
-        if self.probabilidad < 0.50:
+        if self.criterio_riesgo.en_riesgo(self.probabilidad):
             estado = "EN RIESGO"
             color = "#B02A37"
             fondo = "#F8D7DA"
@@ -193,14 +191,37 @@ class TabPerfilEst(QWidget):
             valor = self.datos_postulante.get(col)
 
             if col == "TASA_APR_COLEGIO":
-                promedio = self.tasa_por_colegio.mean()
+                promedio = self.tasa_media_colegios
                 texto = f"{valor:.2%} (Promedio histórico: {promedio:.2%})"
+                nivel = self.datos_postulante.get("NIVEL_TASA_COLEGIO", "colegio")
+                if nivel != "colegio":
+                    texto += f" · tasa por {nivel}, colegio sin historial"
             else:
-                promedio = self.df[col].mean()
+                promedio = self.medias.get(col)
                 texto = f"{entero(valor)} (Promedio histórico: {entero(promedio)})"
 
             self._add_kv(self._nombre_legible(col), texto)
 
+        # ===============================
+        # Posición dentro del histórico (percentiles)
+        # ===============================
+        percentiles = self.distribuciones.percentiles_fila(self.datos_postulante)
+        if percentiles:
+            self._add_section("Posición frente a postulantes anteriores")
+            for col, por_grupo in percentiles.items():
+                self._add_kv(self._nombre_legible(col), texto_percentil(por_grupo))
+
+        # ===============================
+        # Factores que explican el resultado
+        # ===============================
+        a_favor, en_contra = factores_principales(self.contribuciones, self.probabilidad)
+        if a_favor or en_contra:
+            self._add_section("Qué explica el resultado")
+            for col, efecto in a_favor:
+                self._add_kv(f"▲ {self._nombre_legible(col)}", texto_efecto(efecto))
+            for col, efecto in en_contra:
+                self._add_kv(f"▼ {self._nombre_legible(col)}", texto_efecto(efecto))
+
     # ==================================================
     # Helpers UI
     # ==================================================
@@ -246,6 +267,13 @@ class TabPerfilEst(QWidget):
             "MAYOR_EDAD": "Mayor de edad",
             "MIGRA_UNIVERSIDAD": "Migración universitaria previa",
             "TASA_APR_COLEGIO": "Tasa de aprobación del colegio",
+            "SEXO": "Género",
+            "CIUDAD_COLEGIO": "Ciudad del colegio",
+            "PROVINCIA_COLEGIO": "Provincia del colegio",
+            "MUNICIPIO": "Municipio",
+            "NACIONALIDAD": "Nacionalidad",
+            "ESTADO_CIVIL": "Estado civil",
+            "TRABAJO_COLEGIO": "Tipo de colegio",
         }.get(col, col)
 
     # ==================================================
@@ -1,64 +1,202 @@
+import time
+
 from PyQt6.QtCore import QThread, pyqtSignal
 import pandas as pd
-import numpy as np
+
+from core.artefactos import obtener_registro
+from core.exportacion import abrir_escritor
+from core.features import COLUMNAS_ENTRADA_NUMERICAS
+from core.indice_colegios import InformeColegios
+from core.instrumentacion import Instrumentacion
+from core.lectura import (
+    TAMANO_BLOQUE, columnas_conservadas, columnas_necesarias, contar_filas,
+    leer_por_bloques
+)
+from core.puntuacion import puntuar_bloque
+from core.puntuacion_incremental import PuntuacionIncremental
+from core.puntuacion_paralela import (
+    PuntuadorParalelo, medir_espera, procesos_recomendados
+)
+
+
+ETAPAS = (
+    "conteo", "lectura", "hash", "features", "reindexado", "inferencia",
+    "contribuciones", "etiquetado", "escritura"
+)
+# En modo paralelo features, reindexado, inferencia y contribuciones suman
+# los segundos de todos los procesos; espera_procesos es el tiempo que el
+# hilo del worker esperó resultados (incluye arrancar los procesos)
 
 class WorkerEvaluacion(QThread):
-    terminado = pyqtSignal(pd.DataFrame)
+    # filas procesadas, total (-1 si no se conoce), filas/s, ETA en segundos (-1 si no se conoce)
+    progreso = pyqtSignal(int, int, float, float)
+    # filas puntuadas de un bloque y sus contribuciones (matriz float32 o None)
+    parcial = pyqtSignal(pd.DataFrame, object)
+    # filas procesadas en total, True si se canceló
+    terminado = pyqtSignal(int, bool)
+    # nombres de colegio sin coincidencia exacta (se emite antes de terminado)
+    informe_colegios = pyqtSignal(pd.DataFrame)
     error = pyqtSignal(str)
 
-    def __init__(self, ruta_excel, modelo, columnas_modelo, tasa_por_colegio):
+    def __init__(self, ruta, registro=None, tamano_bloque=TAMANO_BLOQUE, procesos=1,
+                 columnas_extra=None, previos=None, contribuciones=True, salida=None,
+                 columnas_salida=None):
         super().__init__()
-        self.ruta_excel = ruta_excel
-        self.modelo = modelo
-        self.columnas_modelo = columnas_modelo
-        self.tasa_por_colegio = tasa_por_colegio
+        self.ruta = ruta
+        self.registro = registro or obtener_registro()
+        self.tamano_bloque = tamano_bloque
+        # procesos > 1: features e inferencia en un pool de procesos; None:
+        # el pool solo para archivos grandes (ver procesos_recomendados)
+        self.procesos = procesos
+        # Columnas a conservar además de las que usa el modelo (None: todas
+        # las del archivo, p. ej. identificadores); no se pasan al modelo
+        self.columnas_extra = columnas_extra
+        # ResultadosPrevios de la evaluación anterior: solo se puntúan las
+        # filas nuevas o modificadas
+        self.previos = previos
+        # Contribuciones por variable, en la misma pasada que la probabilidad
+        # (ver core.contribuciones). Multiplican el tiempo de inferencia (~14x)
+        self.contribuciones = contribuciones
+        # Archivo donde se escribe cada bloque apenas se puntúa (None: no se
+        # exporta). Columnas: las conservadas y luego columnas_salida
+        self.salida = salida
+        self.columnas_salida = columnas_salida
+        self.reutilizadas = 0
+
+    def cancelar(self):
+        # Cancelación cooperativa: se revisa entre bloques y se conservan
+        # las filas ya emitidas
+        self.requestInterruption()
+
+    def _bloques(self, instrumentacion):
+        if self.columnas_extra is None:
+            self.columnas_extra = columnas_conservadas(
+                self.ruta, self.registro.columnas_modelo
+            )
+        columnas = columnas_necesarias(self.registro.columnas_modelo, self.columnas_extra)
+        bloques = leer_por_bloques(
+            self.ruta, self.tamano_bloque, columnas=columnas, texto=self.columnas_extra
+        )
+        while True:
+            df = instrumentacion.medir("lectura", next, bloques, None)
+            if df is None or self.isInterruptionRequested():
+                return
+            instrumentacion.agregar_filas("lectura", len(df))
+            yield df
+
+    def _puntuar_secuencial(self, bloques, instrumentacion):
+        # Los artefactos se cargan aquí (fuera del hilo de la GUI)
+        # si ninguna pestaña los pidió antes.
+        motor = self.registro.motor
+        tasa_por_colegio = self.registro.indice_colegios
+        vocabularios = self.registro.vocabularios
+
+        for df in bloques:
+            yield puntuar_bloque(
+                motor, tasa_por_colegio, df, vocabularios, self.contribuciones,
+                instrumentacion
+            )
+
+    def _puntuar_paralelo(self, puntuador, bloques, instrumentacion):
+        # Cada proceso mide sus etapas (features, reindexado, inferencia...) y
+        # se suman; la espera de este hilo por cada bloque va aparte
+        resultados = puntuador.puntuar_bloques(bloques, instrumentacion)
+        return medir_espera(resultados, instrumentacion, ("lectura", "hash"))
+
+    def _columnas_escritura(self, df):
+        columnas = list(self.columnas_extra or [])
+        columnas += [c for c in (self.columnas_salida or df.columns) if c not in columnas]
+        return [c for c in columnas if c in df.columns]
 
     def run(self):
+        puntuador = None
+        escritor = None
+        instrumentacion = Instrumentacion("evaluacion_masiva", ETAPAS)
+        hechas = 0
+        estado = "error"
+        informe = InformeColegios()
         try:
-            df = pd.read_excel(self.ruta_excel)
+            total = instrumentacion.medir("conteo", contar_filas, self.ruta)
+            total = -1 if total is None else total
+            if self.procesos is None:
+                self.procesos = procesos_recomendados(total)
 
-            
-            # Limpieza y features
-            
-            df["FECHA_NAC"] = pd.to_datetime(df["FECHA_NAC"], errors="coerce")
+            incremental = PuntuacionIncremental(
+                self.previos, self.registro.firma_puntuacion, self.registro.vocabularios,
+                numericas=list(self.registro.num_features) + COLUMNAS_ENTRADA_NUMERICAS,
+                contribuciones=self.contribuciones,
+            )
+            bloques = incremental.nuevos(self._bloques(instrumentacion), instrumentacion)
 
-            df["EDAD"] = (
-                df["ANIO"] - df["FECHA_NAC"].dt.year
-            ).fillna(0).astype(int)
+            if self.procesos > 1:
+                puntuador = instrumentacion.medir(
+                    "inicio_procesos", PuntuadorParalelo, self.procesos, self.registro,
+                    1, self.contribuciones
+                )
+                resultados = self._puntuar_paralelo(puntuador, bloques, instrumentacion)
+            else:
+                resultados = self._puntuar_secuencial(bloques, instrumentacion)
+            resultados = incremental.combinar(resultados)
+            if self.salida:
+                escritor = abrir_escritor(self.salida)
 
-            df["MAYOR_EDAD"] = (df["EDAD"] >= 18).astype(int)
+            inicio = time.perf_counter()
 
-            df["ANIOS_POST_BACH"] = (
-                df["ANIO"] - df["ANIO_BACHILLERATO"]
-            ).where(df["ANIO_BACHILLERATO"] != 0, 0).fillna(0).astype(int)
+            for df, matriz in resultados:
+                if self.isInterruptionRequested():
+                    break
 
-            df["TRABAJO_COLEGIO"] = (
-                df["TRABAJA"].astype(str) + "_" + df["TIPO_COLEGIO"].astype(str)
-            )
+                instrumentacion.medir(
+                    "etiquetado", self.registro.criterio_riesgo.reetiquetar, df,
+                    filas=len(df)
+                )
 
-            df["MIGRA_UNIVERSIDAD"] = (
-                (df["CIUDAD_COLEGIO"] != "COCHABAMBA") |
-                (df["PROVINCIA_COLEGIO"] != "COCHABAMBA (CERCADO)")
-            ).astype(int)
+                if escritor is not None:
+                    if escritor.columnas is None:
+                        escritor.columnas = self._columnas_escritura(df)
+                    instrumentacion.medir(
+                        "escritura", escritor.escribir, df, filas=len(df)
+                    )
 
-            df["TASA_APR_COLEGIO"] = (
-                df["NOMBRE_COLEGIO"]
-                .map(self.tasa_por_colegio)
-                .fillna(0.0)
-            )
+                informe.agregar(df)
+                self.reutilizadas = incremental.reutilizadas
+
+                df.index = pd.RangeIndex(hechas, hechas + len(df))
+                hechas += len(df)
 
-            
-            # Predicción
-            
-            X = df.reindex(columns=self.columnas_modelo, fill_value=0)
+                transcurrido = time.perf_counter() - inicio
+                velocidad = hechas / transcurrido if transcurrido > 0 else 0.0
+                if total >= 0 and velocidad > 0:
+                    eta = max(total - hechas, 0) / velocidad
+                else:
+                    eta = -1.0
 
-            pred = self.modelo.predict(X)
-            proba = self.modelo.predict_proba(X)[:, 1]
+                self.parcial.emit(df, matriz)
+                self.progreso.emit(hechas, total, velocidad, eta)
 
-            df["PREDICCION"] = np.where(pred == 1, "FUERA DE RIESGO", "EN RIESGO")
-            df["PROBABILIDAD"] = proba
+            if escritor is not None:
+                instrumentacion.medir("escritura", escritor.cerrar)
+                escritor = None
 
-            self.terminado.emit(df)
+            cancelado = self.isInterruptionRequested()
+            estado = "cancelado" if cancelado else "completo"
+            self.informe_colegios.emit(informe.tabla())
+            self.terminado.emit(hechas, cancelado)
 
         except Exception as e:
             self.error.emit(str(e))
+
+        finally:
+            if puntuador is not None:
+                puntuador.cerrar()
+            if escritor is not None:
+                # Tras un error el archivo queda con los bloques ya escritos
+                try:
+                    escritor.cerrar()
+                except Exception:
+                    pass
+            instrumentacion.registrar(
+                archivo=self.ruta, filas=hechas, procesos=self.procesos, estado=estado,
+                colegios_no_exactos=len(informe), reutilizadas=self.reutilizadas,
+                salida=self.salida,
+            )
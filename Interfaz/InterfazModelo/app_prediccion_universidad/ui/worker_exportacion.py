@@ -0,0 +1,45 @@
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from core.exportacion import exportar_por_bloques
+from core.instrumentacion import Instrumentacion
+from core.lectura import TAMANO_BLOQUE
+
+
+class WorkerExportacion(QThread):
+    # filas escritas, total
+    progreso = pyqtSignal(int, int)
+    # ruta, filas escritas, True si se canceló
+    terminado = pyqtSignal(str, int, bool)
+    error = pyqtSignal(str)
+
+    def __init__(self, df, ruta, columnas, tamano_bloque=TAMANO_BLOQUE):
+        super().__init__()
+        # Se guarda la referencia, no una copia: cada bloque se toma al escribirlo
+        self.df = df
+        self.ruta = ruta
+        self.columnas = columnas
+        self.tamano_bloque = tamano_bloque
+
+    def cancelar(self):
+        self.requestInterruption()
+
+    def run(self):
+        instrumentacion = Instrumentacion("exportacion", ("escritura",))
+        escritas = 0
+        try:
+            bloques = exportar_por_bloques(
+                self.df, self.ruta, self.columnas, self.tamano_bloque,
+                cancelado=self.isInterruptionRequested,
+            )
+            with instrumentacion.etapa("escritura"):
+                for escritas in bloques:
+                    self.progreso.emit(escritas, len(self.df))
+            instrumentacion.agregar_filas("escritura", escritas)
+
+            self.terminado.emit(self.ruta, escritas, self.isInterruptionRequested())
+
+        except Exception as e:
+            self.error.emit(str(e))
+
+        finally:
+            instrumentacion.registrar(archivo=self.ruta, filas=escritas)